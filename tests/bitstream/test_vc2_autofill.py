@@ -18,6 +18,7 @@ from vc2_conformance.bitstream import (
     autofill_parse_offsets,
     autofill_parse_offsets_finalize,
     autofill_and_serialise_stream,
+    autofill_and_serialise_data_units,
     Stream,
     Sequence,
     DataUnit,
@@ -1338,3 +1339,147 @@ def test_autofill_and_serialise_stream():
         if data_unit["parse_info"]["parse_code"] == tables.ParseCodes.sequence_header
     ]
     assert all(v == 3 for v in major_versions)
+
+
+def make_example_sequence(
+    picture_parse_code=tables.ParseCodes.high_quality_picture, **parse_parameters
+):
+    if picture_parse_code in (
+        tables.ParseCodes.high_quality_picture_fragment,
+        tables.ParseCodes.low_delay_picture_fragment,
+    ):
+        pictures = [
+            DataUnit(
+                parse_info=ParseInfo(parse_code=picture_parse_code),
+                fragment_parse=FragmentParse(
+                    fragment_header=FragmentHeader(
+                        fragment_slice_count=fragment_slice_count,
+                    )
+                ),
+            )
+            for fragment_slice_count in [0, 1] * 2
+        ]
+    else:
+        pictures = [
+            DataUnit(parse_info=ParseInfo(parse_code=picture_parse_code))
+            for _ in range(2)
+        ]
+
+    return Sequence(
+        data_units=[
+            DataUnit(
+                parse_info=ParseInfo(parse_code=tables.ParseCodes.sequence_header),
+                sequence_header=SequenceHeader(
+                    parse_parameters=ParseParameters(**parse_parameters),
+                    video_parameters=SourceParameters(
+                        # Tiny custom frame-size used to reduce test suite runtime
+                        frame_size=FrameSize(
+                            custom_dimensions_flag=True,
+                            frame_width=4,
+                            frame_height=4,
+                        )
+                    ),
+                ),
+            ),
+            DataUnit(
+                parse_info=ParseInfo(parse_code=tables.ParseCodes.padding_data),
+                padding=Padding(bytes=b"123"),
+            ),
+        ]
+        + pictures
+        + [
+            DataUnit(
+                parse_info=ParseInfo(parse_code=tables.ParseCodes.auxiliary_data),
+                auxiliary_data=AuxiliaryData(bytes=b"12"),
+            ),
+            DataUnit(
+                parse_info=ParseInfo(parse_code=tables.ParseCodes.end_of_sequence),
+            ),
+        ]
+    )
+
+
+class TestAutofillAndSerialiseDataUnits(object):
+    @pytest.mark.parametrize(
+        "sequences",
+        [
+            # Empty stream
+            [],
+            # Single sequence
+            [make_example_sequence()],
+            # Multiple sequences with different major versions and picture
+            # numbers restarting
+            [
+                make_example_sequence(tables.ParseCodes.low_delay_picture),
+                make_example_sequence(tables.ParseCodes.high_quality_picture),
+                make_example_sequence(tables.ParseCodes.high_quality_picture_fragment),
+            ],
+            # Explicit major version
+            [make_example_sequence(major_version=1)],
+        ],
+    )
+    def test_matches_autofill_and_serialise_stream(self, sequences):
+        exp = BytesIO()
+        autofill_and_serialise_stream(exp, Stream(sequences=deepcopy(sequences)))
+
+        f = BytesIO()
+        autofill_and_serialise_data_units(
+            f,
+            (
+                data_unit
+                for sequence in deepcopy(sequences)
+                for data_unit in sequence["data_units"]
+            ),
+        )
+
+        assert f.getvalue() == exp.getvalue()
+
+    def test_unseekable_output(self):
+        class WriteOnlyFile(object):
+            def __init__(self):
+                self.chunks = []
+
+            def write(self, data):
+                self.chunks.append(bytes(data))
+
+            def flush(self):
+                pass
+
+        exp = BytesIO()
+        autofill_and_serialise_stream(exp, Stream(sequences=[make_example_sequence()]))
+
+        f = WriteOnlyFile()
+        autofill_and_serialise_data_units(f, make_example_sequence()["data_units"])
+
+        assert b"".join(f.chunks) == exp.getvalue()
+
+        # Data units should be written out one at a time
+        assert len(f.chunks) >= len(make_example_sequence()["data_units"])
+
+    def test_explicit_parse_offsets_retained(self):
+        sequence = make_example_sequence()
+        sequence["data_units"][0]["parse_info"]["next_parse_offset"] = 1234
+        sequence["data_units"][0]["parse_info"]["previous_parse_offset"] = 4321
+
+        f = BytesIO()
+        autofill_and_serialise_data_units(f, sequence["data_units"])
+
+        f.seek(0)
+        with Deserialiser(BitstreamReader(f)) as serdes:
+            vc2.parse_info(serdes, State())
+        assert serdes.context["next_parse_offset"] == 1234
+        assert serdes.context["previous_parse_offset"] == 4321
+
+    def test_late_major_version_increase(self):
+        sequence = make_example_sequence()
+        sequence["data_units"].insert(
+            -1,
+            DataUnit(
+                parse_info=ParseInfo(
+                    parse_code=tables.ParseCodes.high_quality_picture_fragment
+                ),
+            ),
+        )
+
+        with pytest.raises(ValueError):
+            autofill_and_serialise_data_units(BytesIO(), sequence["data_units"])
@@ -1,7 +1,11 @@
 import pytest
 
+import hashlib
+
 from io import BytesIO
 
+from mock import patch
+
 from vc2_conformance.pseudocode.state import State
 
 from vc2_conformance import decoder
@@ -41,6 +45,7 @@ class TestInitIO(object):
         (decoder.read_uintb, ()),
         (decoder.read_sint, ()),
         (decoder.read_sintb, ()),
+        (decoder.read_bytes, (1,)),
     ],
 )
 def test_read_past_eof_crashes(func, args):
@@ -120,3 +125,193 @@ def test_is_end_of_stream():
     # At end of stream
     decoder.read_nbits(state, 4)
     assert decoder.is_end_of_stream(state) is True
+
+
+class TestSkipRecordingIfIdentical(object):
+    @pytest.fixture
+    def data(self):
+        return bytes(bytearray(range(1, 101)))
+
+    def make_recording(self, data, nbits):
+        state = State()
+        decoder.init_io(state, BytesIO(data))
+        decoder.record_bitstream_start(state)
+        decoder.read_nbits(state, nbits)
+        next_bit = state["next_bit"]
+        return state, decoder.record_bitstream_finish(state), next_bit
+
+    @pytest.mark.parametrize("nbits", [1, 7, 8, 9, 16, 60, 800])
+    def test_identical(self, data, nbits):
+        exp_state, recorded_bytes, next_bit = self.make_recording(data, nbits)
+
+        state = State()
+        decoder.init_io(state, BytesIO(data))
+        assert decoder.skip_recording_if_identical(state, recorded_bytes, next_bit)
+
+        assert decoder.tell(state) == decoder.tell(exp_state)
+        assert state["current_byte"] == exp_state["current_byte"]
+        if nbits < 800:
+            assert decoder.read_nbits(state, 8) == decoder.read_nbits(exp_state, 8)
+        else:
+            assert decoder.is_end_of_stream(state)
+
+    @pytest.mark.parametrize("nbits", [1, 7, 8, 9, 16, 60])
+    def test_different(self, data, nbits):
+        _, recorded_bytes, next_bit = self.make_recording(data, nbits)
+
+        # Change the last bit recorded
+        different_data = bytearray(data)
+        different_data[(nbits - 1) // 8] ^= 0x80 >> ((nbits - 1) % 8)
+
+        state = State()
+        decoder.init_io(state, BytesIO(bytes(different_data)))
+        assert not decoder.skip_recording_if_identical(state, recorded_bytes, next_bit)
+
+        # Stream is unchanged
+        assert decoder.tell(state) == (0, 7)
+        for byte in different_data[:10]:
+            assert decoder.read_nbits(state, 8) == byte
+
+    def test_unread_bits_ignored(self, data):
+        _, recorded_bytes, next_bit = self.make_recording(data, 4)
+
+        state = State()
+        decoder.init_io(state, BytesIO(b"\x0F" + data[1:]))
+        assert decoder.skip_recording_if_identical(state, recorded_bytes, next_bit)
+        assert decoder.tell(state) == (0, 3)
+        assert decoder.read_nbits(state, 4) == 0xF
+
+    def test_stream_too_short(self, data):
+        _, recorded_bytes, next_bit = self.make_recording(data, 80)
+
+        state = State()
+        decoder.init_io(state, BytesIO(data[:5]))
+        assert not decoder.skip_recording_if_identical(state, recorded_bytes, next_bit)
+        assert decoder.tell(state) == (0, 7)
+
+    def test_not_byte_aligned(self, data):
+        _, recorded_bytes, next_bit = self.make_recording(data[1:], 8)
+
+        state = State()
+        decoder.init_io(state, BytesIO(data))
+        decoder.read_nbits(state, 4)
+        assert not decoder.skip_recording_if_identical(state, recorded_bytes, next_bit)
+        assert decoder.tell(state) == (0, 3)
+
+    def test_no_recording(self, data):
+        state = State()
+        decoder.init_io(state, BytesIO(data))
+        assert not decoder.skip_recording_if_identical(state, None, None)
+        assert decoder.tell(state) == (0, 7)
+
+    @pytest.mark.parametrize("nbits", [8, 12])
+    def test_skipped_bytes_recorded(self, data, nbits):
+        _, recorded_bytes, next_bit = self.make_recording(data, nbits)
+
+        state = State()
+        decoder.init_io(state, BytesIO(data))
+        decoder.record_bitstream_start(state)
+        assert decoder.skip_recording_if_identical(state, recorded_bytes, next_bit)
+        assert decoder.record_bitstream_finish(state) == recorded_bytes
+
+    def test_not_seekable(self, data):
+        _, recorded_bytes, next_bit = self.make_recording(data, 16)
+
+        class UnseekableBytesIO(BytesIO):
+            def seekable(self):
+                return False
+
+            def seek(self, *args, **kwargs):
+                raise AssertionError("seek() called")
+
+        state = State()
+        decoder.init_io(state, UnseekableBytesIO(data))
+        assert not decoder.skip_recording_if_identical(state, recorded_bytes, next_bit)
+        assert decoder.tell(state) == (0, 7)
+        assert decoder.read_nbits(state, 16) == 0x0102
+
+
+class TestReadBytes(object):
+    @pytest.fixture
+    def data(self):
+        return bytes(bytearray(range(256)))
+
+    @pytest.mark.parametrize("n", [0, 1, 2, 100, 254])
+    @pytest.mark.parametrize("initial_bits", [0, 8, 3])
+    @pytest.mark.parametrize("record", [False, True])
+    def test_matches_read_uint_lit(self, data, n, initial_bits, record):
+        states = []
+        for use_read_bytes in [False, True]:
+            state = State()
+            decoder.init_io(state, BytesIO(data))
+            if record:
+                decoder.record_bitstream_start(state)
+            decoder.read_nbits(state, initial_bits)
+
+            if use_read_bytes:
+                decoder.read_bytes(state, n)
+            else:
+                for _ in range(n):
+                    decoder.read_uint_lit(state, 1)
+
+            states.append(state)
+
+        exp_state, state = states
+        assert decoder.tell(state) == decoder.tell(exp_state)
+        assert state["current_byte"] == exp_state["current_byte"]
+        if record:
+            assert decoder.record_bitstream_finish(
+                state
+            ) == decoder.record_bitstream_finish(exp_state)
+        assert decoder.read_nbits(state, 8) == decoder.read_nbits(exp_state, 8)
+
+    def test_negative_length(self, data):
+        state = State()
+        decoder.init_io(state, BytesIO(data))
+        decoder.read_bytes(state, -10)
+        assert decoder.tell(state) == (0, 7)
+
+    @pytest.mark.parametrize("byte_aligned", [True, False])
+    def test_checksum(self, data, byte_aligned):
+        state = State()
+        decoder.init_io(state, BytesIO(data))
+        if not byte_aligned:
+            decoder.read_nbits(state, 4)
+
+        checksum = hashlib.sha256()
+        decoder.read_bytes(state, 10, checksum)
+
+        if byte_aligned:
+            exp = data[:10]
+        else:
+            exp = bytes(
+                bytearray(
+                    ((a << 4) & 0xFF) | (b >> 4) for a, b in zip(data[:10], data[1:11])
+                )
+            )
+        assert checksum.digest() == hashlib.sha256(exp).digest()
+
+    def test_read_to_end_of_file(self, data):
+        state = State()
+        decoder.init_io(state, BytesIO(data))
+        decoder.read_bytes(state, 256)
+        assert decoder.is_end_of_stream(state)
+
+    def test_read_past_end_of_file(self, data):
+        state = State()
+        decoder.init_io(state, BytesIO(data))
+        with pytest.raises(decoder.UnexpectedEndOfStream):
+            decoder.read_bytes(state, 257)
+
+    def test_large_reads_chunked(self, data):
+        state = State()
+        decoder.init_io(state, BytesIO(data * 4))
+        decoder.record_bitstream_start(state)
+
+        checksum = hashlib.sha256()
+        with patch.object(decoder.io, "READ_BYTES_CHUNK_SIZE", 100):
+            decoder.read_bytes(state, 1000, checksum)
+
+        assert decoder.record_bitstream_finish(state) == (data * 4)[:1000]
+        assert checksum.digest() == hashlib.sha256((data * 4)[:1000]).digest()
+        assert decoder.tell(state) == (1000, 7)
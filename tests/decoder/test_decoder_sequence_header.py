@@ -1,5 +1,9 @@
 import pytest
 
+from mock import patch
+
+from importlib import import_module
+
 from decoder_test_utils import serialise_to_bytes, bytes_to_state
 
 from vc2_conformance import bitstream
@@ -7,9 +11,14 @@ from vc2_conformance import decoder
 
 import vc2_data_tables as tables
 
+# NB: The module is shadowed by the sequence_header function of the same name
+# in the vc2_conformance.decoder namespace
+sequence_header_module = import_module("vc2_conformance.decoder.sequence_header")
+
 
 class TestSequenceHeader(object):
-    def test_byte_for_byte_identical(self):
+    @pytest.mark.parametrize("use_sequence_header_cache", [False, True])
+    def test_byte_for_byte_identical(self, use_sequence_header_cache):
         sh1 = serialise_to_bytes(
             bitstream.SequenceHeader(
                 parse_parameters=bitstream.ParseParameters(
@@ -25,6 +34,7 @@ class TestSequenceHeader(object):
         )
 
         state = bytes_to_state(sh1 + sh1 + sh2)
+        state["_use_sequence_header_cache"] = use_sequence_header_cache
 
         decoder.sequence_header(state)
         decoder.byte_align(state)
@@ -38,6 +48,60 @@ class TestSequenceHeader(object):
         assert exc_info.value.this_sequence_header_offset == len(sh1) * 2
         assert exc_info.value.this_sequence_header_bytes == sh2
 
+    @pytest.mark.parametrize(
+        "sequence_header",
+        [
+            # Ends part-way through a byte
+            bitstream.SequenceHeader(),
+            # Ends on a byte boundary
+            bitstream.SequenceHeader(
+                parse_parameters=bitstream.ParseParameters(major_version=3),
+                base_video_format=tables.BaseVideoFormats.hd1080p_50,
+            ),
+        ],
+    )
+    def test_sequence_header_cache(self, sequence_header):
+        sh = serialise_to_bytes(sequence_header)
+        # NB: A distinctive byte follows each sequence header
+        bitstream = sh + b"\xA5" + sh + b"\xA5"
+
+        states = []
+        video_parameters = []
+        for use_sequence_header_cache in [False, True]:
+            state = bytes_to_state(bitstream)
+            state["_use_sequence_header_cache"] = use_sequence_header_cache
+            video_parameters.append(decoder.sequence_header(state))
+            decoder.byte_align(state)
+            assert decoder.read_uint_lit(state, 1) == 0xA5
+
+            with patch.object(
+                sequence_header_module,
+                "parse_parameters",
+                wraps=decoder.parse_parameters,
+            ) as parse_parameters:
+                video_parameters.append(decoder.sequence_header(state))
+            # Repeated sequence header is only parsed again when the cache is
+            # not enabled
+            assert parse_parameters.called is not use_sequence_header_cache
+
+            decoder.byte_align(state)
+            assert decoder.read_uint_lit(state, 1) == 0xA5
+            assert decoder.is_end_of_stream(state)
+
+            del state["_file"]
+            del state["_level_sequence_matcher"]
+            del state["_level_constraint_tracker"]
+            states.append(state)
+
+        assert all(vp == video_parameters[0] for vp in video_parameters)
+        # The cached video parameters are not shared
+        assert video_parameters[3] is not video_parameters[2]
+
+        exp_state, state = states
+        del state["_use_sequence_header_cache"]
+        del exp_state["_use_sequence_header_cache"]
+        assert state == exp_state
+
     def test_supported_base_video_format(self):
         state = bytes_to_state(
             serialise_to_bytes(
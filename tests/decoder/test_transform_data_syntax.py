@@ -1,12 +1,34 @@
 import pytest
 
+import random
+
+import numpy as np
+
+from io import BytesIO
+
+from copy import deepcopy
+
+from mock import patch
+
 from decoder_test_utils import serialise_to_bytes, bytes_to_state
 
+from sample_codec_features import MINIMAL_CODEC_FEATURES
+
 from vc2_conformance.pseudocode.vc2_math import intlog2
 
+from vc2_conformance.pseudocode.state import State, reset_state
+
+from vc2_conformance.pseudocode.arrays import NumPyArray2D
+
+from vc2_conformance.picture_generators import white_noise
+
+from vc2_conformance.encoder import make_sequence
+
 from vc2_conformance import bitstream
 from vc2_conformance import decoder
 
+from vc2_conformance.decoder import transform_data_syntax
+
 import vc2_data_tables as tables
 
 # State dictionary with a minimal set of pre-populated values for the unpacking
@@ -174,3 +196,160 @@ def test_initialize_wavelet_data(dwt_depth, dwt_depth_ho):
                 for row in orientation_data:
                     for value in row:
                         assert value == 0
+
+
+class TestTransformBufferReuse(object):
+    @pytest.fixture
+    def state(self):
+        return {
+            "luma_width": 20,
+            "luma_height": 10,
+            "color_diff_width": 10,
+            "color_diff_height": 5,
+            "dwt_depth": 1,
+            "dwt_depth_ho": 1,
+        }
+
+    def test_reused_and_cleared(self, state):
+        coeff_data = decoder.initialize_wavelet_data(state, "Y")
+        coeff_data[2]["HH"][1][2] = 123
+
+        assert decoder.initialize_wavelet_data(state, "Y") is coeff_data
+        assert coeff_data[2]["HH"][1][2] is None
+
+    def test_components_not_shared(self, state):
+        state["color_diff_width"] = 20
+        state["color_diff_height"] = 10
+
+        y_data = decoder.initialize_wavelet_data(state, "Y")
+        c1_data = decoder.initialize_wavelet_data(state, "C1")
+        c2_data = decoder.initialize_wavelet_data(state, "C2")
+        assert y_data is not c1_data
+        assert c1_data is not c2_data
+
+    @pytest.mark.parametrize(
+        "param,value", [("dwt_depth", 2), ("dwt_depth_ho", 0), ("luma_width", 40)]
+    )
+    def test_not_reused_when_dimensions_change(self, state, param, value):
+        coeff_data = decoder.initialize_wavelet_data(state, "Y")
+        state[param] = value
+        assert decoder.initialize_wavelet_data(state, "Y") is not coeff_data
+
+    def test_not_reused_when_part_of_current_picture(self, state):
+        state["dwt_depth"] = 0
+        state["dwt_depth_ho"] = 0
+
+        coeff_data = decoder.initialize_wavelet_data(state, "Y")
+        state["current_picture"] = {"pic_num": 0, "Y": coeff_data[0]["LL"]}
+        assert decoder.initialize_wavelet_data(state, "Y") is not coeff_data
+
+    def test_released_by_reset_state(self, state):
+        state = State(**state)
+        decoder.initialize_wavelet_data(state, "Y")
+        assert "_transform_buffers" in state
+        reset_state(state)
+        assert "_transform_buffers" not in state
+
+
+class TestWavefrontDCPrediction(object):
+    @pytest.mark.parametrize(
+        "height,width,max_value",
+        [
+            (0, 0, 1),
+            (1, 1, 100),
+            (1, 10, 100),
+            (10, 1, 100),
+            (5, 10, 255),
+            (10, 5, 255),
+            (16, 16, 1 << 20),
+            # Values too large for native integers
+            (4, 6, 1 << 70),
+            # Values which would overflow native integers after prediction
+            (4, 6, 1 << 59),
+        ],
+    )
+    @pytest.mark.parametrize("use_numpy", [False, True])
+    def test_matches_pseudocode(self, height, width, max_value, use_numpy):
+        if use_numpy and max_value >= (1 << 59):
+            # NB: Overflow also occurs in the pseudocode when NumPy arrays are
+            # used
+            return
+
+        rand = random.Random(0)
+        orig = [
+            [rand.randint(-max_value, max_value) for _ in range(width)]
+            for _ in range(height)
+        ]
+        if height == 0:
+            orig = [[]]
+
+        exp = deepcopy(orig)
+        decoder.dc_prediction(exp)
+
+        if use_numpy:
+            band = NumPyArray2D(np.array(orig, dtype=np.int64))
+        else:
+            band = deepcopy(orig)
+        decoder.wavefront_dc_prediction(band)
+        assert band == exp
+
+        if not use_numpy:
+            assert not any(
+                isinstance(value, np.integer) for row in band for value in row
+            )
+
+    @pytest.mark.parametrize("fragment_slice_count", [0, 1])
+    @pytest.mark.parametrize("dwt_depth_ho", [0, 1])
+    def test_used_by_decoder(self, fragment_slice_count, dwt_depth_ho):
+        codec_features = deepcopy(MINIMAL_CODEC_FEATURES)
+        codec_features["profile"] = tables.Profiles.low_delay
+        codec_features["dwt_depth_ho"] = dwt_depth_ho
+        codec_features["fragment_slice_count"] = fragment_slice_count
+
+        pictures = list(
+            white_noise(
+                codec_features["video_parameters"],
+                codec_features["picture_coding_mode"],
+                2,
+            )
+        )
+        f = BytesIO()
+        bitstream.autofill_and_serialise_stream(
+            f,
+            bitstream.Stream(sequences=[make_sequence(codec_features, pictures)]),
+        )
+
+        all_decoded_pictures = []
+        for use_wavefront_dc_prediction in [False, True]:
+            decoded_pictures = []
+            state = State(
+                _output_picture_callback=lambda p, vp, pcm: decoded_pictures.append(
+                    p
+                ),
+                _use_wavefront_dc_prediction=use_wavefront_dc_prediction,
+            )
+
+            f.seek(0)
+            with patch.object(
+                transform_data_syntax,
+                "dc_prediction",
+                wraps=transform_data_syntax.dc_prediction,
+            ) as dc_prediction, patch.object(
+                transform_data_syntax,
+                "wavefront_dc_prediction",
+                wraps=transform_data_syntax.wavefront_dc_prediction,
+            ) as wavefront_dc_prediction:
+                decoder.init_io(state, f)
+                decoder.parse_stream(state)
+
+            if use_wavefront_dc_prediction:
+                assert dc_prediction.call_count == 0
+                assert wavefront_dc_prediction.call_count == 3 * len(pictures)
+            else:
+                assert dc_prediction.call_count == 3 * len(pictures)
+                assert wavefront_dc_prediction.call_count == 0
+
+            all_decoded_pictures.append(decoded_pictures)
+
+        assert len(all_decoded_pictures[0]) == len(pictures)
+        assert all_decoded_pictures[0] == all_decoded_pictures[1]
@@ -0,0 +1,243 @@
+import pytest
+
+import os
+
+from mock import patch
+
+from vc2_data_tables import Profiles
+
+from sample_codec_features import MINIMAL_CODEC_FEATURES
+
+from vc2_conformance.picture_generators import mid_gray
+
+from vc2_conformance.encoder import pictures as pictures_module
+
+from vc2_conformance.encoder.pictures import make_picture_data_units
+
+from vc2_conformance.encoder.sequence import make_sequence
+
+from vc2_conformance.encoder.picture_cache import (
+    canonical_repr,
+    PictureCache,
+    set_default_picture_cache,
+    get_default_picture_cache,
+)
+
+
+@pytest.fixture
+def picture():
+    return next(
+        mid_gray(
+            MINIMAL_CODEC_FEATURES["video_parameters"],
+            MINIMAL_CODEC_FEATURES["picture_coding_mode"],
+        )
+    )
+
+
+def test_canonical_repr():
+    # Dictionary ordering is ignored
+    assert canonical_repr({"a": 1, "b": 2}) == canonical_repr({"b": 2, "a": 1})
+
+    # IntEnums are treated as ints
+    assert canonical_repr(Profiles.high_quality) == canonical_repr(
+        int(Profiles.high_quality)
+    )
+
+    # Lists and tuples are equivalent
+    assert canonical_repr([1, 2]) == canonical_repr((1, 2))
+
+    # Nested values differ
+    assert canonical_repr({"a": [1, 2]}) != canonical_repr({"a": [1, 3]})
+
+
+class TestGetKey(object):
+    def test_ignores_name_and_pic_num(self, picture):
+        cache = PictureCache()
+
+        codec_features = MINIMAL_CODEC_FEATURES.copy()
+        codec_features["name"] = "foo"
+
+        assert cache.get_key(MINIMAL_CODEC_FEATURES, picture) == cache.get_key(
+            codec_features, dict(picture, pic_num=1234)
+        )
+
+    def test_sensitive_to_picture(self, picture):
+        cache = PictureCache()
+
+        picture2 = dict(picture, Y=[[v + 1 for v in row] for row in picture["Y"]])
+
+        assert cache.get_key(MINIMAL_CODEC_FEATURES, picture) != cache.get_key(
+            MINIMAL_CODEC_FEATURES, picture2
+        )
+
+    def test_sensitive_to_codec_features(self, picture):
+        cache = PictureCache()
+
+        codec_features = MINIMAL_CODEC_FEATURES.copy()
+        codec_features["slices_x"] += 1
+
+        assert cache.get_key(MINIMAL_CODEC_FEATURES, picture) != cache.get_key(
+            codec_features, picture
+        )
+
+    def test_sensitive_to_options(self, picture):
+        cache = PictureCache()
+
+        keys = set(
+            [
+                cache.get_key(MINIMAL_CODEC_FEATURES, picture),
+                cache.get_key(MINIMAL_CODEC_FEATURES, picture, 1),
+                cache.get_key(MINIMAL_CODEC_FEATURES, picture, 0, 2),
+            ]
+        )
+        assert len(keys) == 3
+
+    def test_sensitive_to_version(self, picture):
+        cache = PictureCache()
+
+        key = cache.get_key(MINIMAL_CODEC_FEATURES, picture)
+        with patch("vc2_conformance.encoder.picture_cache.__version__", "v0.0.0"):
+            assert cache.get_key(MINIMAL_CODEC_FEATURES, picture) != key
+
+
+class TestMakePictureDataUnits(object):
+    @pytest.mark.parametrize("fragment_slice_count", [0, 1])
+    def test_matches_uncached_version(self, picture, fragment_slice_count):
+        codec_features = MINIMAL_CODEC_FEATURES.copy()
+        codec_features["fragment_slice_count"] = fragment_slice_count
+
+        cache = PictureCache()
+
+        exp = make_picture_data_units(codec_features, picture)
+        assert cache.make_picture_data_units(codec_features, picture) == exp
+        assert cache.make_picture_data_units(codec_features, picture) == exp
+
+        assert cache.misses == 1
+        assert cache.hits == 1
+
+    @pytest.mark.parametrize("fragment_slice_count", [0, 1])
+    def test_picture_number_substituted(self, picture, fragment_slice_count):
+        codec_features = MINIMAL_CODEC_FEATURES.copy()
+        codec_features["fragment_slice_count"] = fragment_slice_count
+
+        cache = PictureCache()
+
+        for pic_num in [10, 20]:
+            picture = dict(picture, pic_num=pic_num)
+            exp = make_picture_data_units(codec_features, picture)
+            assert cache.make_picture_data_units(codec_features, picture) == exp
+
+        assert cache.misses == 1
+        assert cache.hits == 1
+
+    def test_returns_independent_copies(self, picture):
+        cache = PictureCache()
+
+        data_units_1 = cache.make_picture_data_units(MINIMAL_CODEC_FEATURES, picture)
+        data_units_1[0]["parse_info"]["next_parse_offset"] = 1234
+
+        data_units_2 = cache.make_picture_data_units(MINIMAL_CODEC_FEATURES, picture)
+        assert "next_parse_offset" not in data_units_2[0]["parse_info"]
+
+    def test_lru_eviction(self, picture):
+        cache = PictureCache(max_entries=2)
+
+        for minimum_qindex in [0, 1, 2, 0]:
+            cache.make_picture_data_units(
+                MINIMAL_CODEC_FEATURES, picture, minimum_qindex
+            )
+
+        # The first picture was evicted by the third, and so had to be
+        # re-encoded
+        assert cache.misses == 4
+        assert cache.hits == 0
+
+        # The most recently used entries remain
+        cache.make_picture_data_units(MINIMAL_CODEC_FEATURES, picture, 0)
+        cache.make_picture_data_units(MINIMAL_CODEC_FEATURES, picture, 2)
+        assert cache.misses == 4
+        assert cache.hits == 2
+
+    def test_on_disk_cache(self, tmpdir, picture):
+        directory = str(tmpdir.join("cache"))
+
+        cache = PictureCache(directory=directory)
+        exp = cache.make_picture_data_units(MINIMAL_CODEC_FEATURES, picture)
+        assert len(os.listdir(directory)) == 1
+
+        # A new cache (e.g. in another process) should not need to re-encode
+        # the picture
+        cache = PictureCache(directory=directory)
+        with patch.object(
+            pictures_module,
+            "make_picture_data_units",
+            side_effect=AssertionError("Should not be called"),
+        ):
+            assert cache.make_picture_data_units(MINIMAL_CODEC_FEATURES, picture) == exp
+        assert cache.hits == 1
+        assert cache.misses == 0
+
+        # Clearing the in-memory cache should leave the on-disk cache usable
+        cache.clear()
+        assert cache.make_picture_data_units(MINIMAL_CODEC_FEATURES, picture) == exp
+        assert cache.hits == 2
+
+
+class TestMakeSequenceIntegration(object):
+    @pytest.fixture
+    def pictures(self, picture):
+        return [dict(picture, pic_num=n) for n in range(3)]
+
+    def test_explicit_cache(self, pictures):
+        cache = PictureCache()
+
+        exp = make_sequence(MINIMAL_CODEC_FEATURES, pictures)
+        assert (
+            make_sequence(MINIMAL_CODEC_FEATURES, pictures, picture_cache=cache) == exp
+        )
+
+        assert cache.misses == 1
+        assert cache.hits == 2
+
+    def test_default_cache(self, pictures):
+        assert get_default_picture_cache() is None
+
+        cache = PictureCache()
+        set_default_picture_cache(cache)
+        try:
+            make_sequence(MINIMAL_CODEC_FEATURES, pictures)
+        finally:
+            set_default_picture_cache(None)
+
+        assert cache.misses == 1
+        assert cache.hits == 2
+
+
+def test_map_picture_data_units(picture):
+    cache = PictureCache()
+
+    mapped = []
+
+    def map_function(fn, iterable):
+        iterable = list(iterable)
+        mapped.extend(iterable)
+        return list(map(fn, iterable))
+
+    pictures_and_minimum_qindices = [
+        (dict(picture, pic_num=0), 0),
+        (dict(picture, pic_num=1), 1),
+        (dict(picture, pic_num=2), 0),
+    ]
+    assert cache.map_picture_data_units(
+        MINIMAL_CODEC_FEATURES,
+        pictures_and_minimum_qindices,
+        map_function=map_function,
+    ) == [
+        make_picture_data_units(MINIMAL_CODEC_FEATURES, picture, minimum_qindex)
+        for picture, minimum_qindex in pictures_and_minimum_qindices
+    ]
+
+    # Repeated pictures only compressed once
+    assert len(mapped) == 2
+    assert cache.misses == 2
+    assert cache.hits == 1
@@ -4,6 +4,8 @@ import numpy as np
 
 import os
 
+import random
+
 from io import BytesIO
 
 from copy import deepcopy
@@ -75,12 +77,15 @@ from vc2_conformance.encoder.pictures import (
     get_quantization_marix,
     serialize_quantization_matrix,
     apply_dc_prediction,
+    apply_dc_prediction_vectorised,
     calculate_coeffs_bits,
+    calculate_coeffs_bits_vectorised,
     calculate_hq_length_field,
     quantize_to_fit,
     quantize_coeffs,
     SliceCoeffs,
     ComponentCoeffs,
+    coeffs_to_array,
     transform_and_slice_picture,
     make_hq_slice,
     make_ld_slice,
@@ -221,6 +226,38 @@ def test_apply_dc_prediction():
     assert band == orig
 
 
+@pytest.mark.parametrize(
+    "height,width,max_value",
+    [
+        (0, 0, 1),
+        (1, 1, 100),
+        (1, 10, 100),
+        (10, 1, 100),
+        (5, 10, 255),
+        (10, 5, 255),
+        # Values too large for native integers
+        (4, 6, 2 ** 70),
+    ],
+)
+def test_apply_dc_prediction_vectorised(height, width, max_value):
+    rand = random.Random(0)
+
+    orig = [
+        [rand.randint(-max_value, max_value) for _ in range(width)]
+        for _ in range(height)
+    ]
+    if height == 0:
+        orig = [[]]
+
+    exp = deepcopy(orig)
+    apply_dc_prediction(exp)
+
+    band = deepcopy(orig)
+    apply_dc_prediction_vectorised(band)
+    assert band == exp
+    assert not any(isinstance(value, np.integer) for row in band for value in row)
+
+
 @pytest.mark.parametrize(
     "coeffs,exp",
     [
@@ -246,6 +283,44 @@ def test_calculate_coeffs_bits(coeffs, exp):
     assert calculate_coeffs_bits(coeffs) == exp
 
 
+@pytest.mark.parametrize(
+    "coeff_sets",
+    [
+        # Empty case
+        [],
+        # Empty and all-zero sets
+        [[], [0, 0, 0], []],
+        # Assorted values, internal and trailing zeros
+        [[1], [3, -1], [0, 1, 3], [1, 0, 3, 0, 0], [], [-7, 1000, -123456, 0]],
+        # Values near the limits of the integer-only path
+        [[(1 << 62) - 1, -(1 << 62) + 1, 0]],
+        # Values too large for the integer-only path
+        [[1 << 62], [-(1 << 100), 3, 0]],
+    ],
+)
+def test_calculate_coeffs_bits_vectorised(coeff_sets):
+    assert list(calculate_coeffs_bits_vectorised(coeff_sets)) == [
+        calculate_coeffs_bits(coeffs) for coeffs in coeff_sets
+    ]
+
+
+def test_calculate_coeffs_bits_vectorised_random():
+    rand = np.random.RandomState(0)
+    coeff_sets = [
+        list(
+            rand.randint(-(1 << 40), 1 << 40, size=rand.randint(0, 20))
+            >> rand.randint(0, 41)
+        )
+        + [0] * rand.randint(0, 3)
+        for _ in range(100)
+    ]
+    coeff_sets = [[int(c) for c in coeffs] for coeffs in coeff_sets]
+
+    assert list(calculate_coeffs_bits_vectorised(coeff_sets)) == [
+        calculate_coeffs_bits(coeffs) for coeffs in coeff_sets
+    ]
+
+
 @pytest.mark.parametrize(
     "coeffs,slice_size_scaler,exp",
     [
@@ -360,6 +435,28 @@ class TestQuantizeToFit(object):
         )
 
 
+@pytest.mark.parametrize(
+    "coeffs,dtype,exp_dtype",
+    [
+        # In range
+        ([[-32768, 0, 32767]], np.int16, np.int16),
+        ([], np.int16, np.int16),
+        # Out of range for the specified type
+        ([[-32769, 0, 0]], np.int16, object),
+        ([[0, 0, 32768]], np.int16, object),
+        # Out of range for any native type
+        ([[1 << 70, 0, 0]], np.int16, object),
+        ([[1 << 70, 0, 0]], np.int64, object),
+        # Object arrays requested
+        ([[1, 2, 3]], object, object),
+    ],
+)
+def test_coeffs_to_array(coeffs, dtype, exp_dtype):
+    array = coeffs_to_array(coeffs, dtype)
+    assert array.dtype == exp_dtype
+    assert array.tolist() == coeffs
+
+
 class TestTransformAndSlicePicture(object):
 
     # NB: These tests are essentially sanity checks. The later integration test
@@ -561,6 +658,30 @@ class TestTransformAndSlicePicture(object):
                     ([321] * 2)
                 )
 
+    def test_out_of_range_picture(self, codec_features, picture):
+        # Sample values far outside the 8 bit picture depth produce
+        # coefficients which don't fit the usual coefficient dtype (and, in
+        # one case, any native integer type). These must not be truncated.
+        picture["Y"][0][0] += 1 << 20
+        picture["Y"][0][2] += 1 << 70
+        transform_coeffs = transform_and_slice_picture(codec_features, picture)
+
+        assert transform_coeffs[0][0].Y.coeff_values == [
+            # Level 0, Subband L
+            (1 << 19) + 1,
+            (1 << 69) + 3,
+            13,
+            15,
+            # Level 0, Subband H
+            1 - (1 << 20),
+            1 - (1 << 70),
+            1,
+            1,
+        ]
+
+        # Other slices unaffected
+        assert transform_coeffs[0][1].Y.coeff_values == [5, 7, 17, 19, 1, 1, 1, 1]
+
     def test_dc_prediction(self, codec_features, picture):
         codec_features["profile"] = Profiles.low_delay
         transform_coeffs = transform_and_slice_picture(codec_features, picture)
@@ -11,7 +11,13 @@ from vc2_data_tables import (
 
 from vc2_conformance.encoder.exceptions import IncompatibleLevelAndDataUnitError
 
-from vc2_conformance.encoder.sequence import make_sequence
+from vc2_conformance.encoder.picture_cache import PictureCache
+
+from vc2_conformance.encoder.sequence import (
+    make_sequence,
+    iter_sequence_data_units,
+    make_and_serialise_sequence,
+)
 
 from vc2_conformance.picture_generators import (
     mid_gray,
@@ -214,3 +220,155 @@ def test_custom_sequence_restrictions_obeyed():
 
     # Sanity check
     assert serialize_and_decode(seq) == pictures
+
+
+class TestStreamingSequence(object):
+    @pytest.fixture
+    def codec_features(self):
+        codec_features = MINIMAL_CODEC_FEATURES.copy()
+        codec_features["picture_coding_mode"] = PictureCodingModes.pictures_are_fields
+        return codec_features
+
+    @pytest.fixture
+    def pictures(self, codec_features):
+        return list(
+            repeat_pictures(
+                mid_gray(
+                    codec_features["video_parameters"],
+                    codec_features["picture_coding_mode"],
+                ),
+                2,
+            )
+        )
+
+    @pytest.mark.parametrize(
+        "profile,fragment_slice_count",
+        [
+            (Profiles.high_quality, 0),
+            (Profiles.low_delay, 0),
+            (Profiles.high_quality, 1),
+        ],
+    )
+    @pytest.mark.parametrize(
+        "data_unit_patterns", [(), ("(sequence_header . padding_data)* .*",)]
+    )
+    def test_matches_make_sequence(
+        self,
+        codec_features,
+        pictures,
+        profile,
+        fragment_slice_count,
+        data_unit_patterns,
+    ):
+        codec_features["profile"] = profile
+        codec_features["fragment_slice_count"] = fragment_slice_count
+
+        seq = make_sequence(codec_features, pictures, *data_unit_patterns)
+
+        assert (
+            list(
+                iter_sequence_data_units(
+                    codec_features,
+                    iter(pictures),
+                    *data_unit_patterns,
+                    num_pictures=len(pictures)
+                )
+            )
+            == seq["data_units"]
+        )
+
+        exp = BytesIO()
+        autofill_and_serialise_stream(exp, Stream(sequences=[seq]))
+
+        f = BytesIO()
+        make_and_serialise_sequence(
+            f, codec_features, iter(pictures), *data_unit_patterns, num_pictures=4
+        )
+
+        assert f.getvalue() == exp.getvalue()
+
+    def test_pictures_compressed_lazily(self, codec_features, pictures):
+        consumed = []
+
+        def picture_generator():
+            for picture in pictures:
+                consumed.append(picture["pic_num"])
+                yield picture
+
+        data_units = iter_sequence_data_units(
+            codec_features, picture_generator(), num_pictures=len(pictures)
+        )
+
+        # NB: The first picture is always compressed up-front
+        assert next(data_units)["parse_info"]["parse_code"] == (
+            ParseCodes.sequence_header
+        )
+        assert consumed == [0]
+        assert next(data_units)["parse_info"]["parse_code"] == (
+            ParseCodes.high_quality_picture
+        )
+        assert consumed == [0]
+        assert next(data_units)["parse_info"]["parse_code"] == (
+            ParseCodes.high_quality_picture
+        )
+        assert consumed == [0, 1]
+
+    def test_too_few_pictures(self, codec_features, pictures):
+        with pytest.raises(ValueError):
+            list(
+                iter_sequence_data_units(
+                    codec_features, iter(pictures), num_pictures=len(pictures) + 1
+                )
+            )
+
+
+class TestParallelCompression(object):
+    @pytest.fixture
+    def codec_features(self):
+        codec_features = MINIMAL_CODEC_FEATURES.copy()
+        codec_features["picture_coding_mode"] = PictureCodingModes.pictures_are_fields
+        return codec_features
+
+    @pytest.fixture
+    def pictures(self, codec_features):
+        return list(
+            repeat_pictures(
+                mid_gray(
+                    codec_features["video_parameters"],
+                    codec_features["picture_coding_mode"],
+                ),
+                3,
+            )
+        )
+
+    def test_workers(self, codec_features, pictures):
+        assert make_sequence(codec_features, pictures, workers=2) == make_sequence(
+            codec_features, pictures
+        )
+
+    @pytest.mark.parametrize("use_cache", [False, True])
+    def test_executor(self, codec_features, pictures, use_cache):
+        batch_sizes = []
+
+        class SerialExecutor(object):
+            def map(self, fn, iterable):
+                iterable = list(iterable)
+                batch_sizes.append(len(iterable))
+                return [fn(v) for v in iterable]
+
+        kwargs = {"picture_cache": PictureCache()} if use_cache else {}
+
+        assert make_sequence(
+            codec_features,
+            pictures,
+            executor=SerialExecutor(),
+            workers=4,
+            minimum_qindex=[0, 1, 0, 1, 0, 1],
+            **kwargs
+        ) == make_sequence(codec_features, pictures, minimum_qindex=[0, 1, 0, 1, 0, 1])
+
+        if use_cache:
+            # Identical pictures are only compressed once
+            assert batch_sizes == [2]
+        else:
+            assert batch_sizes == [4, 2]
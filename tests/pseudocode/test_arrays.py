@@ -1,5 +1,11 @@
 import pytest
 
+import pickle
+
+import numpy as np
+
+from copy import deepcopy
+
 from vc2_conformance.pseudocode.arrays import (
     new_array,
     width,
@@ -8,6 +14,8 @@ from vc2_conformance.pseudocode.arrays import (
     column,
     delete_rows_after,
     delete_columns_after,
+    NumPyArray2D,
+    integer_dtype_for_range,
 )
 
 
@@ -92,3 +100,70 @@ def test_delete_columns_after(num_array):
         [10, 11],
         [20, 21],
     ]
+
+
+class TestNumPyArray2D(object):
+    @pytest.fixture
+    def num_array(self):
+        a = NumPyArray2D(np.zeros((3, 5), dtype=np.int64))
+        for x in range(width(a)):
+            for y in range(height(a)):
+                a[y][x] = x + (y * 10)
+        return a
+
+    def test_dimensions(self, num_array):
+        assert width(num_array) == 5
+        assert height(num_array) == 3
+
+    def test_row(self, num_array):
+        assert row(num_array, 1).tolist() == [10, 11, 12, 13, 14]
+
+        # Zero-copy
+        row(num_array, 2)[1] = 999
+        assert num_array.ndarray[2, 1] == 999
+
+    def test_column(self, num_array):
+        assert len(column(num_array, 1)) == 3
+        assert column(num_array, 1).tolist() == [1, 11, 21]
+
+        # Zero-copy
+        column(num_array, 2)[1] = 999
+        assert num_array[1][2] == 999
+
+    def test_delete_rows_and_columns(self, num_array):
+        delete_rows_after(num_array, 2)
+        delete_columns_after(num_array, 2)
+        assert num_array == [[0, 1], [10, 11]]
+        assert num_array.ndarray.shape == (2, 2)
+
+        # Rows and columns still views of the same array
+        row(num_array, 1)[0] = 999
+        assert column(num_array, 0).tolist() == [0, 999]
+
+    def test_copy(self, num_array):
+        for copied in [deepcopy(num_array), pickle.loads(pickle.dumps(num_array))]:
+            assert copied == num_array
+            row(copied, 0)[0] = 999
+            assert copied.ndarray[0, 0] == 999
+            assert num_array.ndarray[0, 0] == 0
+
+
+@pytest.mark.parametrize(
+    "lower,upper,exp",
+    [
+        # Signed types preferred
+        (0, 0, np.int8),
+        (-128, 127, np.int8),
+        # Unsigned types used when signed types are too narrow
+        (0, 255, np.uint8),
+        (-1, 255, np.int16),
+        (0, (1 << 16) - 1, np.uint16),
+        (-(1 << 31), (1 << 31) - 1, np.int32),
+        (0, (1 << 64) - 1, np.uint64),
+        # Too large for native types
+        (-1, (1 << 64) - 1, object),
+        (-(1 << 63) - 1, 0, object),
+    ],
+)
+def test_integer_dtype_for_range(lower, upper, exp):
+    assert integer_dtype_for_range(lower, upper) == np.dtype(exp)
@@ -0,0 +1,101 @@
+import pytest
+
+import random
+
+import numpy as np
+
+from copy import deepcopy
+
+import vc2_data_tables as tables
+
+from vc2_conformance.pseudocode.arrays import NumPyArray2D
+
+from vc2_conformance.pseudocode.picture_encoding import picture_encode
+
+from vc2_conformance.pseudocode.picture_decoding import (
+    picture_decode,
+    idwt_pad_removal,
+    clip_component,
+    offset_component,
+    pad_removal_clip_and_offset_component,
+)
+
+
+@pytest.fixture
+def state():
+    return {
+        "luma_width": 5,
+        "luma_height": 3,
+        "color_diff_width": 3,
+        "color_diff_height": 2,
+        "luma_depth": 8,
+        "color_diff_depth": 10,
+        "wavelet_index": tables.WaveletFilters.le_gall_5_3,
+        "wavelet_index_ho": tables.WaveletFilters.le_gall_5_3,
+        "dwt_depth": 1,
+        "dwt_depth_ho": 1,
+        "picture_number": 123,
+    }
+
+
+class TestPadRemovalClipAndOffsetComponent(object):
+    @pytest.mark.parametrize("c", ["Y", "C1", "C2"])
+    @pytest.mark.parametrize("use_numpy", [False, True])
+    def test_matches_pseudocode(self, state, c, use_numpy):
+        rand = random.Random(0)
+        comp_data = [[rand.randint(-2000, 2000) for _ in range(8)] for _ in range(4)]
+
+        exp = deepcopy(comp_data)
+        idwt_pad_removal(state, exp, c)
+        clip_component(state, exp, c)
+        offset_component(state, exp, c)
+
+        if use_numpy:
+            padded = NumPyArray2D(np.array(comp_data))
+        else:
+            padded = comp_data
+
+        out = pad_removal_clip_and_offset_component(state, padded, c)
+        assert isinstance(out, NumPyArray2D)
+        assert out == exp
+
+    def test_huge_values(self, state):
+        comp_data = [[2 ** 100, -(2 ** 100), 0, 1, 2]] * 3
+        out = pad_removal_clip_and_offset_component(state, comp_data, "Y")
+        assert out == [[255, 0, 128, 129, 130]] * 3
+
+    @pytest.mark.parametrize(
+        "depth,exp_dtype",
+        [(8, np.int16), (10, np.int16), (16, np.int32), (63, np.int64), (64, object)],
+    )
+    def test_output_dtype(self, state, depth, exp_dtype):
+        state["luma_depth"] = depth
+        comp_data = [[2 ** 100, -(2 ** 100), 0, 1, 2]] * 3
+        out = pad_removal_clip_and_offset_component(state, comp_data, "Y")
+        assert out.ndarray.dtype == exp_dtype
+        exp_row = [(2 ** depth) - 1, 0] + [2 ** (depth - 1) + i for i in range(3)]
+        assert out == [exp_row] * 3
+
+
+def test_picture_decode_with_fused_output_stage(state):
+    rand = random.Random(0)
+    picture = {
+        "Y": [[rand.randint(0, 255) for _ in range(5)] for _ in range(3)],
+        "C1": [[rand.randint(0, 1023) for _ in range(3)] for _ in range(2)],
+        "C2": [[rand.randint(0, 1023) for _ in range(3)] for _ in range(2)],
+        "pic_num": 123,
+    }
+
+    pictures = []
+    state["_output_picture_callback"] = lambda picture, vp, pcm: pictures.append(
+        picture
+    )
+    state["video_parameters"] = None
+    state["picture_coding_mode"] = None
+    state["_use_fused_output_stage"] = True
+
+    picture_encode(state, deepcopy(picture))
+    picture_decode(state)
+
+    assert pictures == [state["current_picture"]]
+    assert state["current_picture"] == picture
@@ -2,7 +2,15 @@ import pytest
 
 from vc2_conformance.pseudocode.state import State
 
-from vc2_conformance.pseudocode.slice_sizes import slices_have_same_dimensions
+from vc2_conformance.pseudocode.slice_sizes import (
+    slices_have_same_dimensions,
+    slice_left,
+    slice_right,
+    slice_top,
+    slice_bottom,
+    SliceGeometry,
+    get_slice_geometry,
+)
 
 
 @pytest.mark.parametrize(
@@ -46,3 +54,61 @@ def test_slices_have_same_dimensions(
     state.update(state_override)
 
     assert slices_have_same_dimensions(state) is exp_same_dimensions
+
+
+class TestSliceGeometry(object):
+    @pytest.fixture
+    def state(self):
+        return State(
+            luma_width=29,
+            luma_height=13,
+            color_diff_width=15,
+            color_diff_height=7,
+            dwt_depth=2,
+            dwt_depth_ho=1,
+            slices_x=3,
+            slices_y=2,
+        )
+
+    def test_matches_pseudocode(self, state):
+        geometry = SliceGeometry(state)
+        for comp in ["Y", "C1", "C2"]:
+            for level in range(4):
+                for sx in range(state["slices_x"]):
+                    assert geometry.slice_left(sx, comp, level) == slice_left(
+                        state, sx, comp, level
+                    )
+                    assert geometry.slice_right(sx, comp, level) == slice_right(
+                        state, sx, comp, level
+                    )
+                for sy in range(state["slices_y"]):
+                    assert geometry.slice_top(sy, comp, level) == slice_top(
+                        state, sy, comp, level
+                    )
+                    assert geometry.slice_bottom(sy, comp, level) == slice_bottom(
+                        state, sy, comp, level
+                    )
+
+    def test_slice_rectangles(self, state):
+        geometry = SliceGeometry(state)
+        rectangles = geometry.slice_rectangles("C1", 2)
+        assert rectangles.shape == (2, 3, 4)
+        for sy in range(2):
+            for sx in range(3):
+                assert rectangles[sy, sx].tolist() == [
+                    slice_top(state, sy, "C1", 2),
+                    slice_bottom(state, sy, "C1", 2),
+                    slice_left(state, sx, "C1", 2),
+                    slice_right(state, sx, "C1", 2),
+                ]
+
+    def test_get_slice_geometry_cached(self, state):
+        geometry = get_slice_geometry(state)
+        assert get_slice_geometry(state.copy()) is geometry
+
+        for name in ["slices_x", "slices_y", "dwt_depth", "luma_width"]:
+            changed_state = state.copy()
+            changed_state[name] += 1
+            changed_geometry = get_slice_geometry(changed_state)
+            assert changed_geometry is not geometry
+            assert changed_geometry.key != geometry.key
@@ -0,0 +1,116 @@
+"""
+Regression checks that the command line tools do not import (comparatively
+slow to import) subsystems they do not need at startup and that they import
+within a (generous) time budget.
+"""
+
+import pytest
+
+import sys
+
+import subprocess
+
+
+def get_imported_modules(module_name, preimport=None):
+    """
+    Import the named module in a fresh interpreter with ``-X importtime`` and
+    return a dictionary mapping every module imported as a result to its
+    cumulative import time (in microseconds). If ``preimport`` is given, that
+    module is imported first (and so is not included in the timings of
+    ``module_name``).
+    """
+    command = "import {}".format(module_name)
+    if preimport is not None:
+        command = "import {}; {}".format(preimport, command)
+    output = subprocess.check_output(
+        [sys.executable, "-X", "importtime", "-c", command],
+        stderr=subprocess.STDOUT,
+    )
+    out = {}
+    for line in output.decode("utf-8").splitlines():
+        if line.startswith("import time:"):
+            _, cumulative, name = line[len("import time:") :].split("|")
+            if cumulative.strip().isdigit():
+                out[name.strip()] = int(cumulative)
+    return out
+
+
+# Modules which the command line tools below should never import at startup
+HEAVY_MODULES = [
+    "PIL",
+    "vc2_bit_widths",
+    "vc2_conformance.encoder",
+    "vc2_conformance.test_cases",
+    "vc2_conformance.picture_generators",
+]
+
+
+@pytest.mark.skipif(
+    sys.version_info < (3, 7), reason="-X importtime requires Python 3.7+"
+)
+@pytest.mark.parametrize(
+    "module_name,unwanted_modules",
+    [
+        (
+            "vc2_conformance.scripts.vc2_bitstream_validator",
+            HEAVY_MODULES + ["vc2_conformance.bitstream"],
+        ),
+        (
+            "vc2_conformance.scripts.vc2_picture_compare",
+            HEAVY_MODULES
+            + ["vc2_conformance.bitstream", "vc2_conformance.color_conversion"],
+        ),
+        (
+            "vc2_conformance.scripts.vc2_picture_explain",
+            HEAVY_MODULES + ["vc2_conformance.bitstream", "vc2_conformance.decoder"],
+        ),
+        (
+            "vc2_conformance.scripts.vc2_bitstream_viewer",
+            HEAVY_MODULES + ["numpy", "vc2_conformance.decoder"],
+        ),
+        (
+            "vc2_conformance",
+            HEAVY_MODULES
+            + [
+                "numpy",
+                "vc2_conformance.bitstream",
+                "vc2_conformance.decoder",
+                "vc2_conformance.pseudocode",
+            ],
+        ),
+    ],
+)
+def test_heavy_modules_not_imported(module_name, unwanted_modules):
+    imported_modules = get_imported_modules(module_name)
+    assert module_name in imported_modules
+    assert set(unwanted_modules).isdisjoint(imported_modules)
+
+
+@pytest.mark.skipif(
+    sys.version_info < (3, 7), reason="-X importtime requires Python 3.7+"
+)
+@pytest.mark.parametrize(
+    "module_name,budget",
+    [
+        ("vc2_conformance.scripts.vc2_bitstream_validator", 2.0),
+        ("vc2_conformance.scripts.vc2_picture_compare", 2.0),
+        ("vc2_conformance.scripts.vc2_picture_explain", 2.0),
+        ("vc2_conformance.scripts.vc2_bitstream_viewer", 2.0),
+        ("vc2_conformance", 0.1),
+    ],
+)
+def test_import_time_budget(module_name, budget):
+    # Since absolute import times vary widely between machines (and with
+    # machine load), the budget is given as a multiple of the time taken to
+    # import NumPy (which is imported first, within the same interpreter).
+    # The tools currently take around 0.5-1.2 times as long as NumPy to
+    # import, whilst (for example) the test case generators alone take over
+    # twice as long.
+    #
+    # NB: The best of several attempts is used to reduce sensitivity to other
+    # activity on the test machine.
+    def get_ratio():
+        imported_modules = get_imported_modules(module_name, preimport="numpy")
+        return float(imported_modules[module_name]) / imported_modules["numpy"]
+
+    assert min(get_ratio() for _ in range(3)) < budget
@@ -6,11 +6,11 @@ import traceback
 
 from vc2_conformance.string_utils import wrap_paragraphs
 
-from vc2_conformance.pseudocode.state import State
+from vc2_conformance.pseudocode.state import State, FastState
 
 from vc2_conformance.decoder import parse_stream
 
-from vc2_conformance.file_format import read
+from vc2_conformance.file_format import read, PictureContainerReader
 
 from vc2_conformance.py2x_compat import quote
 
@@ -150,6 +150,37 @@ class TestBitstreamValidator(object):
             picture, video_parameters, picture_coding_mode = read(output_name % i)
             assert picture["pic_num"] == expected_picture_number
 
+    @pytest.mark.parametrize(
+        "debug,exp_state_type", [(False, FastState), (True, State)]
+    )
+    def test_debug(self, valid_bitstream, output_name, debug, exp_state_type):
+        v = BitstreamValidator(valid_bitstream, False, 0, output_name, debug)
+        assert v.run() == 0
+        assert type(v._state) is exp_state_type
+        assert v._state.get("_use_fused_output_stage", False) is not debug
+        assert v._state.get("_use_wavefront_dc_prediction", False) is not debug
+        assert v._state.get("_use_sequence_header_cache", False) is False
+
+    @pytest.mark.parametrize("debug", [False, True])
+    @pytest.mark.parametrize("skip", [False, True])
+    def test_skip_repeated_sequence_headers(
+        self, tmpdir, valid_bitstream, output_name, debug, skip
+    ):
+        filename = str(tmpdir.join("multi_sequence.vc2"))
+        with open(filename, "wb") as f:
+            f.write(open(valid_bitstream, "rb").read() * 2)
+
+        v = BitstreamValidator(
+            filename,
+            False,
+            0,
+            output_name,
+            debug=debug,
+            skip_repeated_sequence_headers=skip,
+        )
+        assert v.run() == 0
+        assert v._state.get("_use_sequence_header_cache", False) is skip
+
     def test_valid_multi_sequence_stream(
         self,
         tmpdir,
@@ -182,6 +213,46 @@ class TestBitstreamValidator(object):
             picture, video_parameters, picture_coding_mode = read(output_name % i)
             assert picture["pic_num"] == expected_picture_number
 
+    def test_picture_container_output(
+        self, tmpdir, valid_bitstream, output_name, capsys
+    ):
+        container_name = str(tmpdir.join("pictures.vc2pics"))
+        v = BitstreamValidator(valid_bitstream, True, 0, container_name)
+        assert v.run() == 0
+
+        stdout, stderr = capsys.readouterr()
+        assert (
+            "%] Decoded picture written to {} (index 1)".format(container_name)
+            in stderr
+        )
+
+        # All pictures written to the container and no other files created
+        assert tmpdir.listdir(sort=True) == [
+            tmpdir.join("bitstream.vc2"),
+            tmpdir.join("pictures.vc2pics"),
+        ]
+
+        # Pictures should match those written to individual files
+        v = BitstreamValidator(valid_bitstream, False, 0, output_name)
+        assert v.run() == 0
+        with PictureContainerReader(container_name) as container:
+            assert len(container) == 2
+            for i, expected_picture_number in enumerate([100, 101]):
+                assert container.get_picture_number(i) == expected_picture_number
+                assert container.read(i) == read(output_name % i)
+
+    def test_picture_container_closed_on_error(self, tmpdir, filename, capsys):
+        # An invalid bitstream (no pictures decoded)
+        with open(filename, "wb") as f:
+            f.write(b"\x00" * 13)
+
+        output_name = str(tmpdir.join("pictures.vc2pics"))
+        v = BitstreamValidator(filename, False, 0, output_name)
+        assert v.run() == 2
+
+        with PictureContainerReader(output_name) as container:
+            assert len(container) == 0
+
     def test_disabled_status_line(self, valid_bitstream, output_name, capsys):
         v = BitstreamValidator(valid_bitstream, False, 0, output_name)
         assert v.run() == 0
@@ -295,3 +366,14 @@ def test_parse_args_output_name_validation():
 
     with pytest.raises(SystemExit):
         parse_args(["foo", "--output", "no_pattern_sign.raw"])
+
+    # Picture containers don't require a pattern
+    args = parse_args(["foo", "--output", "container.vc2pics"])
+    assert args.output == "container.vc2pics"
+
+
+def test_parse_args_skip_repeated_sequence_headers():
+    assert parse_args(["foo"]).skip_repeated_sequence_headers is False
+
+    args = parse_args(["foo", "--skip-repeated-sequence-headers"])
+    assert args.skip_repeated_sequence_headers is True
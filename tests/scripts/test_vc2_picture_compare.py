@@ -2,8 +2,12 @@ import pytest
 
 import os
 
+import sys
+
 import numpy as np
 
+from mock import patch
+
 from vc2_data_tables import (
     PictureCodingModes,
     ColorDifferenceSamplingFormats,
@@ -13,12 +17,14 @@ from vc2_data_tables import (
     PresetTransferFunctions,
 )
 
-from vc2_conformance.file_format import read, write
+from vc2_conformance.file_format import read, write, PictureContainerWriter
 
 from vc2_conformance.pseudocode.video_parameters import VideoParameters
 
 from vc2_conformance.scripts.vc2_picture_compare import (
     read_pictures_with_only_one_metadata_file_required,
+    files_identical,
+    find_first_difference,
     video_parameter_diff,
     picture_coding_mode_diff,
     picture_number_diff,
@@ -27,6 +33,9 @@ from vc2_conformance.scripts.vc2_picture_compare import (
     generate_difference_mask_picture,
     compare_pictures,
     enumerate_directories,
+    open_picture_containers,
+    call_catching_exit,
+    imap_in_order,
     main,
 )
 
@@ -140,8 +149,17 @@ class TestReadPicturesWithOnlyOneMetadataFileRequired(object):
             byte_for_byte_identical,
         ) = read_pictures_with_only_one_metadata_file_required(fa, fb)
 
-        assert picture_a == read(fa)
-        assert picture_b == read(fb)
+        for (picture, video_parameters, picture_coding_mode), filename in [
+            (picture_a, fa),
+            (picture_b, fb),
+        ]:
+            exp_picture, exp_video_parameters, exp_picture_coding_mode = read(filename)
+            assert video_parameters == exp_video_parameters
+            assert picture_coding_mode == exp_picture_coding_mode
+            assert picture["pic_num"] == exp_picture["pic_num"]
+            for c in ["Y", "C1", "C2"]:
+                assert isinstance(picture[c], np.memmap)
+                assert picture[c].tolist() == exp_picture[c]
 
     @pytest.mark.parametrize("to_remove", ["a.json", "b.json"])
     def test_two_files_one_metadata(self, tmpdir, capsys, to_remove):
@@ -239,6 +257,14 @@ class TestReadPicturesWithOnlyOneMetadataFileRequired(object):
 
         assert byte_for_byte_identical
 
+        # NB: Take a copy of the (10 bit) sample values since the pictures are
+        # memory mapped.
+        def masked_values(picture):
+            return {c: (picture[c] & 0x3FF).tolist() for c in ["Y", "C1", "C2"]}
+
+        picture_a_1 = masked_values(picture_a_1[0])
+        picture_b_1 = masked_values(picture_b_1[0])
+
         # Write something non-zero in the padding bits of one file
         with open(fa, "rb+") as f:
             f.seek(1)
@@ -254,8 +280,8 @@ class TestReadPicturesWithOnlyOneMetadataFileRequired(object):
         assert not byte_for_byte_identical
 
         # Pictures should be identical
-        assert picture_a_1 == picture_a_2
-        assert picture_b_1 == picture_b_2
+        assert picture_a_1 == masked_values(picture_a_2[0])
+        assert picture_b_1 == masked_values(picture_b_2[0])
 
 
 def test_video_parameter_diff():
@@ -675,6 +701,82 @@ class TestEnumerateDirectories(object):
         assert files[0][1].endswith("pic_1.raw")
 
 
+@pytest.mark.parametrize(
+    "data_a,data_b,exp",
+    [
+        (b"", b"", True),
+        (b"abcdefgh", b"abcdefgh", True),
+        (b"abcdefgh", b"abcdefgx", False),
+        (b"abcdefgh", b"xbcdefgh", False),
+        (b"abcdefgh", b"abcdefg", False),
+    ],
+)
+def test_files_identical(tmpdir, data_a, data_b, exp):
+    fa = str(tmpdir.join("a"))
+    fb = str(tmpdir.join("b"))
+    with open(fa, "wb") as f:
+        f.write(data_a)
+    with open(fb, "wb") as f:
+        f.write(data_b)
+
+    # NB: Small chunk size to exercise chunking
+    assert files_identical(fa, fb, chunk_size=3) is exp
+
+
+class TestFindFirstDifference(object):
+    @pytest.fixture
+    def video_parameters(self):
+        return VideoParameters(
+            frame_width=4,
+            frame_height=2,
+            color_diff_format_index=ColorDifferenceSamplingFormats.color_4_2_2,
+            luma_excursion=255,
+            color_diff_excursion=255,
+        )
+
+    @pytest.fixture
+    def picture(self):
+        return {
+            "Y": np.arange(8, dtype=np.uint16).reshape(2, 4),
+            "C1": np.arange(4, dtype=np.uint16).reshape(2, 2),
+            "C2": np.arange(4, dtype=np.uint16).reshape(2, 2),
+            "pic_num": 0,
+        }
+
+    def test_identical(self, picture, video_parameters):
+        assert (
+            find_first_difference(
+                picture,
+                picture,
+                video_parameters,
+                PictureCodingModes.pictures_are_frames,
+            )
+            is None
+        )
+
+    def test_padding_bits_ignored(self, picture, video_parameters):
+        picture_b = {c: np.copy(v) for c, v in picture.items()}
+        picture_b["Y"][1, 1] |= 0x0100
+        assert (
+            find_first_difference(
+                picture,
+                picture_b,
+                video_parameters,
+                PictureCodingModes.pictures_are_frames,
+            )
+            is None
+        )
+
+    def test_first_difference_in_file_order(self, picture, video_parameters):
+        picture_b = {c: np.copy(v) for c, v in picture.items()}
+        picture_b["C2"][0, 0] = 100
+        picture_b["C1"][1, 1] = 100
+        picture_b["C1"][1, 0] = 200
+        assert find_first_difference(
+            picture, picture_b, video_parameters, PictureCodingModes.pictures_are_frames
+        ) == ("C1", 1, 0, 2, 200)
+
+
 class TestComparePictures(object):
     def test_video_parameters_different(self, tmpdir):
         fa = str(tmpdir.join("a.raw"))
@@ -768,6 +870,55 @@ class TestComparePictures(object):
         assert "Pictures are identical" in out
         assert "Warning: Padding bits in raw picture data are different" in out
 
+    def test_identical_files_not_decoded(self, tmpdir):
+        fa = str(tmpdir.join("a.raw"))
+        fb = str(tmpdir.join("b.raw"))
+
+        generate_picture(fa)
+        generate_picture(fb)
+
+        with patch(
+            "vc2_conformance.scripts.vc2_picture_compare.measure_differences"
+        ) as measure_differences:
+            out, exitcode = compare_pictures(fa, fb)
+        assert exitcode == 0
+        assert out == "Pictures are identical"
+        assert not measure_differences.called
+
+    def test_first_difference(self, tmpdir):
+        fa = str(tmpdir.join("a.raw"))
+        fb = str(tmpdir.join("b.raw"))
+
+        y = np.zeros((4, 8), dtype=int)
+        c = np.zeros((2, 4), dtype=int)
+        generate_picture(fa, (y, c, c))
+        y[2, 5] = 10
+        y[3, 0] = 20
+        generate_picture(fb, (y, c, c))
+
+        out, exitcode = compare_pictures(fa, fb, first_difference=True)
+        assert exitcode == 4
+        assert out == (
+            "Pictures are different:\n"
+            "  First difference in Y at row 2, column 5: 0 vs 10"
+        )
+
+    def test_first_difference_identical_but_different_padding(self, tmpdir):
+        fa = str(tmpdir.join("a.raw"))
+        fb = str(tmpdir.join("b.raw"))
+
+        generate_picture(fa)
+        generate_picture(fb)
+
+        with open(fa, "rb+") as f:
+            f.seek(1)
+            f.write(bytearray([0xF0]))
+
+        out, exitcode = compare_pictures(fa, fb, first_difference=True)
+        assert exitcode == 0
+        assert "Pictures are identical" in out
+        assert "Warning: Padding bits in raw picture data are different" in out
+
     def test_difference_mask(self, tmpdir):
         fa = str(tmpdir.join("a.raw"))
         fb = str(tmpdir.join("b.raw"))
@@ -812,6 +963,103 @@ class TestComparePictures(object):
         assert picture_coding_mode == picture_coding_mode_a
 
 
+def generate_container(filename, picture_filenames):
+    """
+    Write a picture container containing the (previously generated) pictures
+    with the specified filenames.
+    """
+    with PictureContainerWriter(filename) as container:
+        for picture_filename in picture_filenames:
+            container.write(*read(picture_filename))
+
+
+class TestOpenPictureContainers(object):
+    def test_valid(self, tmpdir):
+        generate_picture(str(tmpdir.join("pic.raw")))
+        fa = str(tmpdir.join("a.vc2pics"))
+        fb = str(tmpdir.join("b.vc2pics"))
+        generate_container(fa, [str(tmpdir.join("pic.raw"))] * 2)
+        generate_container(fb, [str(tmpdir.join("pic.raw"))] * 2)
+
+        container_a, container_b = open_picture_containers(fa, fb)
+        assert container_a.filename == fa
+        assert container_b.filename == fb
+        assert len(container_a) == len(container_b) == 2
+
+    @pytest.mark.parametrize("corrupt", ["a", "b"])
+    def test_invalid_container(self, tmpdir, capsys, corrupt):
+        generate_picture(str(tmpdir.join("pic.raw")))
+        fa = str(tmpdir.join("a.vc2pics"))
+        fb = str(tmpdir.join("b.vc2pics"))
+        generate_container(fa, [str(tmpdir.join("pic.raw"))])
+        generate_container(fb, [str(tmpdir.join("pic.raw"))])
+
+        with open(str(tmpdir.join("{}.vc2pics".format(corrupt))), "rb+") as f:
+            f.truncate(10)
+
+        with pytest.raises(SystemExit) as exc_info:
+            open_picture_containers(fa, fb)
+        assert exc_info.value.code == 109
+
+        out, err = capsys.readouterr()
+        assert "Could not read picture container" in err
+
+    def test_different_lengths(self, tmpdir, capsys):
+        generate_picture(str(tmpdir.join("pic.raw")))
+        fa = str(tmpdir.join("a.vc2pics"))
+        fb = str(tmpdir.join("b.vc2pics"))
+        generate_container(fa, [str(tmpdir.join("pic.raw"))] * 2)
+        generate_container(fb, [str(tmpdir.join("pic.raw"))] * 3)
+
+        with pytest.raises(SystemExit) as exc_info:
+            open_picture_containers(fa, fb)
+        assert exc_info.value.code == 110
+
+        out, err = capsys.readouterr()
+        assert "different numbers of pictures (2 and 3)" in err
+
+
+def exit_if_negative(value):
+    if value < 0:
+        sys.exit(-value)
+    return value * 2
+
+
+def test_call_catching_exit():
+    assert call_catching_exit(exit_if_negative, 10) == (None, 20)
+    assert call_catching_exit(exit_if_negative, -10) == (10, None)
+
+
+class TestIMapInOrder(object):
+    @pytest.mark.parametrize("jobs", [1, 2, 3])
+    def test_results_in_order(self, jobs):
+        assert list(
+            imap_in_order(exit_if_negative, [(v,) for v in range(20)], jobs)
+        ) == [v * 2 for v in range(20)]
+
+    @pytest.mark.parametrize("jobs", [1, 2, 3])
+    def test_bounded_in_flight(self, jobs):
+        num_submitted = [0]
+
+        def values():
+            for v in range(100):
+                num_submitted[0] += 1
+                yield (v,)
+
+        results = imap_in_order(exit_if_negative, values(), jobs)
+        assert next(results) == 0
+        assert num_submitted[0] <= max(2 * jobs, 1)
+        assert list(results) == [v * 2 for v in range(1, 100)]
+
+    @pytest.mark.parametrize("jobs", [1, 2])
+    def test_exit_propagated(self, jobs):
+        results = imap_in_order(exit_if_negative, [(1,), (-123,), (2,)], jobs)
+        assert next(results) == 2
+        with pytest.raises(SystemExit) as exc_info:
+            next(results)
+        assert exc_info.value.code == 123
+
+
 class TestMain(object):
     def test_files_no_difference_mask(self, tmpdir, capsys):
         fa = os.path.join(str(tmpdir), "a.raw")
@@ -872,7 +1120,8 @@ class TestMain(object):
         out, err = capsys.readouterr()
         assert "can only be used when files" in err
 
-    def test_comparing_multiple_files(self, tmpdir, capsys):
+    @pytest.mark.parametrize("jobs", [[], ["--jobs", "2"], ["-j", "4"]])
+    def test_comparing_multiple_files(self, tmpdir, capsys, jobs):
         da = os.path.join(str(tmpdir), "a")
         db = os.path.join(str(tmpdir), "b")
         os.mkdir(da)
@@ -887,7 +1136,7 @@ class TestMain(object):
         generate_picture(os.path.join(da, "a_pic_2.raw"))
         generate_picture(os.path.join(db, "b_pic_2.raw"))
 
-        assert main([da, db]) == 4
+        assert main([da, db] + jobs) == 4
         out, err = capsys.readouterr()
         assert out == (
             "Comparing {} and {}:\n"
@@ -908,3 +1157,130 @@ class TestMain(object):
             os.path.join(da, "a_pic_2.raw"),
             os.path.join(db, "b_pic_2.raw"),
         )
+
+    @pytest.mark.parametrize("jobs", [[], ["--jobs", "2"]])
+    def test_comparing_picture_containers(self, tmpdir, capsys, jobs):
+        generate_picture(str(tmpdir.join("pic_0.raw")))
+        generate_picture(str(tmpdir.join("pic_1.raw")), pixel_values=1)
+
+        fa = str(tmpdir.join("a.vc2pics"))
+        fb = str(tmpdir.join("b.vc2pics"))
+        generate_container(
+            fa, [str(tmpdir.join("pic_0.raw")), str(tmpdir.join("pic_0.raw"))]
+        )
+        generate_container(
+            fb, [str(tmpdir.join("pic_0.raw")), str(tmpdir.join("pic_1.raw"))]
+        )
+
+        assert main([fa, fb] + jobs) == 4
+        out, err = capsys.readouterr()
+        assert out == (
+            "Comparing {a}[0] and {b}[0]:\n"
+            "  Pictures are identical\n"
+            "Comparing {a}[1] and {b}[1]:\n"
+            "  Pictures are different:\n"
+            "    Y: Different: PSNR = 60.2 dB, 32 pixels (100.0%) differ\n"
+            "    C1: Different: PSNR = 60.2 dB, 8 pixels (100.0%) differ\n"
+            "    C2: Different: PSNR = 60.2 dB, 8 pixels (100.0%) differ\n"
+            "Summary: 1 identical, 1 different\n"
+        ).format(a=fa, b=fb)
+
+    def test_picture_containers_different_padding(self, tmpdir, capsys):
+        generate_picture(str(tmpdir.join("pic.raw")))
+
+        fa = str(tmpdir.join("a.vc2pics"))
+        fb = str(tmpdir.join("b.vc2pics"))
+        generate_container(fa, [str(tmpdir.join("pic.raw"))])
+        generate_container(fb, [str(tmpdir.join("pic.raw"))])
+
+        # Write something non-zero in the padding bits of the first sample
+        # (following the 8 byte container header)
+        with open(fa, "rb+") as f:
+            f.seek(8 + 1)
+            f.write(bytearray([0xF0]))
+
+        assert main([fa, fb]) == 0
+        out, err = capsys.readouterr()
+        assert "Warning: Padding bits in raw picture data are different" in out
+
+    @pytest.mark.parametrize("a_is_container", [True, False])
+    def test_picture_containers_mixed_with_files(self, tmpdir, capsys, a_is_container):
+        fp = str(tmpdir.join("pic.raw"))
+        fc = str(tmpdir.join("pics.vc2pics"))
+        generate_picture(fp)
+        generate_container(fc, [fp])
+
+        if a_is_container:
+            assert main([fc, fp]) == 103
+        else:
+            assert main([fp, fc]) == 103
+        out, err = capsys.readouterr()
+        assert "must both be picture containers" in err
+
+    def test_picture_containers_with_difference_mask(self, tmpdir, capsys):
+        fp = str(tmpdir.join("pic.raw"))
+        fc = str(tmpdir.join("pics.vc2pics"))
+        fd = str(tmpdir.join("d.raw"))
+        generate_picture(fp)
+        generate_container(fc, [fp])
+
+        assert main([fc, fc, "--difference-mask", fd]) == 104
+        out, err = capsys.readouterr()
+        assert "can only be used when files" in err
+
+    def test_error_in_parallel_comparison(self, tmpdir, capsys):
+        da = os.path.join(str(tmpdir), "a")
+        db = os.path.join(str(tmpdir), "b")
+        os.mkdir(da)
+        os.mkdir(db)
+
+        for i in range(4):
+            generate_picture(os.path.join(da, "pic_{}.raw".format(i)))
+            generate_picture(os.path.join(db, "pic_{}.raw".format(i)))
+
+        # Make one picture unreadable
+        os.remove(os.path.join(da, "pic_2.json"))
+        os.remove(os.path.join(db, "pic_2.json"))
+
+        with pytest.raises(SystemExit) as exc_info:
+            main([da, db, "--jobs", "2"])
+        assert exc_info.value.code == 100
+
+        # Results prior to the failing picture still reported
+        out, err = capsys.readouterr()
+        assert out.count("Pictures are identical") == 2
+
+    def test_invalid_jobs(self, tmpdir):
+        with pytest.raises(SystemExit):
+            main([str(tmpdir), str(tmpdir), "--jobs", "0"])
+
+    @pytest.mark.parametrize("jobs", [[], ["--jobs", "2"]])
+    def test_first_difference_stops_early(self, tmpdir, capsys, jobs):
+        da = os.path.join(str(tmpdir), "a")
+        db = os.path.join(str(tmpdir), "b")
+        os.mkdir(da)
+        os.mkdir(db)
+
+        for i, (value_a, value_b) in enumerate([(0, 0), (0, 1), (0, 2)]):
+            generate_picture(os.path.join(da, "pic_{}.raw".format(i)), value_a)
+            generate_picture(os.path.join(db, "pic_{}.raw".format(i)), value_b)
+
+        assert main([da, db, "--first-difference"] + jobs) == 4
+        out, err = capsys.readouterr()
+        assert out == (
+            "Comparing {} and {}:\n"
+            "  Pictures are identical\n"
+            "Comparing {} and {}:\n"
+            "  Pictures are different:\n"
+            "    First difference in Y at row 0, column 0: 0 vs 1\n"
+            "Summary: 1 identical, 1 different (stopped at first difference)\n"
+        ).format(
+            os.path.join(da, "pic_0.raw"),
+            os.path.join(db, "pic_0.raw"),
+            os.path.join(da, "pic_1.raw"),
+            os.path.join(db, "pic_1.raw"),
+        )
+
+    def test_first_difference_with_difference_mask(self, tmpdir):
+        with pytest.raises(SystemExit):
+            main(["a.raw", "b.raw", "--first-difference", "-D", "d.raw"])
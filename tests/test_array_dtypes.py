@@ -0,0 +1,200 @@
+import pytest
+
+import numpy as np
+
+from copy import deepcopy
+
+from vc2_data_tables import (
+    BaseVideoFormats,
+    PictureCodingModes,
+    ColorDifferenceSamplingFormats,
+    WaveletFilters,
+)
+
+from vc2_conformance.pseudocode.video_parameters import set_source_defaults
+
+from vc2_conformance.pseudocode.state import State
+
+from vc2_conformance.pseudocode.picture_encoding import dwt
+
+from vc2_conformance.pseudocode.picture_decoding import idwt
+
+from vc2_conformance.array_dtypes import (
+    StageDtypes,
+    compute_stage_dtypes,
+    get_filter_bounds,
+)
+
+
+@pytest.fixture
+def video_parameters():
+    vp = set_source_defaults(BaseVideoFormats.hd1080p_50)
+    vp["color_diff_format_index"] = ColorDifferenceSamplingFormats.color_4_2_2
+    vp["luma_excursion"] = 200  # 8 bits
+    vp["color_diff_excursion"] = (1 << 18) - 100  # 18 bits
+    return vp
+
+
+def test_sample_dtypes_only(video_parameters):
+    stage_dtypes = compute_stage_dtypes(
+        video_parameters, PictureCodingModes.pictures_are_frames
+    )
+
+    assert list(stage_dtypes.items()) == [
+        (
+            "Y",
+            StageDtypes(
+                samples=np.uint8,
+                offset_samples=np.int8,
+                sample_differences=np.int16,
+                coefficients=object,
+                intermediates=object,
+            ),
+        ),
+        (
+            "C1",
+            StageDtypes(
+                samples=np.int32,
+                offset_samples=np.int32,
+                sample_differences=np.int32,
+                coefficients=object,
+                intermediates=object,
+            ),
+        ),
+        (
+            "C2",
+            StageDtypes(
+                samples=np.int32,
+                offset_samples=np.int32,
+                sample_differences=np.int32,
+                coefficients=object,
+                intermediates=object,
+            ),
+        ),
+    ]
+
+
+def test_very_large_depths(video_parameters):
+    video_parameters["luma_excursion"] = (1 << 64) - 1  # 64 bits
+    video_parameters["color_diff_excursion"] = (1 << 100) - 1  # 100 bits
+    stage_dtypes = compute_stage_dtypes(
+        video_parameters, PictureCodingModes.pictures_are_frames
+    )
+
+    assert stage_dtypes["Y"].samples == np.uint64
+    assert stage_dtypes["Y"].offset_samples == np.int64
+    assert stage_dtypes["Y"].sample_differences == object
+
+    assert stage_dtypes["C1"].samples == object
+    assert stage_dtypes["C1"].offset_samples == object
+    assert stage_dtypes["C1"].sample_differences == object
+
+
+def test_transform_dtypes(video_parameters):
+    stage_dtypes = compute_stage_dtypes(
+        video_parameters,
+        PictureCodingModes.pictures_are_frames,
+        WaveletFilters.le_gall_5_3,
+        WaveletFilters.le_gall_5_3,
+        2,
+        0,
+    )
+
+    # 8 bit pictures need more than 8 but less than 16 bits after transform
+    assert stage_dtypes["Y"].coefficients == np.int16
+    assert stage_dtypes["Y"].intermediates == np.int16
+
+    # 18 bit pictures grow but remain within 32 bits
+    assert stage_dtypes["C1"].coefficients == np.int32
+    assert stage_dtypes["C1"].intermediates == np.int32
+
+
+def test_wavelet_index_ho_defaults_to_wavelet_index(video_parameters):
+    assert compute_stage_dtypes(
+        video_parameters,
+        PictureCodingModes.pictures_are_frames,
+        WaveletFilters.haar_with_shift,
+        None,
+        3,
+        0,
+    ) == compute_stage_dtypes(
+        video_parameters,
+        PictureCodingModes.pictures_are_frames,
+        WaveletFilters.haar_with_shift,
+        WaveletFilters.haar_with_shift,
+        3,
+        0,
+    )
+
+
+def test_no_transform_levels(video_parameters):
+    # Coefficients are just the offset picture values
+    stage_dtypes = compute_stage_dtypes(
+        video_parameters,
+        PictureCodingModes.pictures_are_frames,
+        WaveletFilters.le_gall_5_3,
+        WaveletFilters.le_gall_5_3,
+        0,
+        0,
+    )
+    assert stage_dtypes["Y"].coefficients == np.int8
+    assert stage_dtypes["C1"].coefficients == np.int32
+
+
+def test_missing_static_analysis(video_parameters):
+    # The default bundle does not include transforms this deep
+    stage_dtypes = compute_stage_dtypes(
+        video_parameters,
+        PictureCodingModes.pictures_are_frames,
+        WaveletFilters.le_gall_5_3,
+        WaveletFilters.le_gall_5_3,
+        10,
+        10,
+    )
+    assert stage_dtypes["Y"].coefficients == object
+    assert stage_dtypes["Y"].intermediates == object
+
+
+@pytest.mark.parametrize(
+    "wavelet_index,dwt_depth,dwt_depth_ho",
+    [
+        (WaveletFilters.le_gall_5_3, 1, 0),
+        (WaveletFilters.deslauriers_dubuc_13_7, 1, 1),
+        (WaveletFilters.haar_with_shift, 2, 0),
+    ],
+)
+def test_bounds_hold_for_extreme_pictures(wavelet_index, dwt_depth, dwt_depth_ho):
+    # A sanity check that the bounds computed hold for some (nearly) worst-case
+    # inputs
+    picture_bit_width = 10
+    (
+        (coeff_lower, coeff_upper),
+        (intermediate_lower, intermediate_upper),
+    ) = get_filter_bounds(
+        wavelet_index, wavelet_index, dwt_depth, dwt_depth_ho, picture_bit_width
+    )
+    assert intermediate_lower <= coeff_lower
+    assert intermediate_upper >= coeff_upper
+
+    state = State(
+        wavelet_index=wavelet_index,
+        wavelet_index_ho=wavelet_index,
+        dwt_depth=dwt_depth,
+        dwt_depth_ho=dwt_depth_ho,
+    )
+
+    lo = -(1 << (picture_bit_width - 1))
+    hi = (1 << (picture_bit_width - 1)) - 1
+    for picture in [
+        [[hi if (x + y) % 2 else lo for x in range(16)] for y in range(16)],
+        [[hi if (x // 2 + y // 2) % 2 else lo for x in range(16)] for y in range(16)],
+    ]:
+        # NB: dwt modifies its input
+        coeff_data = dwt(state, deepcopy(picture))
+        for orients in coeff_data.values():
+            for coeffs in orients.values():
+                for row in coeffs:
+                    assert all(coeff_lower <= v <= coeff_upper for v in row)
+
+        # Round trip should be unaffected
+        assert idwt(state, coeff_data) == picture
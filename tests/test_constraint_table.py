@@ -2,12 +2,17 @@ import pytest
 
 import os
 
+import random
+
+from vc2_conformance.level_constraints import LEVEL_CONSTRAINTS
+
 from vc2_conformance.constraint_table import (
     ValueSet,
     AnyValue,
     filter_constraint_table,
     is_allowed_combination,
     allowed_values_for,
+    ConstraintTracker,
     read_constraints_from_csv,
 )
 
@@ -16,7 +21,7 @@ class TestValueSet(object):
     def test_constructor_empty(self):
         vs = ValueSet()
         assert vs._values == set()
-        assert vs._ranges == set()
+        assert vs._ranges == []
 
     def test_add_value(self):
         vs = ValueSet()
@@ -49,7 +54,7 @@ class TestValueSet(object):
         vs.add_value(25)
         vs.add_range(10, 20)
         assert vs._values == set([5, 25])
-        assert vs._ranges == set([(10, 20)])
+        assert vs._ranges == [(10, 20)]
 
     @pytest.mark.parametrize(
         "ranges",
@@ -71,12 +76,12 @@ class TestValueSet(object):
         vs = ValueSet()
         for r in ranges:
             vs.add_range(*r)
-        assert vs._ranges == set([(10, 30)])
+        assert vs._ranges == [(10, 30)]
 
     def test_constructor_works(self):
         vs = ValueSet(5, 10, 15, 20, 25, (10, 15), (15, 21))
         assert vs._values == set([5, 25])
-        assert vs._ranges == set([(10, 21)])
+        assert vs._ranges == [(10, 21)]
 
     def test_empty(self):
         empty = ValueSet()
@@ -162,6 +167,72 @@ class TestValueSet(object):
         assert 30 in vs
         assert 31 not in vs
 
+    @pytest.mark.parametrize(
+        "a,b,expected",
+        [
+            # Empty
+            (ValueSet(), ValueSet(), ValueSet()),
+            (ValueSet(1, (10, 20)), ValueSet(), ValueSet()),
+            # Individual values
+            (ValueSet(1, 2, 3), ValueSet(2, 3, 4), ValueSet(2, 3)),
+            (ValueSet("foo", "bar"), ValueSet("bar"), ValueSet("bar")),
+            # Values and ranges
+            (ValueSet(1, 5, 25), ValueSet((5, 30)), ValueSet(5, 25)),
+            # Ranges
+            (ValueSet((1, 3)), ValueSet((4, 6)), ValueSet()),
+            (ValueSet((1, 3)), ValueSet((3, 6)), ValueSet((3, 3))),
+            (ValueSet((1, 10)), ValueSet((3, 6)), ValueSet((3, 6))),
+            (
+                ValueSet((1, 10), (20, 30)),
+                ValueSet((5, 25), (28, 40)),
+                ValueSet((5, 10), (20, 25), (28, 30)),
+            ),
+        ],
+    )
+    def test_intersect_value_sets(self, a, b, expected):
+        assert a & b == expected
+        assert b & a == expected
+
+    @pytest.mark.parametrize("seed", range(10))
+    def test_matches_brute_force(self, seed):
+        rand = random.Random(seed)
+
+        def random_value_set():
+            vs = ValueSet()
+            for _ in range(rand.randint(0, 8)):
+                if rand.random() < 0.5:
+                    vs.add_value(rand.randint(0, 50))
+                else:
+                    lower = rand.randint(0, 50)
+                    vs.add_range(lower, lower + rand.randint(0, 10))
+            return vs
+
+        for _ in range(20):
+            a = random_value_set()
+            b = random_value_set()
+
+            a_values = set(a.iter_values())
+            b_values = set(b.iter_values())
+
+            assert set(v for v in range(-1, 62) if v in a) == a_values
+
+            # Ranges are sorted and do not overlap
+            assert sorted(a._ranges) == a._ranges
+            for (_, upper), (lower, _) in zip(a._ranges, a._ranges[1:]):
+                assert upper < lower
+
+            # Values are not duplicated in ranges
+            assert all(a._in_ranges(v) is False for v in a._values)
+
+            assert set((a + b).iter_values()) == a_values | b_values
+            assert set((a & b).iter_values()) == a_values & b_values
+
+            # Construction order doesn't matter
+            assert a + b == b + a
+            assert a & b == b & a
+
+            assert a.is_disjoint(b) is (len(a_values & b_values) == 0)
+
     @pytest.mark.parametrize(
         "a,b,expected",
         [
@@ -213,6 +284,10 @@ class TestValueSet(object):
         vs.add_range(30, 40)
         assert set(vs) == set([1, 2, 3, (10, 20), (30, 40)])
 
+        # Ranges are produced in ascending order
+        vs.add_range(0, 0)
+        assert list(vs)[-3:] == [(0, 0), (10, 20), (30, 40)]
+
     def test_iter_values(self):
         vs = ValueSet()
 
@@ -293,6 +368,15 @@ class TestAnyValue(object):
                 if not (a == b == vs):
                     assert isinstance(a + b, AnyValue)
 
+    def test_intersect(self):
+        assert AnyValue() & AnyValue() == AnyValue()
+        assert AnyValue() & ValueSet(1, (2, 3)) == ValueSet(1, (2, 3))
+        assert ValueSet(1, (2, 3)) & AnyValue() == ValueSet(1, (2, 3))
+
+        # A copy is returned
+        vs = ValueSet(1)
+        assert vs & AnyValue() is not vs
+
     def test_compare(self):
         assert AnyValue() == AnyValue()
 
@@ -453,6 +537,88 @@ class TestAllowedValuesFor(object):
         )
 
 
+class TestConstraintTracker(object):
+    @pytest.fixture
+    def constraint_table(self):
+        return [
+            {"foo": ValueSet(1), "bar": ValueSet((100, 200))},
+            {"foo": ValueSet(2), "bar": ValueSet(321), "baz": AnyValue()},
+            {"foo": ValueSet(3), "bar": ValueSet(123)},
+            {},
+        ]
+
+    def test_empty(self):
+        tracker = ConstraintTracker([])
+        assert tracker.values == {}
+        assert tracker.allowed_values_for("foo") == ValueSet()
+        tracker.set("foo", 123)
+        assert tracker.values == {"foo": 123}
+        assert tracker.allowed_values_for("bar") == ValueSet()
+
+    def test_narrowing(self, constraint_table):
+        tracker = ConstraintTracker(constraint_table)
+        assert tracker.allowed_values_for("foo") == ValueSet(1, 2, 3)
+
+        tracker.set("bar", 123)
+        assert tracker.allowed_values_for("foo") == ValueSet(1, 3)
+        tracker.set("foo", 1)
+        assert tracker.allowed_values_for("foo") == ValueSet(1)
+        assert tracker.allowed_values_for("bar") == ValueSet((100, 200))
+
+        tracker.set("bar", 321)
+        assert tracker.allowed_values_for("foo") == ValueSet()
+
+        # Changing a value may widen the allowed values
+        tracker.set("foo", 2)
+        assert tracker.allowed_values_for("foo") == ValueSet(2)
+        assert tracker.allowed_values_for("bar") == ValueSet(321)
+
+        assert tracker.values == {"foo": 2, "bar": 321}
+
+    def test_initial_values(self, constraint_table):
+        values = {"bar": 123}
+        tracker = ConstraintTracker(constraint_table, values)
+        assert tracker.values is values
+        assert tracker.allowed_values_for("foo") == ValueSet(1, 3)
+
+        tracker.set("foo", 1)
+        assert values == {"foo": 1, "bar": 123}
+
+    def test_any_value_substitution(self, constraint_table):
+        tracker = ConstraintTracker(constraint_table)
+        tracker.set("foo", 2)
+        assert tracker.allowed_values_for("baz") == AnyValue()
+        assert tracker.allowed_values_for("baz", ValueSet(1, 2)) == ValueSet(1, 2)
+
+    @pytest.mark.parametrize("seed", range(10))
+    def test_matches_allowed_values_for(self, seed):
+        # Randomly set values from the level constraints table and check the
+        # tracker always agrees with allowed_values_for
+        rand = random.Random(seed)
+        keys = sorted(
+            set(key for combination in LEVEL_CONSTRAINTS for key in combination)
+        )
+
+        tracker = ConstraintTracker(LEVEL_CONSTRAINTS)
+        values = {}
+        for _ in range(200):
+            key = rand.choice(keys)
+            for k in [key, rand.choice(keys)]:
+                assert tracker.allowed_values_for(k) == allowed_values_for(
+                    LEVEL_CONSTRAINTS, k, values
+                )
+
+            allowed_values = allowed_values_for(LEVEL_CONSTRAINTS, key, values)
+            if isinstance(allowed_values, AnyValue) or rand.random() < 0.1:
+                value = rand.randint(0, 100)
+            else:
+                value = rand.choice(list(allowed_values.iter_values()) or [0])
+            values[key] = value
+            tracker.set(key, value)
+
+            assert tracker.values == values
+
+
 def test_read_constraints_from_csv():
     constraints = read_constraints_from_csv(
         os.path.join(os.path.dirname(__file__), "sample_constraint_table.csv")
@@ -6,13 +6,21 @@ import os
 
 import random
 
+from mock import patch
+
+import numpy as np
+
 import vc2_data_tables as tables
 
+from vc2_conformance.pseudocode.arrays import NumPyArray2D
+
 from vc2_conformance.pseudocode.video_parameters import (
     VideoParameters,
     set_source_defaults,
 )
 
+from vc2_conformance import file_format
+
 from vc2_conformance.file_format import (
     get_metadata_and_picture_filenames,
     get_picture_filename_pattern,
@@ -22,6 +30,11 @@ from vc2_conformance.file_format import (
     write_picture,
     read,
     write,
+    open_picture,
+    open_picture_data,
+    is_picture_container,
+    PictureContainerWriter,
+    PictureContainerReader,
 )
 
 
@@ -173,6 +186,48 @@ def test_read_picture_and_read_and_write_metadata(
     assert new_picture == noise_picture
 
 
+@pytest.mark.parametrize(
+    "num_bytes,num_bits",
+    [
+        (1, 7),
+        (1, 8),
+        (2, 10),
+        (2, 16),
+        (4, 17),
+        (8, 63),
+        (8, 64),
+        (16, 90),
+    ],
+)
+def test_write_picture_out_of_range_values_truncated(num_bytes, num_bits):
+    # Values which don't fit the picture depth (or even the native integer
+    # type used to write them) should be truncated to the written number of
+    # bytes (in two's complement)
+    values = [-1, -(1 << 100) - 3, (1 << num_bits) + 1, (1 << 200) + 2]
+
+    video_parameters = VideoParameters(
+        frame_width=len(values),
+        frame_height=1,
+        color_diff_format_index=tables.ColorDifferenceSamplingFormats.color_4_4_4,
+        luma_offset=0,
+        luma_excursion=(1 << num_bits) - 1,
+        color_diff_offset=0,
+        color_diff_excursion=(1 << num_bits) - 1,
+    )
+    picture_coding_mode = tables.PictureCodingModes.pictures_are_frames
+    picture = {"Y": [values], "C1": [values], "C2": [values], "pic_num": 0}
+
+    picture_file = BytesIO()
+    write_picture(picture, video_parameters, picture_coding_mode, picture_file)
+
+    mask = (1 << (num_bytes * 8)) - 1
+    exp = b"".join(
+        bytes(bytearray(((value & mask) >> (8 * i)) & 0xFF for i in range(num_bytes)))
+        for value in values
+    )
+    assert picture_file.getvalue() == exp * 3
+
+
 @pytest.mark.parametrize(
     "num_bytes,num_bits",
     [
@@ -209,6 +264,68 @@ def test_read_picture_masked(num_bytes, num_bits):
     assert picture["C2"] == [[(1 << num_bits) - 1]]
 
 
+@pytest.mark.parametrize("num_bits", [8, 10, 16, 20, 32, 33, 64])
+def test_native_dtype_fast_path_matches_generic_path(num_bits):
+    rand = random.Random(num_bits)
+
+    video_parameters = VideoParameters(
+        frame_width=7,
+        frame_height=3,
+        color_diff_format_index=tables.ColorDifferenceSamplingFormats.color_4_4_4,
+        luma_offset=0,
+        luma_excursion=(1 << num_bits) - 1,
+        color_diff_offset=0,
+        color_diff_excursion=(1 << num_bits) - 1,
+    )
+    picture_coding_mode = tables.PictureCodingModes.pictures_are_frames
+    picture = {
+        c: [[rand.randrange(1 << num_bits) for _ in range(7)] for _ in range(3)]
+        for c in ["Y", "C1", "C2"]
+    }
+    picture["pic_num"] = 0
+
+    fast_file = BytesIO()
+    write_picture(picture, video_parameters, picture_coding_mode, fast_file)
+
+    generic_file = BytesIO()
+    with patch.object(file_format, "get_little_endian_dtype", return_value=None):
+        write_picture(picture, video_parameters, picture_coding_mode, generic_file)
+    assert fast_file.getvalue() == generic_file.getvalue()
+
+    # Set the unused high-order bits (which must be masked off when read)
+    num_bytes = len(fast_file.getvalue()) // (7 * 3 * 3)
+    data = np.frombuffer(fast_file.getvalue(), dtype=np.uint8).reshape(-1, num_bytes)
+    high_bits = ((1 << (num_bytes * 8)) - 1) & ~((1 << num_bits) - 1)
+    data = data | np.array(
+        [(high_bits >> (8 * i)) & 0xFF for i in range(num_bytes)], dtype=np.uint8
+    )
+
+    fast_picture = read_picture(
+        video_parameters, picture_coding_mode, 0, BytesIO(data.tobytes())
+    )
+    with patch.object(file_format, "get_little_endian_dtype", return_value=None):
+        generic_picture = read_picture(
+            video_parameters, picture_coding_mode, 0, BytesIO(data.tobytes())
+        )
+    assert fast_picture == generic_picture == picture
+
+    # Native Python integers returned
+    assert all(type(v) is int for row in fast_picture["Y"] for v in row)
+
+
+def test_write_picture_numpy_array_2d(video_parameters, picture_coding_mode):
+    picture = {
+        "pic_num": 0,
+        "Y": [[1, 2, 3, 4], [5, 6, 7, 8]],
+        "C1": NumPyArray2D(np.array([[9, 10]], dtype=np.int64)),
+        "C2": NumPyArray2D(np.array([[11, 12]], dtype=np.int64)),
+    }
+    picture_file = BytesIO()
+    write_picture(picture, video_parameters, picture_coding_mode, picture_file)
+
+    assert picture_file.getvalue()[-4:] == b"\x09\x0A\x0B\x0C"
+
+
 def test_read_and_write_convenience_functions(
     picture, video_parameters, picture_coding_mode, tmp_path
 ):
@@ -225,3 +342,230 @@ def test_read_and_write_convenience_functions(
         video_parameters,
         picture_coding_mode,
     )
+
+
+class TestOpenPicture(object):
+    @pytest.fixture
+    def native_video_parameters(self):
+        # 10-bit luma and 20-bit color difference components, both stored
+        # using native NumPy integer types
+        video_parameters = set_source_defaults(tables.BaseVideoFormats.custom_format)
+        video_parameters["frame_width"] = 8
+        video_parameters["frame_height"] = 4
+        video_parameters["clean_width"] = 8
+        video_parameters["clean_height"] = 4
+        video_parameters[
+            "color_diff_format_index"
+        ] = tables.ColorDifferenceSamplingFormats.color_4_2_2
+        video_parameters["luma_excursion"] = (1 << 10) - 1
+        video_parameters["color_diff_excursion"] = (1 << 20) - 1
+        return video_parameters
+
+    @pytest.fixture
+    def native_picture(self):
+        rand = random.Random(0)
+        return {
+            "pic_num": 123,
+            "Y": [[rand.randrange(1 << 10) for _ in range(8)] for _ in range(4)],
+            "C1": [[rand.randrange(1 << 20) for _ in range(4)] for _ in range(4)],
+            "C2": [[rand.randrange(1 << 20) for _ in range(4)] for _ in range(4)],
+        }
+
+    @pytest.fixture
+    def filename(self, tmp_path, native_picture, native_video_parameters):
+        filename = os.path.join(str(tmp_path), "picture.raw")
+        write(
+            native_picture,
+            native_video_parameters,
+            tables.PictureCodingModes.pictures_are_frames,
+            filename,
+        )
+        return filename
+
+    def test_matches_read(self, filename, native_picture, native_video_parameters):
+        picture, video_parameters, picture_coding_mode = open_picture(filename)
+
+        assert video_parameters == native_video_parameters
+        assert picture_coding_mode == tables.PictureCodingModes.pictures_are_frames
+        assert picture["pic_num"] == 123
+
+        assert isinstance(picture["Y"], np.memmap)
+        assert picture["Y"].dtype == np.dtype("<u2")
+        assert picture["C1"].dtype == np.dtype("<u4")
+        for c in ["Y", "C1", "C2"]:
+            assert picture[c].tolist() == native_picture[c]
+
+        # Subregions may be accessed directly
+        assert picture["C2"][1:3, 2:].tolist() == [
+            row[2:] for row in native_picture["C2"][1:3]
+        ]
+
+    def test_read_only(self, filename):
+        picture = open_picture(filename)[0]
+        with pytest.raises(ValueError):
+            picture["Y"][0, 0] = 1
+
+    def test_padding_bits_not_masked(
+        self, filename, native_picture, native_video_parameters
+    ):
+        # Set the padding bits of the first luma sample
+        with open(filename, "rb+") as f:
+            f.seek(1)
+            msb = bytearray(f.read(1))[0]
+            f.seek(1)
+            f.write(bytearray([msb | 0xF0]))
+
+        picture = open_picture_data(
+            native_video_parameters,
+            tables.PictureCodingModes.pictures_are_frames,
+            0,
+            filename,
+        )
+        assert picture["Y"][0, 0] == native_picture["Y"][0][0] | 0xF000
+        assert picture["Y"][0, 0] & 0x3FF == native_picture["Y"][0][0]
+
+    @pytest.mark.parametrize("size_change", [-1, 1])
+    def test_incorrect_size(self, filename, native_video_parameters, size_change):
+        with open(filename, "rb+") as f:
+            f.truncate(os.path.getsize(filename) + size_change)
+
+        with pytest.raises(ValueError):
+            open_picture_data(
+                native_video_parameters,
+                tables.PictureCodingModes.pictures_are_frames,
+                0,
+                filename,
+            )
+
+    def test_missing_file(self, tmp_path):
+        with pytest.raises((IOError, OSError)):
+            open_picture(os.path.join(str(tmp_path), "missing.raw"))
+
+    def test_non_native_depths(
+        self, tmp_path, noise_picture, video_parameters, picture_coding_mode
+    ):
+        # NB: The module-level video_parameters fixture uses 100-bit luma
+        # samples
+        filename = os.path.join(str(tmp_path), "picture.raw")
+        write(noise_picture, video_parameters, picture_coding_mode, filename)
+
+        picture = open_picture(filename)[0]
+        for c in ["Y", "C1", "C2"]:
+            assert picture[c].dtype == object
+            assert picture[c].tolist() == noise_picture[c]
+
+
+class TestPictureContainer(object):
+    @pytest.fixture
+    def pictures(self, noise_picture, video_parameters, picture_coding_mode):
+        # A series of pictures in two formats: one non-native (100-bit luma)
+        # and one using native NumPy types
+        native_video_parameters = VideoParameters(video_parameters)
+        native_video_parameters["luma_excursion"] = (1 << 10) - 1
+
+        rand = random.Random(1)
+        pictures = []
+        for pic_num, vp in [
+            (10, video_parameters),
+            (11, native_video_parameters),
+            (12, video_parameters),
+            (10, native_video_parameters),
+        ]:
+            picture = {
+                component: [
+                    [rand.randrange(1 << 8) for _ in row]
+                    for row in noise_picture[component]
+                ]
+                for component in ["Y", "C1", "C2"]
+            }
+            picture["pic_num"] = pic_num
+            pictures.append((picture, vp, picture_coding_mode))
+        return pictures
+
+    @pytest.fixture
+    def filename(self, tmp_path, pictures):
+        filename = os.path.join(str(tmp_path), "pictures.vc2pics")
+        with PictureContainerWriter(filename) as container:
+            for picture, video_parameters, picture_coding_mode in pictures:
+                container.write(picture, video_parameters, picture_coding_mode)
+        return filename
+
+    def test_round_trip(self, filename, pictures):
+        assert is_picture_container(filename)
+
+        with PictureContainerReader(filename) as container:
+            assert len(container) == len(pictures)
+
+            # NB: Read in reverse order to check random access
+            for index in reversed(range(len(pictures))):
+                exp_picture, exp_video_parameters, exp_pcm = pictures[index]
+
+                assert container.get_picture_number(index) == exp_picture["pic_num"]
+                assert container.get_format(index) == (exp_video_parameters, exp_pcm)
+                assert container.read(index) == pictures[index]
+
+                picture, video_parameters, picture_coding_mode = container.open(index)
+                assert video_parameters == exp_video_parameters
+                assert picture_coding_mode == exp_pcm
+                assert picture["pic_num"] == exp_picture["pic_num"]
+                for c in ["Y", "C1", "C2"]:
+                    assert picture[c].tolist() == exp_picture[c]
+
+                f = BytesIO()
+                write_picture(exp_picture, exp_video_parameters, exp_pcm, f)
+                assert container.read_picture_bytes(index) == f.getvalue()
+
+    def test_find(self, filename):
+        with PictureContainerReader(filename) as container:
+            assert container.find(11) == 1
+            assert container.find(12) == 2
+
+            # First matching picture found
+            assert container.find(10) == 0
+
+            with pytest.raises(KeyError):
+                container.find(13)
+
+    def test_empty(self, tmp_path):
+        filename = os.path.join(str(tmp_path), "empty.vc2pics")
+        PictureContainerWriter(filename).close()
+
+        with PictureContainerReader(filename) as container:
+            assert len(container) == 0
+
+    def test_not_a_container(self, tmp_path, picture, video_parameters):
+        filename = os.path.join(str(tmp_path), "picture.raw")
+        write(
+            picture,
+            video_parameters,
+            tables.PictureCodingModes.pictures_are_fields,
+            filename,
+        )
+
+        assert not is_picture_container(filename)
+        assert not is_picture_container(str(tmp_path))
+        assert not is_picture_container(os.path.join(str(tmp_path), "missing"))
+
+        with pytest.raises(ValueError):
+            PictureContainerReader(filename)
+
+    @pytest.mark.parametrize("size_change", [-1, -20, 1])
+    def test_truncated_or_extended(self, filename, size_change):
+        with open(filename, "rb+") as f:
+            f.truncate(os.path.getsize(filename) + size_change)
+
+        with pytest.raises(ValueError):
+            PictureContainerReader(filename)
+
+    def test_unclosed(self, tmp_path, pictures):
+        filename = os.path.join(str(tmp_path), "unclosed.vc2pics")
+        container = PictureContainerWriter(filename)
+        container.write(*pictures[0])
+        container._file.flush()
+
+        assert is_picture_container(filename)
+        with pytest.raises(ValueError):
+            PictureContainerReader(filename)
+
+        container.close()
+        assert len(PictureContainerReader(filename)) == 1
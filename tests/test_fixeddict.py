@@ -4,10 +4,17 @@ from enum import IntEnum
 
 from textwrap import dedent
 
-from vc2_conformance.fixeddict import fixeddict, Entry, FixedDictKeyError
+from vc2_conformance.fixeddict import (
+    fixeddict,
+    unchecked_fixeddict,
+    Entry,
+    FixedDictKeyError,
+)
 
 import pickle
 
+from copy import copy, deepcopy
+
 
 class TestEntry(object):
     def test_no_args(self):
@@ -285,3 +292,53 @@ class TestFixedDict(object):
         """
             ).lstrip()
         )
+
+
+class TestUncheckedFixedDict(object):
+    def test_same_type_returned(self):
+        UncheckedMyFixedDict = unchecked_fixeddict(MyFixedDict)
+        assert unchecked_fixeddict(MyFixedDict) is UncheckedMyFixedDict
+        assert unchecked_fixeddict(UncheckedMyFixedDict) is UncheckedMyFixedDict
+
+    def test_keys_not_checked(self):
+        d = unchecked_fixeddict(MyFixedDict)(foo=123)
+        d["bar"] = 321
+        d.setdefault("baz", 0)
+        d.update(qux=1)
+        assert d == {"foo": 123, "bar": 321, "baz": 0, "qux": 1}
+
+        # The original type is unaffected
+        with pytest.raises(FixedDictKeyError):
+            MyFixedDict()["bar"] = 321
+
+    def test_behaves_like_original(self):
+        d = unchecked_fixeddict(MyFixedDict)(name="Anon", age=100)
+        assert isinstance(d, MyFixedDict)
+        assert repr(d) == repr(MyFixedDict(name="Anon", age=100))
+        assert str(d) == str(MyFixedDict(name="Anon", age=100))
+        assert type(d.copy()) is type(d)
+
+    def test_original_type_not_modified(self):
+        before = dict(MyFixedDict.__dict__)
+        unchecked_fixeddict(MyFixedDict)
+        assert dict(MyFixedDict.__dict__) == before
+
+    @pytest.mark.parametrize(
+        "copy_function",
+        [
+            deepcopy,
+            copy,
+            lambda d: pickle.loads(pickle.dumps(d)),
+            lambda d: pickle.loads(pickle.dumps(d, protocol=pickle.HIGHEST_PROTOCOL)),
+        ],
+    )
+    def test_copy_and_pickle(self, copy_function):
+        UncheckedMyFixedDict = unchecked_fixeddict(MyFixedDict)
+        d = UncheckedMyFixedDict(name="Anon", age=100, foo=[1, 2, 3])
+        copied_d = copy_function(d)
+        assert copied_d == d
+        assert type(copied_d) is UncheckedMyFixedDict
+
+        # Still unchecked
+        copied_d["bar"] = 321
+        assert copied_d["bar"] == 321
@@ -1,5 +1,13 @@
 import pytest
 
+import random
+
+from copy import deepcopy
+
+from collections import deque
+
+from vc2_conformance.level_constraints import LEVEL_SEQUENCE_RESTRICTIONS
+
 from vc2_conformance.symbol_re import (
     tokenize_regex,
     parse_regex,
@@ -9,8 +17,13 @@ from vc2_conformance.symbol_re import (
     Concatenation,
     Union,
     NFANode,
+    NFA,
+    WILDCARD,
+    END_OF_SEQUENCE,
+    compile_pattern,
     Matcher,
     make_matching_sequence,
+    candidate_insertions,
     ImpossibleSequenceError,
 )
 
@@ -345,6 +358,112 @@ class TestMatcher(object):
         m = Matcher(regex)
         assert m.valid_next_symbols() == next_symbols
 
+    def test_deepcopy(self):
+        m1 = Matcher("a b c")
+        assert m1.match_symbol("a")
+
+        m2 = deepcopy(m1)
+        assert m2.dfa is m1.dfa
+
+        # State is independent
+        assert m2.match_symbol("b")
+        assert m1.valid_next_symbols() == set(["b"])
+        assert m2.valid_next_symbols() == set(["c"])
+
+    def test_valid_next_symbols_may_be_modified(self):
+        m1 = Matcher("a")
+        m1.valid_next_symbols().add("foo")
+        assert Matcher("a").valid_next_symbols() == set(["a"])
+
+    @pytest.mark.parametrize(
+        "regex",
+        [
+            "x((a a)|(b b))*x",
+            "(a | b . | c? $)+ d*",
+        ]
+        + [
+            restrictions.sequence_restriction_regex
+            for restrictions in LEVEL_SEQUENCE_RESTRICTIONS.values()
+        ],
+    )
+    def test_matches_nfa_simulation(self, regex):
+        # Check the DFA-based Matcher is equivalent to directly simulating the
+        # NFA for a series of random sequences.
+        nfa = NFA.from_ast(parse_regex(regex))
+
+        # A set of symbols likely to be relevant
+        symbols = set(["a", "b", "c", "d", "x", "y", END_OF_SEQUENCE])
+        to_visit = [nfa.start]
+        visited = set(to_visit)
+        while to_visit:
+            node = to_visit.pop()
+            for symbol, next_nodes in node.transitions.items():
+                if symbol not in (None, WILDCARD):
+                    symbols.add(symbol)
+                for next_node in next_nodes:
+                    if next_node not in visited:
+                        visited.add(next_node)
+                        to_visit.append(next_node)
+        symbols = sorted(symbols)
+
+        rand = random.Random(regex)
+        for _ in range(20):
+            m = Matcher(regex)
+            cur_states = set([nfa.start])
+            for _ in range(20):
+                valid_symbols = set()
+                complete = False
+                for node in cur_states:
+                    for equivalent_node in node.equivalent_nodes():
+                        valid_symbols.update(
+                            s for s in equivalent_node.transitions if s is not None
+                        )
+                    if nfa.final in list(node.equivalent_nodes()):
+                        complete = True
+                    if list(node.follow(END_OF_SEQUENCE)):
+                        complete = True
+                if complete:
+                    valid_symbols.add(END_OF_SEQUENCE)
+
+                assert m.is_complete() is complete
+                assert m.valid_next_symbols() == valid_symbols
+
+                symbol = rand.choice(symbols)
+                new_states = set()
+                for node in cur_states:
+                    new_states.update(node.follow(symbol))
+                    new_states.update(node.follow(WILDCARD))
+                assert m.match_symbol(symbol) is bool(new_states)
+                if new_states:
+                    cur_states = new_states
+
+
+class TestCompilePattern(object):
+    def test_cached(self):
+        assert compile_pattern("a b* c") is compile_pattern("a b* c")
+        assert compile_pattern("a b* c") is not compile_pattern("a b+ c")
+        assert Matcher("a b* c").dfa is compile_pattern("a b* c")
+
+    def test_syntax_error(self):
+        for _ in range(2):
+            with pytest.raises(SymbolRegexSyntaxError):
+                compile_pattern("a (")
+
+    def test_lazy_construction(self):
+        dfa = compile_pattern("(a | b) (c | d | e) f")
+        num_states = len(dfa._state_nodes)
+
+        state = dfa.follow(dfa.start, "a")
+        assert len(dfa._state_nodes) == num_states + 1
+
+        # Equivalent transitions are memoised and reuse existing states
+        assert dfa.follow(dfa.start, "a") == state
+        assert dfa.follow(dfa.start, "b") == state
+        assert len(dfa._state_nodes) == num_states + 1
+
+        # Non-matching symbols
+        assert dfa.follow(dfa.start, "f") is None
+
 
 class TestMakeMatchingSequence(object):
     def test_empty_no_patterns(self):
@@ -489,3 +608,118 @@ class TestMakeMatchingSequence(object):
     def test_sequence_not_allowed_by_patterns(self, patterns):
         with pytest.raises(ImpossibleSequenceError):
             make_matching_sequence(["a", "b", "b", "c"], *patterns, depth_limit=3)
+
+    def test_no_depth_limit(self):
+        assert make_matching_sequence(["X"], "a b c d X e f g", depth_limit=None) == [
+            "a",
+            "b",
+            "c",
+            "d",
+            "X",
+            "e",
+            "f",
+            "g",
+        ]
+
+        # Search still terminates when no sequence is possible
+        with pytest.raises(ImpossibleSequenceError):
+            make_matching_sequence(["X"], "a* b", "a* c", depth_limit=None)
+
+    def test_long_sequence(self):
+        assert make_matching_sequence(
+            ["p"] * 10000,
+            "(h p)* e $",
+            symbol_priority=["h"],
+        ) == (["h", "p"] * 10000) + ["e"]
+
+    @pytest.mark.parametrize("seed", range(20))
+    def test_matches_exhaustive_search(self, seed):
+        # Check that the same sequences are produced as an exhaustive
+        # breadth-first search (without any deduplication of search states).
+        # NB: The exhaustive search is exponential in complexity so only short
+        # sequences and small depth limits are tried.
+        def exhaustive_make_matching_sequence(
+            initial_sequence, patterns, depth_limit, symbol_priority
+        ):
+            queue = deque(
+                [([], initial_sequence, [Matcher(p) for p in patterns], depth_limit)]
+            )
+            while queue:
+                so_far, remaining, matchers, this_depth_limit = queue.popleft()
+                if not remaining:
+                    if all(m.is_complete() for m in matchers):
+                        return so_far
+                elif all(
+                    remaining[0] in m.valid_next_symbols()
+                    or WILDCARD in m.valid_next_symbols()
+                    for m in matchers
+                ):
+                    new_matchers = deepcopy(matchers)
+                    for m in new_matchers:
+                        m.match_symbol(remaining[0])
+                    queue.append(
+                        (
+                            so_far + remaining[:1],
+                            remaining[1:],
+                            new_matchers,
+                            depth_limit,
+                        )
+                    )
+                    continue
+
+                if this_depth_limit <= 0:
+                    continue
+
+                for symbol in candidate_insertions(
+                    [m.dfa for m in matchers],
+                    [m.state for m in matchers],
+                    symbol_priority,
+                ):
+                    new_matchers = deepcopy(matchers)
+                    for m in new_matchers:
+                        m.match_symbol(symbol)
+                    queue.append(
+                        (
+                            so_far + [symbol],
+                            remaining,
+                            new_matchers,
+                            this_depth_limit - 1,
+                        )
+                    )
+
+            raise ImpossibleSequenceError()
+
+        rand = random.Random(seed)
+        symbols = ["a", "b", "c", "d"]
+        patterns = [
+            "(a b)* c? $",
+            "a . . | (b | c)* d",
+            ".* d .* $",
+            "(a | b | c d)+",
+            "((a a)|(b c))* d?",
+        ]
+
+        for _ in range(10):
+            initial_sequence = [rand.choice(symbols) for _ in range(rand.randint(0, 4))]
+            these_patterns = rand.sample(patterns, rand.randint(1, 3))
+            symbol_priority = rand.sample(symbols, rand.randint(0, 3))
+            depth_limit = rand.randint(1, 2)
+
+            try:
+                exp = exhaustive_make_matching_sequence(
+                    initial_sequence, these_patterns, depth_limit, symbol_priority
+                )
+            except ImpossibleSequenceError:
+                exp = None
+
+            try:
+                actual = make_matching_sequence(
+                    initial_sequence,
+                    *these_patterns,
+                    depth_limit=depth_limit,
+                    symbol_priority=symbol_priority
+                )
+            except ImpossibleSequenceError:
+                actual = None
+
+            assert actual == exp
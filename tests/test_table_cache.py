@@ -0,0 +1,258 @@
+import pytest
+
+import os
+
+import sys
+
+import subprocess
+
+from copy import deepcopy
+
+from mock import Mock, patch
+
+from vc2_data_tables import Levels
+
+from vc2_data_tables.csv_readers import read_lookup_from_csv
+
+from vc2_conformance.constraint_table import read_constraints_from_csv
+
+from vc2_conformance import level_constraints
+
+from vc2_conformance.level_constraints import (
+    LEVEL_CONSTRAINTS,
+    LEVEL_SEQUENCE_RESTRICTIONS,
+    LevelSequenceRestrictions,
+)
+
+from vc2_conformance.table_cache import (
+    read_cached,
+    get_cache_directory,
+    get_cache_key,
+)
+
+
+@pytest.fixture
+def cache_dir(tmpdir, monkeypatch):
+    cache_dir = str(tmpdir.join("cache"))
+    monkeypatch.setenv("VC2_CONFORMANCE_CACHE_DIR", cache_dir)
+    return cache_dir
+
+
+@pytest.fixture
+def csv_filename(tmpdir):
+    filename = str(tmpdir.join("table.csv"))
+    with open(filename, "w") as f:
+        f.write("a,1,2-3\nb,TRUE,any\n")
+    return filename
+
+
+class TestGetCacheDirectory(object):
+    def test_override(self, monkeypatch):
+        monkeypatch.setenv("VC2_CONFORMANCE_CACHE_DIR", "/foo/bar")
+        assert get_cache_directory() == "/foo/bar"
+
+    def test_disabled(self, monkeypatch):
+        monkeypatch.setenv("VC2_CONFORMANCE_CACHE_DIR", "None")
+        assert get_cache_directory() is None
+
+    @pytest.mark.parametrize("value", [None, ""])
+    def test_disabled_by_default(self, monkeypatch, value):
+        if value is None:
+            monkeypatch.delenv("VC2_CONFORMANCE_CACHE_DIR", raising=False)
+        else:
+            monkeypatch.setenv("VC2_CONFORMANCE_CACHE_DIR", value)
+        assert get_cache_directory() is None
+
+
+class TestReadCached(object):
+    def test_cache_miss_then_hit(self, cache_dir, csv_filename):
+        read_function = Mock(
+            side_effect=read_constraints_from_csv,
+            __module__="foo",
+            __name__="bar",
+        )
+
+        exp = read_constraints_from_csv(csv_filename)
+
+        assert read_cached(csv_filename, read_function) == exp
+        assert read_function.call_count == 1
+        assert len(os.listdir(cache_dir)) == 1
+
+        assert read_cached(csv_filename, read_function) == exp
+        assert read_function.call_count == 1
+
+    def test_invalidated_by_file_change(self, cache_dir, csv_filename):
+        assert read_cached(csv_filename, read_constraints_from_csv)[0]["a"] == (
+            read_constraints_from_csv(csv_filename)[0]["a"]
+        )
+
+        with open(csv_filename, "a") as f:
+            f.write("c,4,5\n")
+
+        exp = read_constraints_from_csv(csv_filename)
+        assert read_cached(csv_filename, read_constraints_from_csv) == exp
+        assert len(os.listdir(cache_dir)) == 2
+
+    def test_keyed_by_function_and_arguments(self, cache_dir):
+        filename = os.path.join(
+            os.path.dirname(level_constraints.__file__),
+            "level_sequence_restrictions.csv",
+        )
+        exp = read_lookup_from_csv(filename, Levels, LevelSequenceRestrictions)
+        read_cached(filename, read_lookup_from_csv, Levels, LevelSequenceRestrictions)
+        assert (
+            read_cached(
+                filename, read_lookup_from_csv, Levels, LevelSequenceRestrictions
+            )
+            == exp
+        )
+        assert len(os.listdir(cache_dir)) == 1
+
+        assert get_cache_key(b"", read_lookup_from_csv, ()) != get_cache_key(
+            b"", read_constraints_from_csv, ()
+        )
+        assert get_cache_key(b"", read_lookup_from_csv, (Levels,)) != get_cache_key(
+            b"", read_lookup_from_csv, ()
+        )
+
+    def test_keyed_by_version(self):
+        before = get_cache_key(b"", read_constraints_from_csv, ())
+        with patch("vc2_conformance.table_cache.__version__", "v0.0.0"):
+            assert get_cache_key(b"", read_constraints_from_csv, ()) != before
+
+        before = get_cache_key(b"", read_lookup_from_csv, ())
+        with patch("vc2_data_tables.__version__", "0.0.0"):
+            assert get_cache_key(b"", read_lookup_from_csv, ()) != before
+
+    def test_corrupt_cache_file(self, cache_dir, csv_filename):
+        exp = read_cached(csv_filename, read_constraints_from_csv)
+        (cache_file,) = os.listdir(cache_dir)
+        with open(os.path.join(cache_dir, cache_file), "wb") as f:
+            f.write(b"not a pickle")
+
+        assert read_cached(csv_filename, read_constraints_from_csv) == exp
+
+        # Corrupt file replaced
+        assert os.listdir(cache_dir) == [cache_file]
+        with patch(
+            "vc2_conformance.table_cache.write_cache_file",
+            side_effect=AssertionError(),
+        ):
+            assert read_cached(csv_filename, read_constraints_from_csv) == exp
+
+    def test_unwritable_cache_directory(self, tmpdir, monkeypatch, csv_filename):
+        # Cache 'directory' is actually a file
+        not_a_dir = str(tmpdir.join("not_a_dir"))
+        open(not_a_dir, "w").close()
+        monkeypatch.setenv("VC2_CONFORMANCE_CACHE_DIR", not_a_dir)
+
+        exp = read_constraints_from_csv(csv_filename)
+        assert read_cached(csv_filename, read_constraints_from_csv) == exp
+
+    @pytest.mark.parametrize("value", [None, "none"])
+    def test_disabled(self, tmpdir, monkeypatch, csv_filename, value):
+        if value is None:
+            monkeypatch.delenv("VC2_CONFORMANCE_CACHE_DIR", raising=False)
+        else:
+            monkeypatch.setenv("VC2_CONFORMANCE_CACHE_DIR", value)
+        monkeypatch.setenv("HOME", str(tmpdir))
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmpdir))
+        monkeypatch.chdir(str(tmpdir))
+        exp = read_constraints_from_csv(csv_filename)
+        assert read_cached(csv_filename, read_constraints_from_csv) == exp
+        assert sorted(os.listdir(str(tmpdir))) == ["table.csv"]
+
+    @pytest.mark.parametrize(
+        "basename,read_function,args",
+        [
+            ("level_constraints.csv", read_constraints_from_csv, ()),
+            (
+                "level_sequence_restrictions.csv",
+                read_lookup_from_csv,
+                (Levels, LevelSequenceRestrictions),
+            ),
+        ],
+    )
+    def test_level_constraint_tables_not_reparsed(
+        self, cache_dir, basename, read_function, args
+    ):
+        filename = os.path.join(os.path.dirname(level_constraints.__file__), basename)
+
+        # NB: The mock has the same name as the real function and so produces
+        # the same cache key
+        mock_read_function = Mock(
+            side_effect=read_function,
+            __module__=read_function.__module__,
+            __name__=read_function.__name__,
+        )
+
+        exp = read_function(filename, *args)
+        assert read_cached(filename, mock_read_function, *args) == exp
+        assert mock_read_function.call_count == 1
+
+        # Cached copy used
+        assert read_cached(filename, mock_read_function, *args) == exp
+        assert mock_read_function.call_count == 1
+
+    def test_missing_file(self, cache_dir, tmpdir):
+        with pytest.raises((IOError, OSError)):
+            read_cached(str(tmpdir.join("missing.csv")), read_constraints_from_csv)
+
+
+# NB: Copies taken when this module is imported since other tests may
+# (temporarily) modify or reorder the level constraint tables.
+ORIGINAL_LEVEL_CONSTRAINTS = deepcopy(LEVEL_CONSTRAINTS)
+ORIGINAL_LEVEL_SEQUENCE_RESTRICTIONS = deepcopy(LEVEL_SEQUENCE_RESTRICTIONS)
+
+
+def test_level_constraints_match_uncached():
+    dirname = os.path.dirname(level_constraints.__file__)
+    assert ORIGINAL_LEVEL_CONSTRAINTS == read_constraints_from_csv(
+        os.path.join(dirname, "level_constraints.csv")
+    )
+    assert ORIGINAL_LEVEL_SEQUENCE_RESTRICTIONS == read_lookup_from_csv(
+        os.path.join(dirname, "level_sequence_restrictions.csv"),
+        Levels,
+        LevelSequenceRestrictions,
+    )
+
+
+# Imports vc2_conformance.level_constraints, printing a line to stdout whenever
+# one of the CSV parsers is called. The parsers are wrapped (rather than
+# replaced) so that their cache keys are unchanged.
+IMPORT_LEVEL_CONSTRAINTS_SCRIPT = """
+import functools
+import vc2_data_tables.csv_readers
+import vc2_conformance.constraint_table
+
+def wrap(module, name):
+    f = getattr(module, name)
+
+    @functools.wraps(f)
+    def wrapper(*args, **kwargs):
+        print("Parsed {}".format(name))
+        return f(*args, **kwargs)
+
+    setattr(module, name, wrapper)
+
+wrap(vc2_data_tables.csv_readers, "read_lookup_from_csv")
+wrap(vc2_conformance.constraint_table, "read_constraints_from_csv")
+
+import vc2_conformance.level_constraints
+"""
+
+
+def test_warm_cache_import_does_not_parse_csv(cache_dir):
+    command = [sys.executable, "-c", IMPORT_LEVEL_CONSTRAINTS_SCRIPT]
+
+    # Cold cache: both tables parsed and cached
+    output = subprocess.check_output(command).decode("utf-8").splitlines()
+    assert sorted(output) == [
+        "Parsed read_constraints_from_csv",
+        "Parsed read_lookup_from_csv",
+    ]
+    assert len(os.listdir(cache_dir)) == 2
+
+    # Warm cache: nothing parsed
+    output = subprocess.check_output(command).decode("utf-8").splitlines()
+    assert output == []
@@ -0,0 +1,256 @@
+"""
+The :py:mod:`vc2_conformance.array_dtypes` module chooses NumPy dtypes for
+arrays of picture samples and transform values.
+
+By default, this software uses native Python integers (or ``dtype=object``
+NumPy arrays) to guarantee correct behaviour for arbitrary bit depths.
+However, for practical picture bit depths, the values involved are known to fit
+within a native (fixed width) integer type which may be processed far more
+quickly. The :py:func:`compute_stage_dtypes` function computes the narrowest
+native NumPy integer dtype which is guaranteed to be able to hold the values
+produced at each stage of the VC-2 coding process. Where no native dtype is
+wide enough (or no bound can be established), ``np.dtype(object)`` is given
+instead.
+
+.. autofunction:: compute_stage_dtypes
+
+.. autoclass:: StageDtypes
+
+The bounds on transform coefficients and intermediate values are computed
+using the static filter analyses in the :py:mod:`vc2_bit_widths` bundle
+supplied by :py:mod:`vc2_conformance_data` (or the bundle named by the
+``VC2_BIT_WIDTHS_BUNDLE`` environment variable). These give the worst-case
+values produced by an encoder given an in-range picture, and by a decoder
+given the (unquantised) transform coefficients produced by that encoder.
+
+.. warning::
+
+    Decoders must not assume that the values in an arbitrary bitstream fit
+    within the ``coefficients`` or ``intermediates`` dtypes since quantisation
+    (or a non-conforming encoder) may produce values beyond the bounds
+    computed here.
+
+The underlying dtype selection is performed by
+:py:func:`vc2_conformance.pseudocode.arrays.integer_dtype_for_range`.
+"""
+
+import os
+
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+
+from vc2_conformance_data import STATIC_FILTER_ANALYSIS_BUNDLE_FILENAME
+
+from vc2_conformance.pseudocode.arrays import integer_dtype_for_range
+
+from vc2_conformance.dimensions_and_depths import compute_dimensions_and_depths
+
+
+__all__ = [
+    "StageDtypes",
+    "compute_stage_dtypes",
+]
+
+
+StageDtypes = namedtuple(
+    "StageDtypes",
+    "samples,offset_samples,sample_differences,coefficients,intermediates",
+)
+"""
+The narrowest safe NumPy dtypes for the values at each stage of the VC-2
+coding process for a single picture component.
+
+Parameters
+==========
+samples : :py:class:`numpy.dtype`
+    Picture sample values (i.e. in the range :math:`0` to :math:`2^d-1` for a
+    :math:`d`-bit picture).
+offset_samples : :py:class:`numpy.dtype`
+    Offset picture sample values (i.e. in the range :math:`-2^{d-1}` to
+    :math:`2^{d-1}-1`), as used as the input to the forward wavelet transform
+    and output of the inverse wavelet transform (after clipping).
+sample_differences : :py:class:`numpy.dtype`
+    The differences between two sample values (i.e. in the range
+    :math:`-(2^d-1)` to :math:`2^d-1`).
+coefficients : :py:class:`numpy.dtype`
+    Transform coefficients produced by the forward wavelet transform of an
+    in-range picture (prior to DC prediction and quantisation).
+intermediates : :py:class:`numpy.dtype`
+    All intermediate values computed during the forward wavelet transform of
+    an in-range picture and the inverse wavelet transform of the resulting
+    (unquantised) coefficients.
+"""
+
+
+def get_bundle_filename():
+    """
+    For internal use. Get the filename of the :py:mod:`vc2_bit_widths` bundle
+    to load static filter analyses from (see
+    :py:func:`vc2_conformance.test_cases.bit_widths_common.get_bundle_filename`).
+    """
+    return (
+        os.environ.get("VC2_BIT_WIDTHS_BUNDLE", "")
+        or STATIC_FILTER_ANALYSIS_BUNDLE_FILENAME
+    )
+
+
+_filter_bounds_cache = {}
+"""
+For internal use. A cache of the results of :py:func:`get_filter_bounds`.
+"""
+
+
+def get_filter_bounds(
+    wavelet_index, wavelet_index_ho, dwt_depth, dwt_depth_ho, picture_bit_width
+):
+    """
+    For internal use. Compute the bounds on the transform coefficients and
+    all intermediate transform values for a particular transform and picture
+    bit width.
+
+    Returns
+    =======
+    bounds : ((lower, upper), (lower, upper)) or None
+        The bounds on the transform coefficients and intermediate values
+        respectively. None if no static filter analysis is available for the
+        transform specified.
+    """
+    key = (
+        int(wavelet_index),
+        int(wavelet_index_ho),
+        dwt_depth,
+        dwt_depth_ho,
+        picture_bit_width,
+        get_bundle_filename(),
+    )
+    if key not in _filter_bounds_cache:
+        # NB: Imported here since vc2_bit_widths is slow to import and is not
+        # needed when only sample dtypes are required (e.g. by
+        # vc2_conformance.file_format).
+        from vc2_bit_widths.bundle import bundle_get_static_filter_analysis
+        from vc2_bit_widths.helpers import evaluate_filter_bounds
+
+        try:
+            (
+                analysis_signal_bounds,
+                synthesis_signal_bounds,
+                _,
+                _,
+            ) = bundle_get_static_filter_analysis(
+                key[-1],
+                wavelet_index,
+                wavelet_index_ho,
+                dwt_depth,
+                dwt_depth_ho,
+            )
+        except KeyError:
+            _filter_bounds_cache[key] = None
+        else:
+            (
+                concrete_analysis_bounds,
+                concrete_synthesis_bounds,
+            ) = evaluate_filter_bounds(
+                wavelet_index,
+                wavelet_index_ho,
+                dwt_depth,
+                dwt_depth_ho,
+                analysis_signal_bounds,
+                synthesis_signal_bounds,
+                picture_bit_width,
+            )
+
+            # NB: The analysis filter bounds include the bounds on every
+            # transform coefficient (and also some intermediate values) and
+            # so form a (slightly conservative) bound on the coefficients.
+            # The picture's own range is included explicitly since, when no
+            # transform levels are used, the coefficients are just the
+            # (offset) picture values.
+            analysis_bounds = list(concrete_analysis_bounds.values()) + [
+                (
+                    -(1 << (picture_bit_width - 1)),
+                    (1 << (picture_bit_width - 1)) - 1,
+                )
+            ]
+            all_bounds = analysis_bounds + list(concrete_synthesis_bounds.values())
+            _filter_bounds_cache[key] = (
+                (
+                    min(lower for lower, upper in analysis_bounds),
+                    max(upper for lower, upper in analysis_bounds),
+                ),
+                (
+                    min(lower for lower, upper in all_bounds),
+                    max(upper for lower, upper in all_bounds),
+                ),
+            )
+
+    return _filter_bounds_cache[key]
+
+
+def compute_stage_dtypes(
+    video_parameters,
+    picture_coding_mode,
+    wavelet_index=None,
+    wavelet_index_ho=None,
+    dwt_depth=0,
+    dwt_depth_ho=0,
+):
+    """
+    Compute the narrowest safe NumPy dtypes for the values at each stage of
+    the VC-2 coding process.
+
+    Parameters
+    ==========
+    video_parameters : :py:class:`~vc2_conformance.pseudocode.video_parameters.VideoParameters`
+    picture_coding_mode : :py:class:`~vc2_data_tables.PictureCodingModes`
+    wavelet_index : :py:class:`~vc2_data_tables.WaveletFilters` or None
+    wavelet_index_ho : :py:class:`~vc2_data_tables.WaveletFilters` or None
+    dwt_depth : int
+    dwt_depth_ho : int
+        The transform parameters. If ``wavelet_index`` is None, the
+        ``coefficients`` and ``intermediates`` dtypes will be
+        ``np.dtype(object)``. If ``wavelet_index_ho`` is None, it is assumed
+        to be the same as ``wavelet_index``.
+
+    Returns
+    =======
+    OrderedDict
+        An ordered dictionary mapping from component name ("Y", "C1" and "C2")
+        to a :py:class:`StageDtypes` namedtuple.
+    """
+    if wavelet_index_ho is None:
+        wavelet_index_ho = wavelet_index
+
+    out = OrderedDict()
+
+    for component, dimensions_and_depths in compute_dimensions_and_depths(
+        video_parameters, picture_coding_mode
+    ).items():
+        depth_bits = dimensions_and_depths.depth_bits
+
+        if wavelet_index is not None:
+            bounds = get_filter_bounds(
+                wavelet_index, wavelet_index_ho, dwt_depth, dwt_depth_ho, depth_bits
+            )
+        else:
+            bounds = None
+
+        if bounds is not None:
+            coefficients = integer_dtype_for_range(*bounds[0])
+            intermediates = integer_dtype_for_range(*bounds[1])
+        else:
+            coefficients = intermediates = np.dtype(object)
+
+        out[component] = StageDtypes(
+            samples=integer_dtype_for_range(0, (1 << depth_bits) - 1),
+            offset_samples=integer_dtype_for_range(
+                -(1 << (depth_bits - 1)), (1 << (depth_bits - 1)) - 1
+            ),
+            sample_differences=integer_dtype_for_range(
+                -((1 << depth_bits) - 1), (1 << depth_bits) - 1
+            ),
+            coefficients=coefficients,
+            intermediates=intermediates,
+        )
+
+    return out
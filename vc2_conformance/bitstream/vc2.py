@@ -64,10 +64,7 @@ from vc2_conformance.pseudocode.vc2_math import intlog2
 
 from vc2_conformance.pseudocode.slice_sizes import (
     slice_bytes,
-    slice_left,
-    slice_right,
-    slice_top,
-    slice_bottom,
+    get_slice_geometry,
 )
 
 from vc2_conformance.bitstream.vc2_fixeddicts import (
@@ -854,10 +851,11 @@ def slice_band(serdes, state, transform, level, orient, sx, sy):
     # These values evaulated in the loop definition in the spec, moving them
     # here saves a lot of computation
     ## Begin not in spec
-    y1 = slice_top(state, sy, comp, level)
-    y2 = slice_bottom(state, sy, comp, level)
-    x1 = slice_left(state, sx, comp, level)
-    x2 = slice_right(state, sx, comp, level)
+    geometry = get_slice_geometry(state)
+    y1 = geometry.slice_top(sy, comp, level)
+    y2 = geometry.slice_bottom(sy, comp, level)
+    x1 = geometry.slice_left(sx, comp, level)
+    x2 = geometry.slice_right(sx, comp, level)
     ## End not in spec
 
     ### for y in range(slice_top(state, sy,comp,level), slice_bottom(state, sy,comp,level)):
@@ -883,10 +881,11 @@ def color_diff_slice_band(serdes, state, level, orient, sx, sy):
     # These values evaulated in the loop definition in the spec, moving them
     # here saves a lot of computation
     ## Begin not in spec
-    y1 = slice_top(state, sy, "C1", level)
-    y2 = slice_bottom(state, sy, "C1", level)
-    x1 = slice_left(state, sx, "C1", level)
-    x2 = slice_right(state, sx, "C1", level)
+    geometry = get_slice_geometry(state)
+    y1 = geometry.slice_top(sy, "C1", level)
+    y2 = geometry.slice_bottom(sy, "C1", level)
+    x1 = geometry.slice_left(sx, "C1", level)
+    x2 = geometry.slice_right(sx, "C1", level)
     ## End not in spec
 
     ### for y in range(slice_top(state,sy,"C1",level), slice_bottom(state,sy,"C1",level)):
@@ -13,6 +13,12 @@ next/previous parse offsets).
 
 .. autofunction:: autofill_and_serialise_stream
 
+When a stream is too large to be conveniently held in memory, the
+:py:func:`autofill_and_serialise_data_units` function may be used instead to
+serialise data units one at a time as they are produced (e.g. by a generator).
+
+.. autofunction:: autofill_and_serialise_data_units
+
 Autofill value routines
 -----------------------
 
@@ -39,6 +45,10 @@ Autofill value dictionary
 
 """
 
+import struct
+
+from io import BytesIO
+
 from copy import deepcopy
 
 from sentinels import Sentinel
@@ -61,15 +71,26 @@ from vc2_conformance.version_constraints import (
     profile_version_implication,
 )
 
-from vc2_conformance.pseudocode.state import State
+from vc2_conformance.pseudocode.state import State, reset_state
 
 from vc2_conformance.bitstream.io import BitstreamWriter
 from vc2_conformance.bitstream.serdes import Serialiser
 
-from vc2_conformance.bitstream.vc2 import parse_stream
+from vc2_conformance.bitstream.vc2 import (
+    parse_stream,
+    parse_info,
+    sequence_header,
+    picture_parse,
+    fragment_parse,
+    auxiliary_data,
+    padding,
+)
 
 from vc2_conformance.bitstream.vc2_fixeddicts import (
     vc2_default_values,
+    Stream,
+    Sequence,
+    DataUnit,
     ParseInfo,
     AuxiliaryData,
     Padding,
@@ -89,6 +110,10 @@ from vc2_conformance.bitstream.vc2_fixeddicts import (
 )
 
 from vc2_conformance.pseudocode.parse_code_functions import (
+    is_seq_header,
+    is_end_of_sequence,
+    is_auxiliary_data,
+    is_padding_data,
     is_picture,
     is_fragment,
 )
@@ -102,6 +127,7 @@ __all__ = [
     "autofill_parse_offsets",
     "autofill_parse_offsets_finalize",
     "autofill_and_serialise_stream",
+    "autofill_and_serialise_data_units",
 ]
 
 
@@ -227,134 +253,135 @@ def autofill_picture_number(stream, initial_picture_number=0):
             last_picture_number = header["picture_number"]
 
 
-def autofill_major_version(stream):
+def get_data_unit_major_version(data_unit):
     """
-    Given a :py:class:`~vc2_conformance.bitstream.vc2_fixeddicts.Stream`, find
-    all ``major_version`` fields which are set to the :py:data:`AUTO` sentinel
-    and automatically set them to the appropriate version number for the
-    features used by this stream.
-
-    As a side effect, this function will automatically remove the
-    :py:class:`~vc2_conformance.bitstream.vc2_fixeddicts.ExtendedTransformParameters`
-    field whenever it appears in
-    :py:class:`~vc2_conformance.bitstream.vc2_fixeddicts.TransformParameters`
-    if the major_version evaluates to less than 3. This change will only be
-    made when ``major_version`` was set to AUTO in a proceeding sequence
-    header, if the field was explicitly set to a particular value, no changes
-    will be made to any transform parameters dicts which follow.
+    For internal use. Given a
+    :py:class:`~vc2_conformance.bitstream.vc2_fixeddicts.DataUnit`, return the
+    minimum major_version number (11.2.2) implied by the features it uses.
     """
-    for sequence in stream.get("sequences", []):
-        # Compute the major version number to be used according to (11.2.2)
-        major_version = MINIMUM_MAJOR_VERSION
-        for data_unit in sequence.get("data_units", []):
-            parse_code = get_auto(
-                data_unit.get("parse_info", {}), "parse_code", ParseInfo
-            )
+    major_version = MINIMUM_MAJOR_VERSION
 
-            # Check parse code version requirements
-            major_version = max(
-                major_version, parse_code_version_implication(parse_code)
-            )
+    parse_code = get_auto(data_unit.get("parse_info", {}), "parse_code", ParseInfo)
 
-            if parse_code == ParseCodes.sequence_header:
-                sequence_header = data_unit.get("sequence_header", {})
+    # Check parse code version requirements
+    major_version = max(major_version, parse_code_version_implication(parse_code))
+
+    if parse_code == ParseCodes.sequence_header:
+        sequence_header = data_unit.get("sequence_header", {})
+
+        # Check profile version requirements
+        parse_parameters = sequence_header.get("parse_parameters", {})
+        profile = get_auto(parse_parameters, "profile", ParseParameters)
+        major_version = max(major_version, profile_version_implication(profile))
+
+        # Check video parameter preset version parameters
+
+        source_parameters = sequence_header.get("video_parameters", {})
 
-                # Check profile version requirements
-                parse_parameters = sequence_header.get("parse_parameters", {})
-                profile = get_auto(parse_parameters, "profile", ParseParameters)
-                major_version = max(major_version, profile_version_implication(profile))
+        frame_rate = source_parameters.get("frame_rate", {})
+        if get_auto(frame_rate, "custom_frame_rate_flag", FrameRate):
+            index = get_auto(frame_rate, "index", FrameRate)
+            major_version = max(
+                major_version, preset_frame_rate_version_implication(index)
+            )
 
-                # Check video parameter preset version parameters
+        signal_range = source_parameters.get("signal_range", {})
+        if get_auto(signal_range, "custom_signal_range_flag", SignalRange):
+            index = get_auto(signal_range, "index", SignalRange)
+            major_version = max(
+                major_version, preset_signal_range_version_implication(index)
+            )
 
-                source_parameters = sequence_header.get("video_parameters", {})
+        color_spec = source_parameters.get("color_spec", {})
+        if get_auto(color_spec, "custom_color_spec_flag", ColorSpec):
+            index = get_auto(color_spec, "index", ColorSpec)
+            major_version = max(
+                major_version, preset_color_spec_version_implication(index)
+            )
 
-                frame_rate = source_parameters.get("frame_rate", {})
-                if get_auto(frame_rate, "custom_frame_rate_flag", FrameRate):
-                    index = get_auto(frame_rate, "index", FrameRate)
+            if index == 0:
+                color_primaries = color_spec.get("color_primaries", {})
+                if get_auto(
+                    color_primaries,
+                    "custom_color_primaries_flag",
+                    ColorPrimaries,
+                ):
+                    index = get_auto(color_primaries, "index", ColorPrimaries)
                     major_version = max(
-                        major_version, preset_frame_rate_version_implication(index)
+                        major_version,
+                        preset_color_primaries_version_implication(index),
                     )
 
-                signal_range = source_parameters.get("signal_range", {})
-                if get_auto(signal_range, "custom_signal_range_flag", SignalRange):
-                    index = get_auto(signal_range, "index", SignalRange)
+                color_matrix = color_spec.get("color_matrix", {})
+                if get_auto(color_matrix, "custom_color_matrix_flag", ColorMatrix):
+                    index = get_auto(color_matrix, "index", ColorMatrix)
                     major_version = max(
-                        major_version, preset_signal_range_version_implication(index)
+                        major_version,
+                        preset_color_matrix_version_implication(index),
                     )
 
-                color_spec = source_parameters.get("color_spec", {})
-                if get_auto(color_spec, "custom_color_spec_flag", ColorSpec):
-                    index = get_auto(color_spec, "index", ColorSpec)
+                transfer_function = color_spec.get("transfer_function", {})
+                if get_auto(
+                    transfer_function,
+                    "custom_transfer_function_flag",
+                    TransferFunction,
+                ):
+                    index = get_auto(transfer_function, "index", TransferFunction)
                     major_version = max(
-                        major_version, preset_color_spec_version_implication(index)
+                        major_version,
+                        preset_transfer_function_version_implication(index),
                     )
+    else:
+        # Check wavelet symmetry version parameters
+        tp = get_transform_parameters(data_unit)
+        if tp is not None:
+            etp = tp.get("extended_transform_parameters", {})
 
-                    if index == 0:
-                        color_primaries = color_spec.get("color_primaries", {})
-                        if get_auto(
-                            color_primaries,
-                            "custom_color_primaries_flag",
-                            ColorPrimaries,
-                        ):
-                            index = get_auto(color_primaries, "index", ColorPrimaries)
-                            major_version = max(
-                                major_version,
-                                preset_color_primaries_version_implication(index),
-                            )
-
-                        color_matrix = color_spec.get("color_matrix", {})
-                        if get_auto(
-                            color_matrix, "custom_color_matrix_flag", ColorMatrix
-                        ):
-                            index = get_auto(color_matrix, "index", ColorMatrix)
-                            major_version = max(
-                                major_version,
-                                preset_color_matrix_version_implication(index),
-                            )
-
-                        transfer_function = color_spec.get("transfer_function", {})
-                        if get_auto(
-                            transfer_function,
-                            "custom_transfer_function_flag",
-                            TransferFunction,
-                        ):
-                            index = get_auto(
-                                transfer_function, "index", TransferFunction
-                            )
-                            major_version = max(
-                                major_version,
-                                preset_transfer_function_version_implication(index),
-                            )
-            else:
-                # Check wavelet symmetry version parameters
-                tp = get_transform_parameters(data_unit)
-                if tp is not None:
-                    etp = tp.get("extended_transform_parameters", {})
+            wavelet_index = get_auto(tp, "wavelet_index", TransformParameters)
 
-                    wavelet_index = get_auto(tp, "wavelet_index", TransformParameters)
+            wavelet_index_ho = wavelet_index
+            if get_auto(etp, "asym_transform_index_flag", ExtendedTransformParameters):
+                wavelet_index_ho = get_auto(
+                    etp, "wavelet_index_ho", ExtendedTransformParameters
+                )
 
-                    wavelet_index_ho = wavelet_index
-                    if get_auto(
-                        etp, "asym_transform_index_flag", ExtendedTransformParameters
-                    ):
-                        wavelet_index_ho = get_auto(
-                            etp, "wavelet_index_ho", ExtendedTransformParameters
-                        )
+            dwt_depth_ho = 0
+            if get_auto(etp, "asym_transform_flag", ExtendedTransformParameters):
+                dwt_depth_ho = get_auto(
+                    etp, "dwt_depth_ho", ExtendedTransformParameters
+                )
 
-                    dwt_depth_ho = 0
-                    if get_auto(
-                        etp, "asym_transform_flag", ExtendedTransformParameters
-                    ):
-                        dwt_depth_ho = get_auto(
-                            etp, "dwt_depth_ho", ExtendedTransformParameters
-                        )
+            major_version = max(
+                major_version,
+                wavelet_transform_version_implication(
+                    wavelet_index, wavelet_index_ho, dwt_depth_ho
+                ),
+            )
 
-                    major_version = max(
-                        major_version,
-                        wavelet_transform_version_implication(
-                            wavelet_index, wavelet_index_ho, dwt_depth_ho
-                        ),
-                    )
+    return major_version
+
+
+def autofill_major_version(stream):
+    """
+    Given a :py:class:`~vc2_conformance.bitstream.vc2_fixeddicts.Stream`, find
+    all ``major_version`` fields which are set to the :py:data:`AUTO` sentinel
+    and automatically set them to the appropriate version number for the
+    features used by this stream.
+
+    As a side effect, this function will automatically remove the
+    :py:class:`~vc2_conformance.bitstream.vc2_fixeddicts.ExtendedTransformParameters`
+    field whenever it appears in
+    :py:class:`~vc2_conformance.bitstream.vc2_fixeddicts.TransformParameters`
+    if the major_version evaluates to less than 3. This change will only be
+    made when ``major_version`` was set to AUTO in a proceeding sequence
+    header, if the field was explicitly set to a particular value, no changes
+    will be made to any transform parameters dicts which follow.
+    """
+    for sequence in stream.get("sequences", []):
+        # Compute the major version number to be used according to (11.2.2)
+        major_version = MINIMUM_MAJOR_VERSION
+        for data_unit in sequence.get("data_units", []):
+            major_version = max(major_version, get_data_unit_major_version(data_unit))
 
         # Modify sequence headers to include the correct version number,
         # additionally, remove ExtendedTransformParameters where defined when
@@ -552,3 +579,243 @@ def autofill_and_serialise_stream(file, stream):
         next_parse_offsets_to_autofill,
         previous_parse_offsets_to_autofill,
     )
+
+
+def iter_autofill_major_version(data_units):
+    """
+    For internal use. A generator which implements an incremental version of
+    :py:func:`autofill_major_version` for a (possibly lazily generated) series
+    of :py:class:`~vc2_conformance.bitstream.vc2_fixeddicts.DataUnit` forming
+    one or more concatenated sequences.
+
+    When a sequence header with an :py:data:`AUTO` ``major_version`` is
+    encountered, data units are held back until the first picture (or first
+    fragment of a picture) or the end of the sequence is reached. The major
+    version is then determined from the data units seen so far in the
+    sequence. Since the remaining data units in a sequence will usually
+    share the same features, this is usually sufficient. Should a later data
+    unit require a higher version, a :py:exc:`ValueError` is raised.
+    """
+    pending = []
+
+    # The following are reset at the start of every sequence
+    major_version = None
+    auto_used = False
+    seen_major_version = MINIMUM_MAJOR_VERSION
+
+    def autofill(data_unit, major_version, auto_used):
+        # Fill in the major version or remove extended transform parameters
+        # (as in autofill_major_version). Returns the new 'auto_used' value.
+        parse_code = get_auto(data_unit.get("parse_info", {}), "parse_code", ParseInfo)
+        if parse_code == ParseCodes.sequence_header:
+            sequence_header = data_unit.setdefault("sequence_header", {})
+            parse_parameters = sequence_header.setdefault("parse_parameters", {})
+            if get_auto(parse_parameters, "major_version", ParseParameters) is AUTO:
+                parse_parameters["major_version"] = major_version
+                return True
+            else:
+                return False
+        else:
+            tp = get_transform_parameters(data_unit)
+            if tp is not None and auto_used:
+                if major_version < 3 and "extended_transform_parameters" in tp:
+                    del tp["extended_transform_parameters"]
+            return auto_used
+
+    for data_unit in data_units:
+        parse_code = get_auto(data_unit.get("parse_info", {}), "parse_code", ParseInfo)
+        seen_major_version = max(
+            seen_major_version, get_data_unit_major_version(data_unit)
+        )
+
+        if major_version is not None:
+            if seen_major_version > major_version:
+                raise ValueError(
+                    "Data unit requires major_version {} but {} was already "
+                    "auto-filled into an earlier sequence header.".format(
+                        seen_major_version, major_version
+                    )
+                )
+            auto_used = autofill(data_unit, major_version, auto_used)
+            yield data_unit
+        elif (
+            pending
+            or parse_code == ParseCodes.sequence_header
+            and get_auto(
+                data_unit.get("sequence_header", {}).get("parse_parameters", {}),
+                "major_version",
+                ParseParameters,
+            )
+            is AUTO
+        ):
+            pending.append(data_unit)
+            if (
+                get_transform_parameters(data_unit) is not None
+                or parse_code == ParseCodes.end_of_sequence
+            ):
+                major_version = seen_major_version
+                for pending_data_unit in pending:
+                    auto_used = autofill(pending_data_unit, major_version, auto_used)
+                    yield pending_data_unit
+                del pending[:]
+        else:
+            # No auto-filling required (yet)
+            auto_used = autofill(data_unit, major_version, auto_used)
+            yield data_unit
+
+        if parse_code == ParseCodes.end_of_sequence:
+            major_version = None
+            auto_used = False
+            seen_major_version = MINIMUM_MAJOR_VERSION
+
+    # Stream ended mid-sequence
+    for pending_data_unit in pending:
+        auto_used = autofill(pending_data_unit, seen_major_version, auto_used)
+        yield pending_data_unit
+
+
+def serialise_data_unit_payload(serdes, state):
+    """
+    For internal use. Serialise the part of a
+    :py:class:`~vc2_conformance.bitstream.vc2_fixeddicts.DataUnit` (the
+    current context of ``serdes``) which follows its parse info header.
+    Equivalent to the body of the loop in
+    :py:func:`~vc2_conformance.bitstream.vc2.parse_sequence`.
+    """
+    if is_seq_header(state):
+        with serdes.subcontext("sequence_header"):
+            state["video_parameters"] = sequence_header(serdes, state)
+    elif is_picture(state):
+        with serdes.subcontext("picture_parse"):
+            picture_parse(serdes, state)
+    elif is_fragment(state):
+        with serdes.subcontext("fragment_parse"):
+            fragment_parse(serdes, state)
+    elif is_auxiliary_data(state):
+        with serdes.subcontext("auxiliary_data"):
+            auxiliary_data(serdes, state)
+    elif is_padding_data(state):
+        with serdes.subcontext("padding"):
+            padding(serdes, state)
+
+
+def autofill_and_serialise_data_units(file, data_units):
+    """
+    Serialise a series of
+    :py:class:`~vc2_conformance.bitstream.vc2_fixeddicts.DataUnit` dictionaries
+    into the supplied file, one data unit at a time.
+
+    This function is equivalent to :py:func:`autofill_and_serialise_stream`
+    but does not require the whole stream to be held in memory at once. The
+    data units may be supplied by a generator and each data unit is
+    serialised (and may be discarded) before the next is requested.
+
+    Each data unit is serialised into an in-memory buffer, its parse offsets
+    filled in, and then written to the output file. No seeking is performed
+    on the output file and so it may be a pipe or socket. Peak memory usage
+    is bounded by the size of the largest data unit.
+
+    Parameters
+    ==========
+    file : file-like object
+        A file open for binary writing. The serialised bitstream will be
+        written to this file. Only the ``write`` and ``flush`` methods are
+        used.
+    data_units : iterable of :py:class:`~vc2_conformance.bitstream.vc2_fixeddicts.DataUnit`
+        The data units to be serialised. Each ``end_of_sequence`` data unit
+        ends the current sequence, with any following data units forming a
+        new sequence.
+
+        Supported fields containing the :py:data:`AUTO` sentinel (or which are
+        absent) will be autofilled as in :py:func:`autofill_and_serialise_stream`
+        with the following caveats:
+
+        * The ``major_version`` is determined from the data units in a
+          sequence up to (and including) the first picture or fragment
+          following the sequence header. A :py:exc:`ValueError` will be
+          raised if a later data unit requires a higher version number.
+        * The next parse offset of every data unit except ``end_of_sequence``
+          data units is set to the length of that data unit (i.e. pointing to
+          where the following data unit would start), even when the data unit
+          is the last one given.
+    """
+    # Data units are serialised into this buffer (with absolute stream
+    # offsets known to the writer) which is periodically emptied into the
+    # output file. The final (partial) byte of each data unit is retained
+    # by the writer so that the following parse info's padding bits (10.5.1)
+    # may be serialised as usual.
+    buffer = BytesIO()
+    writer = BitstreamWriter(buffer)
+    buffer_offset = 0  # Stream offset of the first byte in the buffer
+
+    state = State()
+
+    # The following values are reset at the start of every sequence
+    start_of_sequence = True
+    last_picture_number = None
+    previous_offset = None
+
+    for data_unit in iter_autofill_major_version(data_units):
+        if start_of_sequence:
+            reset_state(state)
+            start_of_sequence = False
+            last_picture_number = 0xFFFFFFFF
+            previous_offset = None
+
+        # Autofill picture numbers, continuing from the previous picture
+        stream = Stream(sequences=[Sequence(data_units=[data_unit])])
+        autofill_picture_number(stream, (last_picture_number + 1) & 0xFFFFFFFF)
+        picture_number = (
+            data_unit.get("picture_parse", {})
+            .get("picture_header", {})
+            .get(
+                "picture_number",
+                data_unit.get("fragment_parse", {})
+                .get("fragment_header", {})
+                .get("picture_number"),
+            )
+        )
+        if picture_number is not None:
+            last_picture_number = picture_number
+
+        # The previous parse offset is already known (this data unit starts on
+        # the first byte boundary after the end of the previous one).
+        offset = writer.tell()[0] + (writer.tell()[1] != 7)
+        data_unit_parse_info = data_unit.setdefault("parse_info", ParseInfo())
+        if data_unit_parse_info.get("previous_parse_offset", AUTO) is AUTO:
+            if previous_offset is None:
+                data_unit_parse_info["previous_parse_offset"] = 0
+            else:
+                data_unit_parse_info["previous_parse_offset"] = offset - previous_offset
+        next_parse_offset_to_autofill, _ = autofill_parse_offsets(stream)
+
+        with Serialiser(writer, data_unit, vc2_default_values_with_auto) as serdes:
+            serdes.set_context_type(DataUnit)
+            with serdes.subcontext("parse_info"):
+                parse_info(serdes, state)
+            serialise_data_unit_payload(serdes, state)
+
+        # The next parse offset may now be filled in from the data unit's
+        # (byte aligned) length. This field is located at byte 5 of the parse
+        # info header (following the prefix and parse code).
+        end_offset = writer.tell()[0] + (writer.tell()[1] != 7)
+        if next_parse_offset_to_autofill and not is_end_of_sequence(state):
+            buffer.seek(offset - buffer_offset + 5)
+            buffer.write(struct.pack(">I", end_offset - offset))
+            buffer.seek(0, 2)
+
+        # Emit all complete bytes
+        file.write(buffer.getvalue())
+        buffer_offset += buffer.tell()
+        buffer.seek(0)
+        buffer.truncate()
+
+        previous_offset = offset
+
+        if is_end_of_sequence(state):
+            start_of_sequence = True
+
+    # Emit any final partial byte
+    writer.flush()
+    file.write(buffer.getvalue())
+    file.flush()
@@ -70,7 +70,7 @@ requirements.
 
 .. autoclass:: ValueSet
     :members:
-    :special-members: __init__, __contains__, __eq__, __add__, __iter__, __str__
+    :special-members: __init__, __contains__, __eq__, __add__, __and__, __iter__, __str__
 
 .. autoclass:: AnyValue
 
@@ -128,6 +128,13 @@ The functions below may be used to interrogate a constraint table.
 
 .. autofunction:: allowed_values_for
 
+When values are obtained one at a time and checked as they arrive (as in the
+bitstream validator), a :py:class:`ConstraintTracker` may be used to avoid
+re-filtering the whole constraint table for every check:
+
+.. autoclass:: ConstraintTracker
+    :members:
+
 
 CSV format
 ----------
@@ -140,6 +147,12 @@ A Constraint table can be read from CSV files using the following function:
 
 import csv
 
+from bisect import bisect_left, bisect_right
+
+from heapq import merge
+
+from collections import OrderedDict
+
 from vc2_data_tables.csv_readers import open_utf8, is_ditto
 
 
@@ -149,6 +162,7 @@ __all__ = [
     "filter_constraint_table",
     "is_allowed_combination",
     "allowed_values_for",
+    "ConstraintTracker",
     "read_constraints_from_csv",
 ]
 
@@ -208,12 +222,18 @@ class ValueSet(object):
         *values_and_ranges : value, or (lower_value, upper_value)
             Sets the initial set of values and (inclusive) ranges to be matched
         """
-        # Individual values explicitly included in this value set
+        # Individual values explicitly included in this value set (and not
+        # already included by a range)
         self._values = set()
 
         # A series of (lower_bound, upper_bound) tuples which give *incuslive*
-        # ranges of values which are permitted.
-        self._ranges = set()
+        # ranges of values which are permitted. Kept sorted with overlapping
+        # ranges combined.
+        self._ranges = []
+
+        # The lower and upper bounds of the entries in _ranges (for bisection)
+        self._lower_bounds = []
+        self._upper_bounds = []
 
         for value_or_range in values_and_ranges:
             if isinstance(value_or_range, tuple):
@@ -238,17 +258,34 @@ class ValueSet(object):
             if lower_bound <= value <= upper_bound:
                 self._values.remove(value)
 
-        # Combine this range with any existing ranges where possible
-        ranges_to_remove = []
-        for other_lower_bound, other_upper_bound in self._ranges:
-            if lower_bound <= other_upper_bound and other_lower_bound <= upper_bound:
-                ranges_to_remove.append((other_lower_bound, other_upper_bound))
-                lower_bound = min(lower_bound, other_lower_bound)
-                upper_bound = max(upper_bound, other_upper_bound)
-        for lower_upper in ranges_to_remove:
-            self._ranges.remove(lower_upper)
+        # Combine this range with any existing ranges where possible (the
+        # overlapping ranges are contiguous in the sorted list of ranges)
+        first = bisect_left(self._upper_bounds, lower_bound)
+        last = bisect_right(self._lower_bounds, upper_bound)
+        if first < last:
+            lower_bound = min(lower_bound, self._lower_bounds[first])
+            upper_bound = max(upper_bound, self._upper_bounds[last - 1])
+
+        self._ranges[first:last] = [(lower_bound, upper_bound)]
+        self._lower_bounds[first:last] = [lower_bound]
+        self._upper_bounds[first:last] = [upper_bound]
+
+    def _set_ranges(self, ranges):
+        """
+        For internal use. Replace the ranges in this set with the supplied
+        sorted list of non-overlapping ranges.
+        """
+        self._ranges = ranges
+        self._lower_bounds = [lower for lower, upper in ranges]
+        self._upper_bounds = [upper for lower, upper in ranges]
 
-        self._ranges.add((lower_bound, upper_bound))
+    def _in_ranges(self, value):
+        """
+        For internal use. Test if a value is within one of the ranges in this
+        set.
+        """
+        i = bisect_right(self._lower_bounds, value) - 1
+        return i >= 0 and value <= self._upper_bounds[i]
 
     def __contains__(self, value):
         """
@@ -263,11 +300,7 @@ class ValueSet(object):
         if value in self._values:
             return True
 
-        for lower_bound, upper_bound in self._ranges:
-            if lower_bound <= value <= upper_bound:
-                return True
-
-        return False
+        return bool(self._ranges) and self._in_ranges(value)
 
     def is_disjoint(self, other):
         """
@@ -332,22 +365,66 @@ class ValueSet(object):
         else:
             out = type(self)()
 
-            for value in self._values:
-                out.add_value(value)
-            for value in other._values:
-                out.add_value(value)
+            # Merge the (sorted) ranges, combining overlapping ranges
+            ranges = []
+            for lower, upper in merge(self._ranges, other._ranges):
+                if ranges and lower <= ranges[-1][1]:
+                    if upper > ranges[-1][1]:
+                        ranges[-1] = (ranges[-1][0], upper)
+                else:
+                    ranges.append((lower, upper))
+            out._set_ranges(ranges)
 
-            for lower, upper in self._ranges:
-                out.add_range(lower, upper)
-            for lower, upper in other._ranges:
-                out.add_range(lower, upper)
+            for values in [self._values, other._values]:
+                for value in values:
+                    if not (ranges and out._in_ranges(value)):
+                        out._values.add(value)
+
+            return out
+
+    def __and__(self, other):
+        """
+        Produce a :py:class:`ValueSet` containing the intersection of two
+        :py:class:`ValueSet` objects.
+
+        For example::
+
+            >>> a = ValueSet(1, 2, 3, (10, 20))
+            >>> b = ValueSet(3, (15, 30))
+            >>> a & b
+            ValueSet(3, (15, 20))
+        """
+        if isinstance(other, AnyValue):
+            return self + ValueSet()
+        else:
+            out = type(self)()
+
+            # Intersect the (sorted) ranges
+            ranges = []
+            i = j = 0
+            while i < len(self._ranges) and j < len(other._ranges):
+                lower = max(self._lower_bounds[i], other._lower_bounds[j])
+                upper = min(self._upper_bounds[i], other._upper_bounds[j])
+                if lower <= upper:
+                    ranges.append((lower, upper))
+                if self._upper_bounds[i] < other._upper_bounds[j]:
+                    i += 1
+                else:
+                    j += 1
+            out._set_ranges(ranges)
+
+            for a, b in [(self, other), (other, self)]:
+                for value in a._values:
+                    if value in b and not (ranges and out._in_ranges(value)):
+                        out._values.add(value)
 
             return out
 
     def __iter__(self):
         """
-        Iterate over the values and (lower_bound, upper_bound) tuples in this
-        value set in no particular order.
+        Iterate over the values (in no particular order) followed by the
+        (lower_bound, upper_bound) tuples (in ascending order) in this value
+        set.
         """
         for value in self._values:
             yield value
@@ -382,7 +459,7 @@ class ValueSet(object):
             >>> print(ValueSet(1, 2, 3, (10, 20)))
             {1, 2, 3, 10-20}
         """
-        values_and_ranges = sorted([(v,) for v in self._values] + list(self._ranges))
+        values_and_ranges = sorted([(v,) for v in self._values] + self._ranges)
         if len(values_and_ranges) == 0:
             return "{<no values>}"
         else:
@@ -427,6 +504,12 @@ class AnyValue(ValueSet):
     def __add__(self, other):
         return AnyValue()
 
+    def __and__(self, other):
+        if isinstance(other, AnyValue):
+            return AnyValue()
+        else:
+            return other & self
+
     def __iter__(self):
         raise AttributeError("__iter__")
 
@@ -504,6 +587,122 @@ def allowed_values_for(constraint_table, key, values={}, any_value=AnyValue()):
         return out
 
 
+class ConstraintTracker(object):
+    """
+    Incrementally checks values against a constraint table.
+
+    Equivalent to calling :py:func:`allowed_values_for` with a dictionary of
+    values which is updated (using :py:meth:`set`) as each value is checked.
+    However, rather than re-filtering the constraint table for every query,
+    the subset of the table's allowed combinations which match the values set
+    so far is maintained incrementally and the :py:class:`ValueSet` allowed
+    for each key is memoised. As a result, repeatedly checking a key whose
+    value rarely changes (e.g. a per-slice quantisation index) usually costs
+    only a dictionary lookup and a :py:class:`ValueSet` membership test.
+
+    Parameters
+    ==========
+    constraint_table : [{key: :py:class:`ValueSet`, ...}, ...]
+    values : {key: value, ...}
+        Optional. The values already chosen. If given, this dictionary is used
+        (and updated in place) as :py:attr:`values`. (Default: a new, empty
+        :py:class:`~collections.OrderedDict`).
+
+    Attributes
+    ==========
+    constraint_table : [{key: :py:class:`ValueSet`, ...}, ...]
+    values : {key: value, ...}
+        The values chosen so far. This dictionary must only be modified using
+        :py:meth:`set`.
+    """
+
+    def __init__(self, constraint_table, values=None):
+        self.constraint_table = constraint_table
+        self.values = OrderedDict() if values is None else values
+
+        # Sets of allowed combinations (rows) in the constraint table are
+        # represented as bitmasks where bit 'i' is set if constraint_table[i]
+        # is a member.
+
+        # The 'catch all' (empty) allowed combinations which match any values
+        self._catch_all_mask = 0
+        for i, allowed_combination in enumerate(self.constraint_table):
+            if len(allowed_combination) == 0:
+                self._catch_all_mask |= 1 << i
+
+        # {(key, value): mask, ...} The allowed combinations which explicitly
+        # permit each key/value pair
+        self._value_masks = {}
+
+        # {key: mask, ...} The allowed combinations which permit the current
+        # value of each key in self.values
+        self._key_masks = {}
+
+        # The allowed combinations which permit all values in self.values
+        self._mask = (1 << len(self.constraint_table)) - 1
+
+        # {(key, mask): ValueSet, ...} Memoised results of allowed_values_for
+        self._allowed_values = {}
+
+        for key, value in self.values.items():
+            self._key_masks[key] = self._get_value_mask(key, value)
+            self._mask &= self._key_masks[key]
+
+    def _get_value_mask(self, key, value):
+        """
+        Return the mask of allowed combinations which permit the specified
+        key/value pair (including catch-all combinations).
+        """
+        try:
+            return self._value_masks[(key, value)]
+        except KeyError:
+            mask = self._catch_all_mask
+            for i, allowed_combination in enumerate(self.constraint_table):
+                if key in allowed_combination and value in allowed_combination[key]:
+                    mask |= 1 << i
+            self._value_masks[(key, value)] = mask
+            return mask
+
+    def allowed_values_for(self, key, any_value=AnyValue()):
+        """
+        Return a :py:class:`ValueSet` which matches all allowed values for the
+        specified key, given the current :py:attr:`values`. Equivalent to
+        :py:func:`allowed_values_for`.
+        """
+        try:
+            out = self._allowed_values[(key, self._mask)]
+        except KeyError:
+            out = ValueSet()
+            for i, allowed_combination in enumerate(self.constraint_table):
+                if self._mask & (1 << i):
+                    out += allowed_combination.get(key, ValueSet())
+            self._allowed_values[(key, self._mask)] = out
+
+        if isinstance(out, AnyValue):
+            return any_value
+        else:
+            return out
+
+    def set(self, key, value):
+        """
+        Set (or change) the value of a key in :py:attr:`values`.
+        """
+        self.values[key] = value
+
+        mask = self._get_value_mask(key, value)
+        if key not in self._key_masks:
+            # Just narrow down the current set of allowed combinations
+            self._key_masks[key] = mask
+            self._mask &= mask
+        elif self._key_masks[key] != mask:
+            # Changing a value may widen the set of allowed combinations so
+            # recompute from the per-key sets.
+            self._key_masks[key] = mask
+            self._mask = (1 << len(self.constraint_table)) - 1
+            for mask in self._key_masks.values():
+                self._mask &= mask
+
+
 def read_constraints_from_csv(csv_filename):
     r'''
     Reads a table of constraints from a CSV file.
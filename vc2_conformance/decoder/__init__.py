@@ -42,6 +42,23 @@ VC-2 bitstream might be decoded and verified using this module::
     Perhaps this bitstream conforms to an earlier or later version of the VC-2
     standard?
 
+For faster decoding, the state may instead be created as a
+:py:data:`~vc2_conformance.pseudocode.state.FastState`. This behaves
+identically to a :py:class:`~vc2_conformance.pseudocode.state.State` except
+that entry names are not checked (a check which can only detect bugs in this
+software, not in the bitstream).
+
+Some (bit-exact) vectorised alternatives to individual pseudocode functions may
+also be enabled via the state. For example, setting the
+``_use_wavefront_dc_prediction`` and ``_use_fused_output_stage`` state entries
+to True enables
+:py:func:`~vc2_conformance.decoder.transform_data_syntax.wavefront_dc_prediction`
+and
+:py:func:`~vc2_conformance.pseudocode.picture_decoding.pad_removal_clip_and_offset_component`
+respectively. Likewise, setting ``_use_sequence_header_cache`` to True causes
+repeated sequence headers which are byte-for-byte identical to the previous
+one to be skipped rather than parsed again.
+
 
 Overview
 --------
@@ -17,7 +17,7 @@ from vc2_conformance.version_constraints import MINIMUM_MAJOR_VERSION
 
 from vc2_conformance.symbol_re import WILDCARD, END_OF_SEQUENCE
 
-from vc2_conformance.constraint_table import allowed_values_for
+from vc2_conformance.constraint_table import ConstraintTracker
 
 from vc2_conformance.decoder.exceptions import (
     ValueNotAllowedInLevel,
@@ -119,22 +119,33 @@ def assert_level_constraint(state, key, value):
     Takes the current :py:class:`~vc2_conformance.pseudocode.state.State` instance from
     which the current
     :py:attr:`~vc2_conformance.pseudocode.state.State._level_constrained_values` will be
-    created/updated.
+    created/updated. The checks are performed using a
+    :py:class:`~vc2_conformance.constraint_table.ConstraintTracker` kept in
+    :py:attr:`~vc2_conformance.pseudocode.state.State._level_constraint_tracker`.
     """
     state.setdefault("_level_constrained_values", OrderedDict())
 
-    allowed_values = allowed_values_for(
-        LEVEL_CONSTRAINTS,
-        key,
-        state["_level_constrained_values"],
-    )
+    # NB: A new tracker is required whenever the constrained values are
+    # replaced (e.g. at the start of a new sequence)
+    tracker = state.get("_level_constraint_tracker")
+    if (
+        tracker is None
+        or tracker.values is not state["_level_constrained_values"]
+        or tracker.constraint_table is not LEVEL_CONSTRAINTS
+    ):
+        tracker = ConstraintTracker(
+            LEVEL_CONSTRAINTS, state["_level_constrained_values"]
+        )
+        state["_level_constraint_tracker"] = tracker
+
+    allowed_values = tracker.allowed_values_for(key)
 
     if value not in allowed_values:
         raise ValueNotAllowedInLevel(
             state["_level_constrained_values"], key, value, allowed_values
         )
     else:
-        state["_level_constrained_values"][key] = value
+        tracker.set(key, value)
 
 
 def assert_picture_number_incremented_as_expected(state, picture_number_offset):
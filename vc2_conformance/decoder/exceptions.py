@@ -47,7 +47,19 @@ from vc2_conformance.version_constraints import (
     profile_version_implication,
 )
 
-from vc2_conformance.bitstream.io import to_bit_offset
+
+def to_bit_offset(*args):
+    """
+    For internal use. Wrapper around
+    :py:func:`vc2_conformance.bitstream.io.to_bit_offset`.
+
+    Imports :py:mod:`vc2_conformance.bitstream` on first use since it is only
+    needed when explaining conformance errors and is comparatively slow to
+    import (the decoder does not otherwise depend on it).
+    """
+    from vc2_conformance.bitstream.io import to_bit_offset
+
+    return to_bit_offset(*args)
 
 
 def known_parse_code_to_string(parse_code):
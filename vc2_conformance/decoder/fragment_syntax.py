@@ -28,7 +28,7 @@ from vc2_conformance.decoder.picture_syntax import transform_parameters
 from vc2_conformance.decoder.transform_data_syntax import (
     initialize_wavelet_data,
     slice,
-    dc_prediction,
+    select_dc_prediction,
 )
 
 
@@ -171,6 +171,7 @@ def fragment_data(state):
         if state["fragment_slices_received"] == state["slices_x"] * state["slices_y"]:
             state["fragmented_picture_done"] = True
             if using_dc_prediction(state):
+                dc_prediction = select_dc_prediction(state)  ## Not in spec
                 if state["dwt_depth_ho"] == 0:
                     dc_prediction(state["y_transform"][0]["LL"])
                     dc_prediction(state["c1_transform"][0]["LL"])
@@ -40,6 +40,21 @@ bitstream bytes read within part of the bitstream.
 
 .. autofunction:: record_bitstream_finish
 
+A previously made recording may be compared with (and, if identical, skipped
+over in) the bitstream using :py:func:`skip_recording_if_identical`. This
+allows repeated fields to be skipped without being re-parsed.
+
+.. autofunction:: skip_recording_if_identical
+
+
+Bulk reads
+----------
+
+Some parts of a bitstream (e.g. padding data) consist of many bytes whose
+values are not used by the decoder. The :py:func:`read_bytes` function
+consumes these in a single operation rather than bit-by-bit.
+
+.. autofunction:: read_bytes
 
 """
 
@@ -51,8 +66,10 @@ __all__ = [
     "init_io",
     "record_bitstream_start",
     "record_bitstream_finish",
+    "skip_recording_if_identical",
     "tell",
     "read_byte",
+    "read_bytes",
     "is_end_of_stream",
     "read_bit",
     "byte_align",
@@ -135,6 +152,88 @@ def record_bitstream_finish(state):
     return recorded_bytes
 
 
+def is_seekable(f):
+    """
+    For internal use. Return True if the file-like object ``f`` supports
+    seeking.
+    """
+    try:
+        return f.seekable()
+    except AttributeError:
+        # NB: Python 2 file objects do not provide seekable() but fail to
+        # tell() when not seekable.
+        try:
+            f.tell()
+            return True
+        except (IOError, OSError):
+            return False
+
+
+def skip_recording_if_identical(state, recorded_bytes, next_bit):
+    """
+    Not part of spec; used to skip over repeated sequence_headers (11.1)
+    which are byte-for-byte identical to a previous one.
+
+    If the bitstream, starting at the current (byte aligned) position, is
+    identical to a recording produced by :py:func:`record_bitstream_finish`,
+    advance past the recorded bits and return True. Otherwise, leave the
+    stream position unchanged and return False.
+
+    Since the stream position must be restored when the bitstream differs
+    from the recording, False is always returned when the file being read is
+    not seekable (e.g. a pipe) and the caller should parse the bitstream as
+    usual.
+
+    Parameters
+    ==========
+    state : :py:class:`~vc2_conformance.pseudocode.state.State`
+    recorded_bytes : :py:class:`bytearray`
+        The recording returned by :py:func:`record_bitstream_finish`.
+    next_bit : int
+        The value of ``state["next_bit"]`` immediately after the recorded
+        bits were originally read. If not 7, the final recorded byte was only
+        partially read and only its read bits are compared.
+
+    Returns
+    =======
+    bool
+    """
+    if state["next_bit"] != 7 or state["current_byte"] is None or not recorded_bytes:
+        return False
+
+    f = state["_file"]
+    if not is_seekable(f):
+        return False
+
+    # NB: The current byte has already been read from the file
+    following_bytes = bytearray(f.read(len(recorded_bytes) - 1))
+    data = bytearray([state["current_byte"]]) + following_bytes
+    last_byte = data[-1]
+    if next_bit != 7:
+        data[-1] &= ~((1 << (next_bit + 1)) - 1)
+
+    if data != recorded_bytes:
+        f.seek(-len(following_bytes), 1)
+        return False
+
+    if next_bit != 7:
+        # Stop part-way through the final byte, as the original reads did
+        if "_recorded_bytes" in state:
+            state["_recorded_bytes"].extend(data[:-1])
+        state["current_byte"] = last_byte
+        state["next_bit"] = next_bit
+    else:
+        if "_recorded_bytes" in state:
+            state["_recorded_bytes"].extend(data)
+        byte = f.read(1)
+        if len(byte) == 1:
+            state["current_byte"] = bytearray(byte)[0]
+        else:
+            state["current_byte"] = None
+
+    return True
+
+
 def tell(state):
     """
     Not part of spec; used to log bit offsets in the bitstream.
@@ -174,6 +273,82 @@ def read_byte(state):
         state["current_byte"] = None
 
 
+READ_BYTES_CHUNK_SIZE = 1024 * 1024
+"""
+For internal use. The maximum number of bytes read from the file at once by
+:py:func:`read_bytes`.
+"""
+
+
+def read_bytes(state, n, checksum=None):
+    """
+    Not part of spec; used to consume byte-aligned data whose values are not
+    used (e.g. padding data (10.4.5)).
+
+    Equivalent to (but much faster than) calling :py:func:`read_uint_lit` with
+    a length of one byte ``n`` times and discarding the results. When the
+    stream is byte aligned, the bytes are consumed directly from the file
+    (including being recorded when :py:func:`record_bitstream_start` is in
+    use). Otherwise, this function falls back to bit-wise reads.
+
+    Parameters
+    ==========
+    state : :py:class:`~vc2_conformance.pseudocode.state.State`
+    n : int
+        The number of bytes to consume. If zero or negative, no bytes are
+        consumed.
+    checksum : object or None
+        If not None, an object with an ``update`` method (e.g. a
+        :py:mod:`hashlib` hash object) which will be passed the bytes
+        consumed.
+
+    Raises
+    ======
+    :py:exc:`~vc2_conformance.decoder.exceptions.UnexpectedEndOfStream`
+        If the stream ends before ``n`` bytes have been read.
+    """
+    if n <= 0:
+        return
+
+    if state["next_bit"] != 7:
+        for i in range(n):
+            byte = read_nbits(state, 8)
+            if checksum is not None:
+                checksum.update(bytearray([byte]))
+        return
+
+    if state["current_byte"] is None:
+        raise UnexpectedEndOfStream()
+
+    # NB: The current byte has already been read from the file and so only the
+    # remaining n - 1 bytes are read from the file below.
+    data = bytearray([state["current_byte"]])
+    remaining = n - 1
+    while True:
+        if "_recorded_bytes" in state:
+            state["_recorded_bytes"].extend(data)
+        if checksum is not None:
+            checksum.update(data)
+
+        if remaining == 0:
+            break
+
+        data = bytearray(state["_file"].read(min(remaining, READ_BYTES_CHUNK_SIZE)))
+        remaining -= len(data)
+        if len(data) == 0:
+            # End of file reached (as read_byte would)
+            state["current_byte"] = None
+            raise UnexpectedEndOfStream()
+
+    # Load the byte following those consumed (NB: read_byte would record the
+    # last consumed byte again if used here)
+    byte = state["_file"].read(1)
+    if len(byte) == 1:
+        state["current_byte"] = bytearray(byte)[0]
+    else:
+        state["current_byte"] = None
+
+
 @ref_pseudocode(deviation="inferred_implementation")
 def is_end_of_stream(state):
     """
@@ -35,6 +35,7 @@ from vc2_conformance.version_constraints import (
 )
 
 from vc2_conformance.pseudocode.video_parameters import (
+    VideoParameters,
     set_source_defaults,
     set_coding_parameters,
     preset_frame_rate,
@@ -90,6 +91,7 @@ from vc2_conformance.symbol_re import Matcher
 from vc2_conformance.decoder.io import (
     record_bitstream_start,
     record_bitstream_finish,
+    skip_recording_if_identical,
     tell,
     read_bool,
     read_uint,
@@ -120,9 +122,24 @@ def sequence_header(state):
     # Record this sequence_header as it appears in the bitstream
     ## Begin not in spec
     this_sequence_header_offset = tell(state)[0]
-    record_bitstream_start(state)
     ## End not in spec
 
+    # (11.1) A repeated sequence_header which is byte-for-byte identical to
+    # the previous one in the sequence will produce the same values and pass
+    # the same checks. When enabled, such repeats are skipped over and the
+    # previously parsed video parameters reused.
+    ## Begin not in spec
+    if state.get("_use_sequence_header_cache") and skip_recording_if_identical(
+        state,
+        state.get("_last_sequence_header_bytes"),
+        state.get("_last_sequence_header_next_bit"),
+    ):
+        state["_last_sequence_header_offset"] = this_sequence_header_offset
+        return VideoParameters(state["_last_sequence_header_video_parameters"])
+    ## End not in spec
+
+    record_bitstream_start(state)  ## Not in spec
+
     parse_parameters(state)
 
     base_video_format = read_uint(state)
@@ -199,6 +216,8 @@ def sequence_header(state):
             )
     state["_last_sequence_header_bytes"] = this_sequence_header_bytes
     state["_last_sequence_header_offset"] = this_sequence_header_offset
+    state["_last_sequence_header_next_bit"] = state["next_bit"]
+    state["_last_sequence_header_video_parameters"] = VideoParameters(video_parameters)
     ## End not in spec
 
     return video_parameters
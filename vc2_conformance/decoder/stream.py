@@ -64,6 +64,7 @@ from vc2_conformance.decoder.io import (
     tell,
     byte_align,
     read_uint_lit,
+    read_bytes,
 )
 
 from vc2_conformance.decoder.sequence_header import sequence_header
@@ -179,15 +180,17 @@ def parse_sequence(state):
 @ref_pseudocode
 def auxiliary_data(state):
     """(10.4.4)"""
-    for i in range(1, state["next_parse_offset"] - 12):
-        read_uint_lit(state, 1)
+    ### for i in range(1, state["next_parse_offset"] - 12):
+    ###     read_uint_lit(state, 1)
+    read_bytes(state, state["next_parse_offset"] - 13)  ## Not in spec
 
 
 @ref_pseudocode
 def padding(state):
     """(10.4.5)"""
-    for i in range(1, state["next_parse_offset"] - 12):
-        read_uint_lit(state, 1)
+    ### for i in range(1, state["next_parse_offset"] - 12):
+    ###     read_uint_lit(state, 1)
+    read_bytes(state, state["next_parse_offset"] - 13)  ## Not in spec
 
 
 @ref_pseudocode
@@ -14,16 +14,14 @@ from vc2_conformance.pseudocode.arrays import (
     new_array,
     width,
     height,
+    NumPyArray2D,
 )
 
 from vc2_conformance.pseudocode.slice_sizes import (
     subband_width,
     subband_height,
     slice_bytes,
-    slice_left,
-    slice_right,
-    slice_top,
-    slice_bottom,
+    get_slice_geometry,
 )
 
 from vc2_conformance.pseudocode.parse_code_functions import (
@@ -39,6 +37,7 @@ from vc2_conformance.decoder.assertions import assert_level_constraint
 from vc2_conformance.decoder.io import (
     tell,
     read_uint_lit,
+    read_bytes,
     read_nbits,
     read_sintb,
     flush_inputb,
@@ -49,6 +48,7 @@ from vc2_conformance.pseudocode.quantization import inverse_quant
 __all__ = [
     "initialize_wavelet_data",
     "dc_prediction",
+    "wavefront_dc_prediction",
     "transform_data",
     "slice",
     "ld_slice",
@@ -75,9 +75,149 @@ def dc_prediction(band):
             band[y][x] += prediction
 
 
+@ref_pseudocode(deviation="alternative_implementation")
+def wavefront_dc_prediction(band):
+    """
+    (13.4) A vectorised, bit-exact, equivalent of :py:func:`dc_prediction`.
+
+    Each predicted value depends only on its (already predicted) left,
+    up-left and up neighbours. As a consequence, all values on the same
+    anti-diagonal (i.e. with the same ``x + y``) may be computed at once
+    given the values on the preceding two anti-diagonals. This
+    implementation processes each anti-diagonal in a single vectorised
+    operation. (The first row and column are computed as cumulative sums.)
+
+    Parameters
+    ==========
+    band : [[int, ...], ...] or :py:class:`~vc2_conformance.pseudocode.arrays.NumPyArray2D`
+        The band to be modified in-place.
+    """
+    # NB: Imported here since NumPy is comparatively slow to import and is only
+    # needed when wavefront DC prediction is used.
+    import numpy as np
+
+    if isinstance(band, NumPyArray2D):
+        values = np.ascontiguousarray(band.ndarray)
+    else:
+        try:
+            values = np.array(band, dtype=np.int64)
+        except OverflowError:
+            values = None
+
+        # Predicted values may grow by (at most) the largest input magnitude
+        # on every anti-diagonal. Native integers are only used when the sum
+        # of three such values cannot overflow, otherwise Python integers are
+        # used.
+        if values is None or (
+            values.size
+            and 3 * max(-int(values.min()), int(values.max())) * sum(values.shape)
+            >= (1 << 63) - 1
+        ):
+            values = np.array(band, dtype=object)
+
+    if values.size == 0:
+        return
+
+    h, w = values.shape
+
+    values[0, :] = np.cumsum(values[0, :])
+    values[:, 0] = np.cumsum(values[:, 0])
+
+    # NB: A flat view is used so that each anti-diagonal (and its neighbours)
+    # may be indexed using a single array of indices.
+    flat = values.reshape(-1)
+    for d in range(2, h + w - 1):
+        ys = np.arange(max(1, d - w + 1), min(h - 1, d - 1) + 1)
+        indices = (ys * w) + (d - ys)
+        # NB: (a + b + c + 1) // 3 is equivalent to mean(a, b, c)
+        flat[indices] += (
+            flat[indices - 1] + flat[indices - w - 1] + flat[indices - w] + 1
+        ) // 3
+
+    if isinstance(band, NumPyArray2D):
+        if values is not band.ndarray:
+            band.ndarray[...] = values
+    else:
+        for y, row in enumerate(values.tolist()):
+            band[y][:] = row
+
+
+def select_dc_prediction(state):
+    """
+    Not in spec. Return the DC prediction function to use:
+    :py:func:`wavefront_dc_prediction` if the ``_use_wavefront_dc_prediction``
+    state entry is True and :py:func:`dc_prediction` otherwise. Both functions
+    produce identical results.
+    """
+    if state.get("_use_wavefront_dc_prediction", False):
+        return wavefront_dc_prediction
+    else:
+        return dc_prediction
+
+
+def wavelet_data_buffer_key(state, comp):
+    """
+    Not in spec. Return a key describing the arrays which
+    :py:func:`initialize_wavelet_data` would produce for the given state and
+    component: the transform depths and the dimensions of every subband.
+    """
+    return (
+        state["dwt_depth"],
+        state["dwt_depth_ho"],
+        tuple(
+            (subband_height(state, level, comp), subband_width(state, level, comp))
+            for level in range(state["dwt_depth_ho"] + state["dwt_depth"] + 1)
+        ),
+    )
+
+
+def reuse_wavelet_data(state, comp):
+    """
+    Not in spec. Return the transform data arrays most recently produced by
+    :py:func:`initialize_wavelet_data` for the specified component, cleared
+    ready for re-use, or None if these cannot be reused.
+
+    Arrays are only reused when the transform depths and subband dimensions
+    are unchanged. Arrays which have become part of ``current_picture`` (which
+    happens when no wavelet transform levels are used) are never reused.
+    """
+    if comp not in state.get("_transform_buffers", {}):
+        return None
+
+    key, coeff_data = state["_transform_buffers"][comp]
+    if key != wavelet_data_buffer_key(state, comp):
+        return None
+
+    bands = [band for orients in coeff_data.values() for band in orients.values()]
+
+    picture_arrays = list(state.get("current_picture", {}).values())
+    if any(band is array for band in bands for array in picture_arrays):
+        return None
+
+    for band in bands:
+        empty_row = [None] * width(band)
+        for row in band:
+            row[:] = empty_row
+
+    return coeff_data
+
+
 @ref_pseudocode(deviation="inferred_implementation")
 def initialize_wavelet_data(state, comp):
-    """(13.2.2) Return a ready-to-fill array of transform data arrays."""
+    """
+    (13.2.2) Return a ready-to-fill array of transform data arrays.
+
+    Not in spec: to avoid allocating new arrays for every picture, the arrays
+    returned are recorded in ``state["_transform_buffers"]`` and are reused
+    by later calls when the transform dimensions are unchanged (see
+    :py:func:`reuse_wavelet_data`).
+    """
+    ## Begin not in spec
+    out = reuse_wavelet_data(state, comp)
+    if out is not None:
+        return out
+    ## End not in spec
+
     out = {}
 
     if state["dwt_depth_ho"] == 0:
@@ -109,6 +249,13 @@ def initialize_wavelet_data(state, comp):
             )
             for orient in ["HL", "LH", "HH"]
         }
+
+    ## Begin not in spec
+    if "_transform_buffers" not in state:
+        state["_transform_buffers"] = {}
+    state["_transform_buffers"][comp] = (wavelet_data_buffer_key(state, comp), out)
+    ## End not in spec
+
     return out
 
 
@@ -122,6 +269,7 @@ def transform_data(state):
         for sx in range(state["slices_x"]):
             slice(state, sx, sy)
     if using_dc_prediction(state):
+        dc_prediction = select_dc_prediction(state)  ## Not in spec
         if state["dwt_depth_ho"] == 0:
             dc_prediction(state["y_transform"][0]["LL"])
             dc_prediction(state["c1_transform"][0]["LL"])
@@ -213,7 +361,8 @@ def hq_slice(state, sx, sy):
     """(13.5.4)"""
     byte_offset_start = tell(state)[0]  ## Not in spec
 
-    read_uint_lit(state, state["slice_prefix_bytes"])
+    ### read_uint_lit(state, state["slice_prefix_bytes"])
+    read_bytes(state, state["slice_prefix_bytes"])  ## Not in spec
 
     qindex = read_uint_lit(state, 1)
     # Errata: none of the levels currently restrict the qindex
@@ -297,10 +446,11 @@ def slice_band(state, transform, level, orient, sx, sy):
     # These values evaulated in the loop definition in the spec, moving them
     # here saves a lot of computation
     ## Begin not in spec
-    y1 = slice_top(state, sy, comp, level)
-    y2 = slice_bottom(state, sy, comp, level)
-    x1 = slice_left(state, sx, comp, level)
-    x2 = slice_right(state, sx, comp, level)
+    geometry = get_slice_geometry(state)
+    y1 = geometry.slice_top(sy, comp, level)
+    y2 = geometry.slice_bottom(sy, comp, level)
+    x1 = geometry.slice_left(sx, comp, level)
+    x2 = geometry.slice_right(sx, comp, level)
     ## End not in spec
 
     ### for y in range(slice_top(state, sy,comp,level), slice_bottom(state, sy,comp,level)):
@@ -319,10 +469,11 @@ def color_diff_slice_band(state, level, orient, sx, sy):
     # These values evaulated in the loop definition in the spec, moving them
     # here saves a lot of computation
     ## Begin not in spec
-    y1 = slice_top(state, sy, "C1", level)
-    y2 = slice_bottom(state, sy, "C1", level)
-    x1 = slice_left(state, sx, "C1", level)
-    x2 = slice_right(state, sx, "C1", level)
+    geometry = get_slice_geometry(state)
+    y1 = geometry.slice_top(sy, "C1", level)
+    y2 = geometry.slice_bottom(sy, "C1", level)
+    x1 = geometry.slice_left(sx, "C1", level)
+    x2 = geometry.slice_right(sx, "C1", level)
     ## End not in spec
 
     ### for y in range(slice_top(state,sy,"C1",level), slice_bottom(state,sy,"C1",level)):
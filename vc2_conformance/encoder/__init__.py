@@ -108,6 +108,12 @@ Sequence generation
 .. automodule:: vc2_conformance.encoder.sequence
 
 
+Picture encoding cache
+----------------------
+
+.. automodule:: vc2_conformance.encoder.picture_cache
+
+
 Level constraints
 -----------------
 
@@ -152,5 +158,8 @@ from vc2_conformance.encoder.sequence_header import *
 # Picture compression
 from vc2_conformance.encoder.pictures import *
 
+# Caching of compressed pictures
+from vc2_conformance.encoder.picture_cache import *
+
 # Complete sequence assembly
 from vc2_conformance.encoder.sequence import *
@@ -0,0 +1,331 @@
+"""
+The :py:mod:`vc2_conformance.encoder.picture_cache` module provides an
+optional cache for the (slow) picture compression process carried out by
+:py:func:`~vc2_conformance.encoder.pictures.make_picture_data_units`.
+
+Many test case generators encode identical pictures many times over. For
+example, repeated pictures within a sequence or the same set of pictures
+encoded with several different ``slice_size_scaler`` values. A
+:py:class:`PictureCache` avoids repeating this work by storing the encoded
+data units, indexed by a hash of the picture content, the
+:py:class:`~vc2_conformance.codec_features.CodecFeatures`, the encoder
+options used and the version of this software.
+
+.. autoclass:: PictureCache
+    :members:
+
+By default no cache is used. A cache may be passed explicitly to
+:py:func:`~vc2_conformance.encoder.sequence.make_sequence` using its
+``picture_cache`` argument, or a process-wide default cache may be set using
+the functions below. This latter option allows caching to be enabled for all
+test case generators without modification.
+
+.. autofunction:: set_default_picture_cache
+
+.. autofunction:: get_default_picture_cache
+
+"""
+
+import os
+
+import pickle
+
+import hashlib
+
+import tempfile
+
+from functools import partial
+
+from collections import OrderedDict
+
+from vc2_conformance.version import __version__
+
+from vc2_conformance.py2x_compat import makedirs, zip
+
+from vc2_conformance.encoder.pictures import make_picture_data_units_for_map
+
+__all__ = [
+    "PictureCache",
+    "set_default_picture_cache",
+    "get_default_picture_cache",
+]
+
+
+def canonical_repr(value):
+    """
+    For internal use. Produce a deterministic string representation of a
+    (possibly nested) structure of dictionaries, lists and scalar values
+    suitable for hashing.
+
+    Dictionary entries are sorted by key and :py:class:`~enum.IntEnum` values
+    are represented by their integer values.
+    """
+    if isinstance(value, dict):
+        return "{{{}}}".format(
+            ",".join(
+                "{}:{}".format(canonical_repr(k), canonical_repr(v))
+                for k, v in sorted(value.items(), key=lambda kv: repr(kv[0]))
+            )
+        )
+    elif isinstance(value, (list, tuple)):
+        return "[{}]".format(",".join(canonical_repr(v) for v in value))
+    elif isinstance(value, bool) or value is None:
+        return repr(value)
+    elif isinstance(value, int):
+        return repr(int(value))
+    else:
+        return repr(value)
+
+
+def set_picture_number(data_units, pic_num):
+    """
+    For internal use. Set the picture number of a series of picture or
+    fragment data units (as produced by
+    :py:func:`~vc2_conformance.encoder.pictures.make_picture_data_units`).
+    """
+    for data_unit in data_units:
+        if "picture_parse" in data_unit:
+            data_unit["picture_parse"]["picture_header"]["picture_number"] = pic_num
+        else:
+            data_unit["fragment_parse"]["fragment_header"]["picture_number"] = pic_num
+
+
+class PictureCache(object):
+    """
+    A content-addressed cache of encoded pictures.
+
+    Encoded pictures are kept in an in-memory least-recently-used (LRU) cache
+    and, optionally, also written to a directory on disk. The on-disk cache
+    may be shared between processes (e.g. parallel test case generator
+    workers) and persists between runs.
+
+    Parameters
+    ==========
+    max_entries : int
+        The maximum number of encoded pictures to hold in memory. The least
+        recently used entry is discarded when this limit is exceeded.
+    directory : str or None
+        If not None, the directory in which to store the on-disk cache. Will
+        be created if it does not exist.
+
+    Attributes
+    ==========
+    hits : int
+        The number of lookups satisfied by the cache.
+    misses : int
+        The number of lookups which required a picture to be encoded.
+    """
+
+    def __init__(self, max_entries=32, directory=None):
+        self.max_entries = max_entries
+        self.directory = directory
+
+        self.hits = 0
+        self.misses = 0
+
+        # {key: pickled [DataUnit, ...], ...} in least-recently-used order
+        self._entries = OrderedDict()
+
+        if self.directory is not None:
+            makedirs(self.directory, exist_ok=True)
+
+    def get_key(
+        self,
+        codec_features,
+        picture,
+        minimum_qindex=0,
+        minimum_slice_size_scaler=1,
+    ):
+        """
+        Compute the cache key (a hexadecimal string) for a particular picture
+        encoding request.
+
+        The key covers the picture's sample values, all codec features (except
+        ``name``, which does not affect the encoding), encoder options and the
+        version of this software (since the encoder's output may change
+        between versions). The picture number (``pic_num``) is not included
+        since this is filled in after encoding.
+        """
+        h = hashlib.sha256()
+        h.update(__version__.encode("utf-8"))
+        h.update(
+            canonical_repr(
+                {
+                    name: value
+                    for name, value in codec_features.items()
+                    if name != "name"
+                }
+            ).encode("utf-8")
+        )
+        h.update(
+            canonical_repr([minimum_qindex, minimum_slice_size_scaler]).encode("utf-8")
+        )
+        for component in ["Y", "C1", "C2"]:
+            # NB: The picture (a nested list of ints) is usually by far the
+            # largest input so the (fast) built-in repr is used directly.
+            h.update(repr(picture[component]).encode("utf-8"))
+        return h.hexdigest()
+
+    def _get_filename(self, key):
+        return os.path.join(self.directory, "{}.pickle".format(key))
+
+    def _load(self, key):
+        """
+        Return the pickled data units for a key, or None if not cached.
+        """
+        if key in self._entries:
+            # Mark as most recently used
+            data = self._entries.pop(key)
+            self._entries[key] = data
+            return data
+
+        if self.directory is not None:
+            try:
+                with open(self._get_filename(key), "rb") as f:
+                    data = f.read()
+            except (IOError, OSError):
+                return None
+            self._store_in_memory(key, data)
+            return data
+
+        return None
+
+    def _store_in_memory(self, key, data):
+        self._entries[key] = data
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _store(self, key, data):
+        self._store_in_memory(key, data)
+
+        if self.directory is not None:
+            # NB: Written to a temporary file and then renamed so that other
+            # processes sharing the cache never observe a partial file.
+            fd, temp_filename = tempfile.mkstemp(dir=self.directory)
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            try:
+                os.rename(temp_filename, self._get_filename(key))
+            except OSError:
+                # Another process got there first (e.g. on Windows where
+                # rename won't replace an existing file).
+                os.remove(temp_filename)
+
+    def make_picture_data_units(
+        self,
+        codec_features,
+        picture,
+        minimum_qindex=0,
+        minimum_slice_size_scaler=1,
+    ):
+        """
+        A cached equivalent of
+        :py:func:`vc2_conformance.encoder.pictures.make_picture_data_units`.
+
+        A fresh copy of the data units is returned on every call so callers
+        may freely modify the result.
+        """
+        return self.map_picture_data_units(
+            codec_features,
+            [(picture, minimum_qindex)],
+            minimum_slice_size_scaler,
+        )[0]
+
+    def map_picture_data_units(
+        self,
+        codec_features,
+        pictures_and_minimum_qindices,
+        minimum_slice_size_scaler=1,
+        map_function=map,
+    ):
+        """
+        Equivalent to calling :py:meth:`make_picture_data_units` for each
+        ``(picture, minimum_qindex)`` pair given, returning a list of the
+        results.
+
+        Pictures not found in the cache are compressed using ``map_function``
+        (e.g. the ``map`` method of a :py:class:`multiprocessing.pool.Pool`)
+        allowing them to be compressed in parallel. Identical pictures are
+        only compressed once.
+        """
+        keys = [
+            self.get_key(
+                codec_features, picture, minimum_qindex, minimum_slice_size_scaler
+            )
+            for picture, minimum_qindex in pictures_and_minimum_qindices
+        ]
+
+        # {key: pickled [DataUnit, ...], ...}
+        data = {}
+        # {key: (picture, minimum_qindex), ...} for pictures to be compressed
+        to_compress = OrderedDict()
+        for key, (picture, minimum_qindex) in zip(keys, pictures_and_minimum_qindices):
+            if key in data or key in to_compress:
+                self.hits += 1
+                continue
+
+            cached = self._load(key)
+            if cached is not None:
+                self.hits += 1
+                data[key] = cached
+            else:
+                self.misses += 1
+                to_compress[key] = (
+                    {component: picture[component] for component in ["Y", "C1", "C2"]},
+                    minimum_qindex,
+                )
+
+        if to_compress:
+            compressed = map_function(
+                partial(
+                    make_picture_data_units_for_map,
+                    codec_features,
+                    minimum_slice_size_scaler,
+                ),
+                list(to_compress.values()),
+            )
+            for key, data_units in zip(to_compress, compressed):
+                data[key] = pickle.dumps(data_units, pickle.HIGHEST_PROTOCOL)
+                self._store(key, data[key])
+
+        out = []
+        for key, (picture, _) in zip(keys, pictures_and_minimum_qindices):
+            data_units = pickle.loads(data[key])
+            if "pic_num" in picture:
+                set_picture_number(data_units, picture["pic_num"])
+            out.append(data_units)
+
+        return out
+
+    def clear(self):
+        """
+        Discard all in-memory cache entries. The on-disk cache (if used) is
+        left unchanged.
+        """
+        self._entries.clear()
+
+
+_default_picture_cache = None
+"""
+The :py:class:`PictureCache` used by
+:py:func:`~vc2_conformance.encoder.sequence.make_sequence` when no cache is
+explicitly given, or None.
+"""
+
+
+def set_default_picture_cache(picture_cache):
+    """
+    Set the process-wide default :py:class:`PictureCache` used by
+    :py:func:`~vc2_conformance.encoder.sequence.make_sequence`. Pass None to
+    disable caching (the default).
+    """
+    global _default_picture_cache
+    _default_picture_cache = picture_cache
+
+
+def get_default_picture_cache():
+    """
+    Return the process-wide default :py:class:`PictureCache` or None if not
+    set.
+    """
+    return _default_picture_cache
@@ -88,7 +88,9 @@ example for computing slice dimensions.
 
 """
 
-from itertools import count
+import numpy as np
+
+from itertools import count, chain
 
 from collections import namedtuple
 
@@ -122,10 +124,7 @@ from vc2_conformance.level_constraints import LEVEL_CONSTRAINTS
 
 from vc2_conformance.pseudocode.slice_sizes import (
     slice_bytes,
-    slice_left,
-    slice_right,
-    slice_top,
-    slice_bottom,
+    get_slice_geometry,
 )
 
 from vc2_conformance.pseudocode.quantization import forward_quant
@@ -214,6 +213,39 @@ def apply_dc_prediction(band):
             band[y][x] -= prediction
 
 
+@ref_pseudocode(deviation="inferred_implementation")
+def apply_dc_prediction_vectorised(band):
+    """
+    (13.4) A vectorised, bit-exact, equivalent of
+    :py:func:`apply_dc_prediction`.
+
+    Since :py:func:`apply_dc_prediction` computes every prediction from the
+    original (unmodified) values of its left, up-left and up neighbours, all
+    predictions can be computed simultaneously.
+    """
+    if len(band) == 0 or len(band[0]) == 0:
+        return
+
+    # Use native integers when sums of three values cannot overflow (see
+    # calculate_coeffs_bits_vectorised), falling back on Python integers
+    # otherwise.
+    try:
+        values = np.array(band, dtype=np.int64)
+    except OverflowError:
+        values = None
+    if values is None or values.min() <= -(1 << 61) or values.max() >= (1 << 61):
+        values = np.array(band, dtype=object)
+
+    prediction = np.zeros_like(values)
+    prediction[0, 1:] = values[0, :-1]
+    prediction[1:, 0] = values[:-1, 0]
+    # NB: (a + b + c + 1) // 3 is equivalent to mean(a, b, c)
+    prediction[1:, 1:] = (values[1:, :-1] + values[:-1, :-1] + values[:-1, 1:] + 1) // 3
+
+    for y, row in enumerate((values - prediction).tolist()):
+        band[y][:] = row
+
+
 def calculate_coeffs_bits(coeffs):
     """
     Calculate the number of bits required to represent the supplied sequence of
@@ -240,6 +272,66 @@ def calculate_coeffs_bits(coeffs):
     return num_bits
 
 
+def calculate_coeffs_bits_vectorised(coeff_sets):
+    """
+    A vectorised equivalent of calling :py:func:`calculate_coeffs_bits` on
+    each of a series of coefficient sets.
+
+    The signed exp-golomb code lengths of every coefficient are computed in a
+    single array operation and then summed for each set (excluding trailing
+    zeros).
+
+    Parameters
+    ==========
+    coeff_sets : [[int, ...], ...]
+
+    Returns
+    =======
+    num_bits : :py:class:`numpy.ndarray`
+        A 1D array giving the number of bits required for each set of
+        coefficients.
+    """
+    counts = np.array([len(coeffs) for coeffs in coeff_sets], dtype=np.intp)
+    if len(counts) == 0:
+        return np.zeros(0, dtype=np.int64)
+
+    try:
+        values = np.fromiter(
+            chain.from_iterable(coeff_sets),
+            dtype=np.int64,
+            count=int(counts.sum()),
+        )
+    except OverflowError:
+        values = None
+    if values is None or (
+        len(values) and (values.min() <= -(1 << 62) or values.max() >= (1 << 62))
+    ):
+        # Values too large to be processed without overflow; fall back on
+        # pure Python implementation.
+        return np.array(
+            [calculate_coeffs_bits(coeffs) for coeffs in coeff_sets],
+            dtype=object,
+        )
+
+    # Compute signed exp-golomb lengths (see
+    # vc2_conformance.bitstream.exp_golomb) using an exact (integer-only)
+    # computation of (abs(value) + 1).bit_length().
+    powers_of_two = np.left_shift(np.int64(1), np.arange(63, dtype=np.int64))
+    bit_lengths = np.searchsorted(powers_of_two, np.abs(values) + 1, side="right")
+    lengths = (bit_lengths * 2) - 1 + (values != 0)
+
+    # Find the end of each coefficient set, excluding trailing zeros
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    ends = starts.copy()
+    set_indices = np.repeat(np.arange(len(counts)), counts)
+    nonzero = np.flatnonzero(values)
+    np.maximum.at(ends, set_indices[nonzero], nonzero + 1)
+
+    cumulative_lengths = np.concatenate(([0], np.cumsum(lengths)))
+
+    return cumulative_lengths[ends] - cumulative_lengths[starts]
+
+
 def calculate_hq_length_field(coeffs, slice_size_scaler):
     """
     Compute a HQ picture slice length field for a set of coefficients.
@@ -347,6 +439,32 @@ def quantize_to_fit(target_size, coeff_sets, align_bits=1, minimum_qindex=0):
             return (qindex, quantized_coeff_sets)
 
 
+def coeffs_to_array(coeffs, dtype):
+    """
+    For internal use. Convert a 2D array of transform coefficients into a
+    NumPy array of the specified dtype. Falls back on a ``dtype=object`` array
+    when any value lies outside the range of ``dtype`` (as may happen for
+    out-of-range input pictures).
+    """
+    if dtype == object:
+        return np.array(coeffs, dtype=object)
+
+    # NB: The range is checked explicitly since (unlike newer versions) older
+    # versions of NumPy silently wrap out-of-range values when converting to a
+    # narrower integer type.
+    try:
+        values = np.array(coeffs, dtype=np.int64)
+    except OverflowError:
+        values = None
+    info = np.iinfo(dtype)
+    if values is None or (
+        values.size and (values.min() < info.min or values.max() > info.max)
+    ):
+        return np.array(coeffs, dtype=object)
+    else:
+        return values.astype(dtype)
+
+
 def transform_and_slice_picture(codec_features, picture):
     """
     Transform a picture provided using a forward DWT and DC prediction
@@ -388,13 +506,13 @@ def transform_and_slice_picture(codec_features, picture):
     # Perform DC prediction
     if codec_features["profile"] == Profiles.low_delay:
         if state["dwt_depth_ho"] == 0:
-            apply_dc_prediction(state["y_transform"][0]["LL"])
-            apply_dc_prediction(state["c1_transform"][0]["LL"])
-            apply_dc_prediction(state["c2_transform"][0]["LL"])
+            apply_dc_prediction_vectorised(state["y_transform"][0]["LL"])
+            apply_dc_prediction_vectorised(state["c1_transform"][0]["LL"])
+            apply_dc_prediction_vectorised(state["c2_transform"][0]["LL"])
         else:
-            apply_dc_prediction(state["y_transform"][0]["L"])
-            apply_dc_prediction(state["c1_transform"][0]["L"])
-            apply_dc_prediction(state["c2_transform"][0]["L"])
+            apply_dc_prediction_vectorised(state["y_transform"][0]["L"])
+            apply_dc_prediction_vectorised(state["c1_transform"][0]["L"])
+            apply_dc_prediction_vectorised(state["c2_transform"][0]["L"])
 
     # Load quantisation matrix
     state["quant_matrix"] = get_quantization_marix(codec_features)
@@ -414,9 +532,17 @@ def transform_and_slice_picture(codec_features, picture):
         for _ in range(state["slices_y"])
     ]
 
+    geometry = get_slice_geometry(state)
+
+    # NB: Coefficients are gathered into slices by slicing NumPy arrays. Since
+    # the coefficients are converted back into Python integers when added to
+    # the slices, int64 arrays are used (falling back on Python integers for
+    # out-of-range values) rather than the narrowest possible dtype.
+
     # NB: Iteration order for level and orient are critical here
     for transform in ["y_transform", "c1_transform", "c2_transform"]:
         comp = transform.split("_")[0].upper()
+
         for level, orients in sorted(state[transform].items()):
             for orient, coeffs in sorted(
                 orients.items(),
@@ -424,31 +550,22 @@ def transform_and_slice_picture(codec_features, picture):
                     orient_coeffs[0]
                 ),
             ):
+                coeffs = coeffs_to_array(coeffs, np.int64)
 
-                sxs = [
-                    (
-                        slice_left(state, sx, comp, level),
-                        slice_right(state, sx, comp, level),
-                    )
-                    for sx in range(state["slices_x"])
-                ]
-                sys = [
-                    (
-                        slice_top(state, sy, comp, level),
-                        slice_bottom(state, sy, comp, level),
-                    )
-                    for sy in range(state["slices_y"])
-                ]
+                quant_matrix_value = state["quant_matrix"][level][orient]
+
+                x_bounds = geometry.x_bounds[(comp, level)]
+                y_bounds = geometry.y_bounds[(comp, level)]
+                sxs = list(zip(x_bounds[:-1], x_bounds[1:]))
+                sys = list(zip(y_bounds[:-1], y_bounds[1:]))
 
                 for sy, (y1, y2) in enumerate(sys):
                     for sx, (x1, x2) in enumerate(sxs):
-                        for y in range(y1, y2):
-                            for x in range(x1, x2):
-                                sc = getattr(slice_coeffs[sy][sx], comp)
-                                sc.coeff_values.append(coeffs[y][x])
-                                sc.quant_matrix_values.append(
-                                    state["quant_matrix"][level][orient]
-                                )
+                        sc = getattr(slice_coeffs[sy][sx], comp)
+                        sc.coeff_values.extend(coeffs[y1:y2, x1:x2].ravel().tolist())
+                        sc.quant_matrix_values.extend(
+                            [quant_matrix_value] * ((y2 - y1) * (x2 - x1))
+                        )
 
     return slice_coeffs
 
@@ -542,46 +659,54 @@ def make_transform_data_hq_lossless(transform_coeffs, minimum_slice_size_scaler=
     slice_size_scaler : int
     transform_data : :py:class:`vc2_conformance.bitstream.TransformData`
     """
-    # Initially, the slice_size_scaler is assumed to be 1. If any of the length
-    # fields which result are > 255 we will need to revise this, along with all
-    # of the length values.
+    transform_coeffs_slices = [
+        transform_coeffs_slice
+        for transform_coeffs_row in transform_coeffs
+        for transform_coeffs_slice in transform_coeffs_row
+    ]
+
+    # Compute the number of bits required for every slice component in one go
+    # (see calculate_coeffs_bits_vectorised).
+    #
+    # [y_bits, c1_bits, c2_bits]
+    component_bits = [
+        calculate_coeffs_bits_vectorised(
+            [
+                getattr(transform_coeffs_slice, component).coeff_values
+                for transform_coeffs_slice in transform_coeffs_slices
+            ]
+        )
+        for component in ["Y", "C1", "C2"]
+    ]
+
+    # Find the minimum slice size scaler possible such that no length field
+    # exceeds 255
+    max_bytes = (int(max(bits.max() for bits in component_bits)) + 7) // 8
+    slice_size_scaler = max(1, minimum_slice_size_scaler, (max_bytes + 254) // 255)
+
+    # Compute the length fields (c.f. calculate_hq_length_field)
+    multiple = 8 * slice_size_scaler
+    y_lengths, c1_lengths, c2_lengths = [
+        (bits + multiple - 1) // multiple for bits in component_bits
+    ]
+
     transform_data = TransformData(
         hq_slices=[
-            make_hq_slice(
-                transform_coeffs_slice.Y.coeff_values,
-                transform_coeffs_slice.C1.coeff_values,
-                transform_coeffs_slice.C2.coeff_values,
-                total_length=None,
+            HQSlice(
                 qindex=0,
-                slice_size_scaler=1,
+                slice_y_length=int(y_length),
+                slice_c1_length=int(c1_length),
+                slice_c2_length=int(c2_length),
+                y_transform=transform_coeffs_slice.Y.coeff_values,
+                c1_transform=transform_coeffs_slice.C1.coeff_values,
+                c2_transform=transform_coeffs_slice.C2.coeff_values,
+            )
+            for transform_coeffs_slice, y_length, c1_length, c2_length in zip(
+                transform_coeffs_slices, y_lengths, c1_lengths, c2_lengths
             )
-            for transform_coeffs_row in transform_coeffs
-            for transform_coeffs_slice in transform_coeffs_row
         ]
     )
 
-    # Find the minimum slice size scaler possible
-    max_length = max(
-        max(
-            hq_slice["slice_y_length"],
-            hq_slice["slice_c1_length"],
-            hq_slice["slice_c2_length"],
-        )
-        for hq_slice in transform_data["hq_slices"]
-    )
-    slice_size_scaler = max(1, minimum_slice_size_scaler, (max_length + 254) // 255)
-
-    # Adjust slice lengths accordingly
-    for hq_slice in transform_data["hq_slices"]:
-        hq_slice["slice_y_length"] += slice_size_scaler - 1
-        hq_slice["slice_y_length"] //= slice_size_scaler
-
-        hq_slice["slice_c1_length"] += slice_size_scaler - 1
-        hq_slice["slice_c1_length"] //= slice_size_scaler
-
-        hq_slice["slice_c2_length"] += slice_size_scaler - 1
-        hq_slice["slice_c2_length"] //= slice_size_scaler
-
     return slice_size_scaler, transform_data
 
 
@@ -1226,3 +1351,20 @@ def make_picture_data_units(
         return make_fragment_parse_data_units(
             codec_features, picture, minimum_qindex, minimum_slice_size_scaler
         )
+
+
+def make_picture_data_units_for_map(
+    codec_features,
+    minimum_slice_size_scaler,
+    picture_and_minimum_qindex,
+):
+    """
+    For internal use. A wrapper around :py:func:`make_picture_data_units`
+    which takes the picture and minimum qindex as a single ``(picture,
+    minimum_qindex)`` tuple, as required by :py:func:`map`-like functions
+    (e.g. :py:meth:`multiprocessing.pool.Pool.map`).
+    """
+    picture, minimum_qindex = picture_and_minimum_qindex
+    return make_picture_data_units(
+        codec_features, picture, minimum_qindex, minimum_slice_size_scaler
+    )
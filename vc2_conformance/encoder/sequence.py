@@ -9,11 +9,20 @@ main entry point to the encoder.
 
 .. autofunction:: make_sequence
 
+For long sequences, the following alternatives produce (and serialise) a
+sequence incrementally, compressing pictures only as they are needed:
+
+.. autofunction:: iter_sequence_data_units
+
+.. autofunction:: make_and_serialise_sequence
+
 """
 
+import multiprocessing
+
 from functools import partial
 
-from itertools import repeat
+from itertools import repeat, islice
 
 from vc2_data_tables import ParseCodes
 
@@ -27,6 +36,7 @@ from vc2_conformance.bitstream import (
     ParseInfo,
     Padding,
     AuxiliaryData,
+    autofill_and_serialise_data_units,
 )
 
 from vc2_conformance.symbol_re import make_matching_sequence, ImpossibleSequenceError
@@ -35,11 +45,15 @@ from vc2_conformance.encoder.exceptions import IncompatibleLevelAndDataUnitError
 
 from vc2_conformance.encoder.sequence_header import make_sequence_header_data_unit
 
-from vc2_conformance.encoder.pictures import make_picture_data_units
+from vc2_conformance.encoder.pictures import make_picture_data_units_for_map
+
+from vc2_conformance.encoder.picture_cache import get_default_picture_cache
 
 
 __all__ = [
     "make_sequence",
+    "iter_sequence_data_units",
+    "make_and_serialise_sequence",
 ]
 
 
@@ -119,6 +133,23 @@ def make_sequence(codec_features, pictures, *data_unit_patterns, **kwargs):
 
         Only has an effect on high quality profile coding modes, will be
         ignored for the low delay profile modes.
+    picture_cache : :py:class:`~vc2_conformance.encoder.picture_cache.PictureCache` or None
+        Keyword-only argument. If given, the cache to use to avoid
+        re-encoding previously encoded pictures. Defaults to the cache set by
+        :py:func:`~vc2_conformance.encoder.picture_cache.set_default_picture_cache`
+        (by default, no cache is used).
+    workers : int
+        Keyword-only argument. Default 1. The number of pictures to compress
+        concurrently. When greater than 1 (and no ``executor`` is given),
+        pictures are compressed in a :py:class:`multiprocessing.pool.Pool` of
+        this many processes.
+    executor : object with a ``map(fn, iterable)`` method or None
+        Keyword-only argument. If given, an executor (for example a
+        :py:class:`multiprocessing.pool.Pool` or
+        :py:class:`concurrent.futures.ProcessPoolExecutor`) used to compress
+        pictures concurrently. Pictures are submitted in batches of
+        ``workers`` pictures (or, if ``workers`` is not given, the number of
+        CPUs) and are always returned in order.
 
     Returns
     =======
@@ -134,29 +165,148 @@ def make_sequence(codec_features, pictures, *data_unit_patterns, **kwargs):
         Raised if a sequence could not be generated according to the
         requirements given.
     """
+    return Sequence(
+        data_units=list(
+            iter_sequence_data_units(
+                codec_features, list(pictures), *data_unit_patterns, **kwargs
+            )
+        )
+    )
+
+
+def iter_sequence_data_units(codec_features, pictures, *data_unit_patterns, **kwargs):
+    """
+    A generator version of :py:func:`make_sequence` which produces the
+    :py:class:`~vc2_conformance.bitstream.DataUnit` objects of a sequence one
+    at a time. Pictures are read from ``pictures`` and compressed only as they
+    are needed meaning that at most one compressed picture (or ``workers``
+    pictures, when compressing pictures in parallel) is held in memory at any
+    one time.
+
+    Takes the same arguments as :py:func:`make_sequence` plus the following:
+
+    Parameters
+    ==========
+    pictures : iterable of {"Y": [[s, ...], ...], "C1": ..., "C2": ..., "pic_num": int}
+        The pictures to be encoded. May be a lazily evaluated iterator (e.g. a
+        generator).
+    num_pictures : int
+        Keyword-only argument. The number of pictures in ``pictures``. Since
+        the arrangement of data units in a sequence can depend on the total
+        number of pictures, this must be known in advance. May be omitted if
+        ``pictures`` supports :py:func:`len`.
+    """
     minimum_qindices = kwargs.pop("minimum_qindex", 0)
     minimum_slice_size_scaler = kwargs.pop("minimum_slice_size_scaler", 1)
+    picture_cache = kwargs.pop("picture_cache", None)
+    workers = kwargs.pop("workers", None)
+    executor = kwargs.pop("executor", None)
+    num_pictures = kwargs.pop("num_pictures", None)
     assert not kwargs, "Unexpected arguments: {}".format(kwargs)
 
-    if not isinstance(minimum_qindices, list):
+    if num_pictures is None:
+        num_pictures = len(pictures)
+
+    if isinstance(minimum_qindices, list):
+        num_pictures = min(num_pictures, len(minimum_qindices))
+    else:
         minimum_qindices = repeat(minimum_qindices)
 
-    pictures_only_sequence = Sequence(data_units=[])
-    for picture, minimum_qindex in zip(pictures, minimum_qindices):
-        pictures_only_sequence["data_units"].extend(
-            make_picture_data_units(
+    if picture_cache is None:
+        picture_cache = get_default_picture_cache()
+
+    if workers is None:
+        workers = multiprocessing.cpu_count() if executor is not None else 1
+
+    pool = None
+    if executor is None and workers > 1:
+        executor = pool = multiprocessing.Pool(workers)
+
+    # Pictures are compressed on demand as this generator is consumed
+    compressed_pictures = compress_pictures(
+        codec_features,
+        islice(zip(pictures, minimum_qindices), num_pictures),
+        minimum_slice_size_scaler,
+        picture_cache,
+        executor.map if executor is not None else map,
+        workers,
+    )
+
+    try:
+        for data_unit in make_sequence_data_units(
+            codec_features,
+            compressed_pictures,
+            num_pictures,
+            data_unit_patterns,
+        ):
+            yield data_unit
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+
+def compress_pictures(
+    codec_features,
+    pictures_and_minimum_qindices,
+    minimum_slice_size_scaler,
+    picture_cache,
+    map_function,
+    batch_size,
+):
+    """
+    For internal use. A generator which compresses a series of pictures with
+    :py:func:`~vc2_conformance.encoder.pictures.make_picture_data_units`,
+    yielding the list of data units for each picture in order.
+
+    Pictures are read and compressed in batches of ``batch_size`` using
+    ``map_function`` (e.g. the ``map`` method of a
+    :py:class:`multiprocessing.pool.Pool`), allowing pictures within a batch
+    to be compressed concurrently.
+    """
+    iterator = iter(pictures_and_minimum_qindices)
+    while True:
+        batch = list(islice(iterator, batch_size))
+        if not batch:
+            break
+
+        if picture_cache is not None:
+            compressed = picture_cache.map_picture_data_units(
                 codec_features,
-                picture,
-                minimum_qindex,
+                batch,
                 minimum_slice_size_scaler,
+                map_function,
             )
-        )
+        else:
+            compressed = map_function(
+                partial(
+                    make_picture_data_units_for_map,
+                    codec_features,
+                    minimum_slice_size_scaler,
+                ),
+                batch,
+            )
+
+        for data_units in compressed:
+            yield data_units
+
+
+def make_sequence_data_units(
+    codec_features, compressed_pictures, num_pictures, data_unit_patterns
+):
+    """
+    For internal use. A generator implementing the sequence assembly part of
+    :py:func:`iter_sequence_data_units`, taking an iterator over lists of
+    compressed picture data units.
+    """
+    # Every picture is encoded as the same number and type of data units so
+    # the first picture may be used to determine these for all pictures.
+    picture_data_units = next(compressed_pictures, [])
 
     # Fill in all other required bitstream data units
     picture_only_data_unit_names = [
-        data_unit["parse_info"]["parse_code"].name
-        for data_unit in pictures_only_sequence["data_units"]
-    ]
+        data_unit["parse_info"]["parse_code"].name for data_unit in picture_data_units
+    ] * num_pictures
     try:
         required_data_unit_names = make_matching_sequence(
             picture_only_data_unit_names,
@@ -182,18 +332,46 @@ def make_sequence(codec_features, pictures, *data_unit_patterns, **kwargs):
         "auxiliary_data": make_auxiliary_data_unit,
         "padding_data": make_padding_data_unit,
     }
-    if pictures_only_sequence["data_units"]:
-        picture_parse_code = pictures_only_sequence["data_units"][0]["parse_info"][
-            "parse_code"
-        ]
-        data_unit_makers[picture_parse_code.name] = partial(
-            pictures_only_sequence["data_units"].pop,
-            0,
-        )
 
-    return Sequence(
-        data_units=[
-            data_unit_makers[data_unit_name]()
-            for data_unit_name in required_data_unit_names
-        ]
+    for data_unit_name in required_data_unit_names:
+        if data_unit_name in data_unit_makers:
+            yield data_unit_makers[data_unit_name]()
+        else:
+            if not picture_data_units:
+                picture_data_units = next(compressed_pictures, None)
+                if picture_data_units is None:
+                    raise ValueError(
+                        "Fewer than num_pictures={} pictures provided.".format(
+                            num_pictures
+                        )
+                    )
+            yield picture_data_units.pop(0)
+
+
+def make_and_serialise_sequence(
+    file, codec_features, pictures, *data_unit_patterns, **kwargs
+):
+    """
+    Generate and serialise a complete VC-2 sequence, writing each data unit to
+    the supplied file as soon as it is produced.
+
+    This function is equivalent to serialising the output of
+    :py:func:`make_sequence` using
+    :py:func:`~vc2_conformance.bitstream.vc2_autofill.autofill_and_serialise_stream`
+    but only holds one picture in memory at once making it suitable for
+    producing long sequences.
+
+    Parameters
+    ==========
+    file : file-like object
+        A file open for binary writing. Need not be seekable (e.g. may be a
+        pipe).
+    codec_features, pictures, *data_unit_patterns, **kwargs
+        See :py:func:`iter_sequence_data_units`.
+    """
+    autofill_and_serialise_data_units(
+        file,
+        iter_sequence_data_units(
+            codec_features, pictures, *data_unit_patterns, **kwargs
+        ),
     )
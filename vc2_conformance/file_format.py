@@ -28,16 +28,43 @@ and write picture and metadata files in isolation:
 
 .. autofunction:: write_picture
 
-Finally, the following function may be used to get the filenames for both parts
-of a picture/metadata file pair:
+For large pictures, or where only part of a picture is required, pictures may
+instead be opened as memory-mapped NumPy arrays. In this case picture data is
+only read from disk as it is accessed:
+
+.. autofunction:: open_picture
+
+.. autofunction:: open_picture_data
+
+The following function may be used to get the filenames for both parts of a
+picture/metadata file pair:
 
 .. autofunction:: get_metadata_and_picture_filenames
 
+Picture containers
+------------------
+
+As an alternative to storing every picture as a separate pair of files, a
+series of pictures may be stored in a single picture container file (see
+:ref:`file-format-container`). Picture containers are written and read using
+the following classes:
+
+.. autoclass:: PictureContainerWriter
+    :members:
+
+.. autoclass:: PictureContainerReader
+    :members:
+
+.. autofunction:: is_picture_container
+
+.. autodata:: PICTURE_CONTAINER_EXTENSION
+
 """
 
 import os
 import re
 import json
+import struct
 
 import numpy as np
 
@@ -54,6 +81,8 @@ from vc2_conformance.pseudocode.video_parameters import VideoParameters
 
 from vc2_conformance.dimensions_and_depths import compute_dimensions_and_depths
 
+from vc2_conformance.array_dtypes import compute_stage_dtypes
+
 
 __all__ = [
     "read",
@@ -63,9 +92,42 @@ __all__ = [
     "read_picture",
     "write_metadata",
     "write_picture",
+    "open_picture",
+    "open_picture_data",
+    "PictureContainerWriter",
+    "PictureContainerReader",
+    "is_picture_container",
+    "PICTURE_CONTAINER_EXTENSION",
 ]
 
 
+PICTURE_CONTAINER_EXTENSION = ".vc2pics"
+"""
+The conventional file extension for picture container files.
+"""
+
+PICTURE_CONTAINER_MAGIC = b"VC2PICS1"
+"""
+For internal use. The magic number which appears at both the start and end of
+every picture container file.
+"""
+
+PICTURE_CONTAINER_TRAILER = struct.Struct("<QQQ8s")
+"""
+For internal use. The picture container trailer structure: the offsets of the
+metadata and the index, the number of pictures and the magic number.
+"""
+
+PICTURE_CONTAINER_INDEX_DTYPE = np.dtype(
+    [("offset", "<u8"), ("picture_number", "<u4"), ("format", "<u4")]
+)
+"""
+For internal use. The NumPy dtype of the picture container index entries: the
+offset of the picture data, its picture number and the index of its format in
+the container metadata.
+"""
+
+
 def get_metadata_and_picture_filenames(filename):
     """
     Given either the filename of a saved picture (.raw) or metadata file
@@ -91,6 +153,18 @@ def get_picture_filename_pattern(filename):
     )
 
 
+def get_little_endian_dtype(bytes_per_sample):
+    """
+    For internal use. Return the little-endian unsigned integer NumPy dtype
+    which is ``bytes_per_sample`` bytes wide, or None if NumPy has no native
+    integer type of that width.
+    """
+    if bytes_per_sample in (1, 2, 4, 8):
+        return np.dtype("<u{}".format(bytes_per_sample))
+    else:
+        return None
+
+
 def write(picture, video_parameters, picture_coding_mode, filename):
     """
     Write a picture to a data and metadata file.
@@ -170,16 +244,35 @@ def write_picture(picture, video_parameters, picture_coding_mode, file):
     dims_and_depths = compute_dimensions_and_depths(
         video_parameters, picture_coding_mode
     )
+    stage_dtypes = compute_stage_dtypes(video_parameters, picture_coding_mode)
 
     for (
         component,
         (width, height, depth_bits, bytes_per_sample),
     ) in dims_and_depths.items():
-        # We use native Python integers in a dtype=object array to ensure we
-        # can support arbitrary bit depths.
+        # We use the narrowest integer type which can hold all sample values
+        # for the picture depth. This is always exactly bytes_per_sample bytes
+        # wide and so any out-of-range values wrap around (in two's
+        # complement) exactly as they would when truncated to
+        # bytes_per_sample bytes below. For very large bit depths (or values
+        # which don't fit the native type), native Python integers in a
+        # dtype=object array are used to ensure we can support arbitrary bit
+        # depths.
         #
-        # NB: we make a copy as we will mutate later.
-        values = np.array(picture[component], dtype=object)
+        # NB: we make a copy as we will mutate later. Components held in a
+        # NumPyArray2D are converted directly from the underlying NumPy array.
+        component_values = getattr(picture[component], "ndarray", picture[component])
+        try:
+            values = np.array(component_values, dtype=stage_dtypes[component].samples)
+        except OverflowError:
+            values = np.array(component_values, dtype=object)
+
+        # Fast path: when a native integer type was used, its (little-endian)
+        # in-memory representation is exactly the required file format.
+        native_dtype = get_little_endian_dtype(bytes_per_sample)
+        if values.dtype != object and native_dtype is not None:
+            file.write(values.astype(native_dtype, copy=False).tobytes())
+            continue
 
         # Write as little-endian representation (NB: this rather explicit
         # expansion supports arbitrary depth values beyond those natively
@@ -206,22 +299,49 @@ def write_metadata(picture, video_parameters, picture_coding_mode, file):
         A file open for binary writing.
     """
 
+    metadata = format_to_json(video_parameters, picture_coding_mode)
+    metadata["picture_number"] = str(picture["pic_num"])
+    file.write(json.dumps(metadata).encode("utf-8"))
+
+
+def format_to_json(video_parameters, picture_coding_mode):
+    """
+    For internal use. Return a JSON-serialisable dictionary describing the
+    video parameters and picture coding mode of a picture.
+    """
     # Conversion below is necessary under Python 2.x where IntEnum values are
     # not correctly serialised as integers but instead into invalid JSON.
-    file.write(
-        json.dumps(
-            {
-                "video_parameters": {
-                    key: int(value)
-                    if (isinstance(value, int) and not isinstance(value, bool))
-                    else value
-                    for key, value in video_parameters.items()
-                },
-                "picture_coding_mode": int(picture_coding_mode),
-                "picture_number": str(picture["pic_num"]),
-            }
-        ).encode("utf-8")
-    )
+    return {
+        "video_parameters": {
+            key: int(value)
+            if (isinstance(value, int) and not isinstance(value, bool))
+            else value
+            for key, value in video_parameters.items()
+        },
+        "picture_coding_mode": int(picture_coding_mode),
+    }
+
+
+def format_from_json(metadata):
+    """
+    For internal use. Inverse of :py:func:`format_to_json`. Returns a
+    (video_parameters, picture_coding_mode) tuple.
+    """
+    video_parameters = VideoParameters(metadata["video_parameters"])
+
+    # Convert back into native types
+    for name, int_enum_type in [
+        ("color_diff_format_index", ColorDifferenceSamplingFormats),
+        ("source_sampling", SourceSamplingModes),
+        ("color_primaries_index", PresetColorPrimaries),
+        ("color_matrix_index", PresetColorMatrices),
+        ("transfer_function_index", PresetTransferFunctions),
+    ]:
+        video_parameters[name] = int_enum_type(video_parameters[name])
+
+    picture_coding_mode = PictureCodingModes(metadata["picture_coding_mode"])
+
+    return (video_parameters, picture_coding_mode)
 
 
 def read_metadata(file):
@@ -241,19 +361,7 @@ def read_metadata(file):
     """
     metadata = json.loads(file.read().decode("utf-8"))
 
-    video_parameters = VideoParameters(metadata["video_parameters"])
-
-    # Convert back into native types
-    for name, int_enum_type in [
-        ("color_diff_format_index", ColorDifferenceSamplingFormats),
-        ("source_sampling", SourceSamplingModes),
-        ("color_primaries_index", PresetColorPrimaries),
-        ("color_matrix_index", PresetColorMatrices),
-        ("transfer_function_index", PresetTransferFunctions),
-    ]:
-        video_parameters[name] = int_enum_type(video_parameters[name])
-
-    picture_coding_mode = PictureCodingModes(metadata["picture_coding_mode"])
+    video_parameters, picture_coding_mode = format_from_json(metadata)
 
     picture_number = int(metadata["picture_number"])
 
@@ -281,14 +389,26 @@ def read_picture(video_parameters, picture_coding_mode, picture_number, file):
     dims_and_depths = compute_dimensions_and_depths(
         video_parameters, picture_coding_mode
     )
+    stage_dtypes = compute_stage_dtypes(video_parameters, picture_coding_mode)
     for (
         component,
         (width, height, depth_bits, bytes_per_sample),
     ) in dims_and_depths.items():
-        data = np.frombuffer(
-            file.read(height * width * bytes_per_sample),
-            dtype=np.uint8,
-        ).reshape(height, width, bytes_per_sample)
+        data = file.read(height * width * bytes_per_sample)
+
+        # Fast path: view the data directly as native (little-endian)
+        # integers and mask off just the intended bits
+        native_dtype = get_little_endian_dtype(bytes_per_sample)
+        if native_dtype is not None:
+            values = np.frombuffer(data, dtype=native_dtype).reshape(height, width)
+            if depth_bits < bytes_per_sample * 8:
+                values = values & ((1 << depth_bits) - 1)
+            picture[component] = values.tolist()
+            continue
+
+        data = np.frombuffer(data, dtype=np.uint8).reshape(
+            height, width, bytes_per_sample
+        )
 
         # Mask off just the intended bits
         msb_byte = ((depth_bits + 7) // 8) - 1
@@ -299,9 +419,11 @@ def read_picture(video_parameters, picture_coding_mode, picture_number, file):
             data = np.require(data, requirements="W")
             data[:, :, msb_byte] &= (1 << (depth_bits % 8)) - 1
 
-        # We use a dtype=object array so that we can use Python's arbitrary
-        # precision integers in order to support arbitrary bit depths
-        values = np.zeros((height, width), dtype=object)
+        # We use the narrowest integer type which can hold all sample values
+        # for the picture depth. For very large bit depths this will be a
+        # dtype=object array so that we can use Python's arbitrary precision
+        # integers in order to support arbitrary bit depths
+        values = np.zeros((height, width), dtype=stage_dtypes[component].samples)
 
         # Read little endian (NB, this method supports arbitrary width values)
         for byte in reversed(range(bytes_per_sample)):
@@ -312,3 +434,449 @@ def read_picture(video_parameters, picture_coding_mode, picture_number, file):
         picture[component] = values.tolist()
 
     return picture
+
+
+def open_picture(filename):
+    """
+    Open a picture as a set of memory-mapped NumPy arrays, along with its
+    metadata.
+
+    Memory-mapped equivalent of :py:func:`read`. See
+    :py:func:`open_picture_data` for details.
+
+    Parameters
+    ==========
+    filename : str
+        The filename of either the picture data file (.raw) or metadata file
+        (.json). The name of the other file will be inferred automatically.
+
+    Returns
+    =======
+    picture : {"Y": array, "C1": array, "C2": array, "pic_num": int}
+    video_parameters : :py:class:`~vc2_conformance.pseudocode.video_parameters.VideoParameters`
+    picture_coding_mode : :py:class:`~vc2_data_tables.PictureCodingModes`
+    """
+    metadata_filename, picture_filename = get_metadata_and_picture_filenames(filename)
+
+    with open(metadata_filename, "rb") as f:
+        (
+            video_parameters,
+            picture_coding_mode,
+            picture_number,
+        ) = read_metadata(f)
+
+    picture = open_picture_data(
+        video_parameters,
+        picture_coding_mode,
+        picture_number,
+        picture_filename,
+    )
+
+    return (picture, video_parameters, picture_coding_mode)
+
+
+def open_picture_data(video_parameters, picture_coding_mode, picture_number, filename):
+    """
+    Open a picture data file (.raw) as a set of memory-mapped, read-only, 2D
+    NumPy arrays.
+
+    Parameters
+    ==========
+    video_parameters : :py:class:`~vc2_conformance.pseudocode.video_parameters.VideoParameters`
+    picture_coding_mode : :py:class:`~vc2_data_tables.PictureCodingModes`
+    picture_number : int
+    filename : str
+        The filename of the picture data file.
+
+    Returns
+    =======
+    picture : {"Y": array, "C1": array, "C2": array, "pic_num": int}
+        Each component is a 2D :py:class:`numpy.memmap` of (little-endian)
+        unsigned integers, viewing the picture data file directly.
+
+        Unlike :py:func:`read_picture`, any unused high-order bits in each
+        sample are *not* masked off (conforming files always have these set
+        to zero). Callers wishing to ignore these bits should mask the values
+        they access (e.g. ``picture["Y"] & ((1 << depth_bits) - 1)``).
+
+        For bit depths requiring more than 64 bits per sample, where no
+        native NumPy type is available, the (masked) picture is read into
+        ``dtype=object`` arrays in memory instead.
+
+    Raises
+    ======
+    ValueError
+        If the picture data file is not exactly the size expected.
+    """
+    expected_size = get_picture_data_size(video_parameters, picture_coding_mode)
+    actual_size = os.path.getsize(filename)
+    if actual_size != expected_size:
+        raise ValueError(
+            "Picture data file {} is {} bytes, expected {} bytes.".format(
+                filename, actual_size, expected_size
+            )
+        )
+
+    return map_picture_data(
+        video_parameters, picture_coding_mode, picture_number, filename
+    )
+
+
+def get_picture_data_size(video_parameters, picture_coding_mode):
+    """
+    For internal use. Return the number of bytes occupied by the picture data
+    for a picture in the specified format.
+    """
+    dims_and_depths = compute_dimensions_and_depths(
+        video_parameters, picture_coding_mode
+    )
+    return sum(
+        width * height * bytes_per_sample
+        for (width, height, depth_bits, bytes_per_sample) in dims_and_depths.values()
+    )
+
+
+def map_picture_data(
+    video_parameters, picture_coding_mode, picture_number, filename, offset=0
+):
+    """
+    For internal use. Memory-map the picture data starting at the specified
+    byte offset within a file, as described in :py:func:`open_picture_data`.
+    The file is assumed to be large enough.
+    """
+    dims_and_depths = compute_dimensions_and_depths(
+        video_parameters, picture_coding_mode
+    )
+
+    if any(
+        get_little_endian_dtype(bytes_per_sample) is None
+        for (width, height, depth_bits, bytes_per_sample) in dims_and_depths.values()
+    ):
+        with open(filename, "rb") as f:
+            f.seek(offset)
+            picture = read_picture(
+                video_parameters, picture_coding_mode, picture_number, f
+            )
+        for component in dims_and_depths:
+            picture[component] = np.array(picture[component], dtype=object)
+        return picture
+
+    picture = {"pic_num": picture_number}
+
+    for (
+        component,
+        (width, height, depth_bits, bytes_per_sample),
+    ) in dims_and_depths.items():
+        dtype = get_little_endian_dtype(bytes_per_sample)
+        if width * height == 0:
+            # NB: Zero-length memory maps are not supported
+            picture[component] = np.zeros((height, width), dtype=dtype)
+        else:
+            picture[component] = np.memmap(
+                filename,
+                dtype=dtype,
+                mode="r",
+                offset=offset,
+                shape=(height, width),
+            )
+        offset += width * height * bytes_per_sample
+
+    return picture
+
+
+def is_picture_container(filename):
+    """
+    Return True if the named file is a picture container file (see
+    :py:class:`PictureContainerWriter`), False otherwise (including when the
+    file cannot be read).
+    """
+    try:
+        with open(filename, "rb") as f:
+            return f.read(len(PICTURE_CONTAINER_MAGIC)) == PICTURE_CONTAINER_MAGIC
+    except (OSError, IOError):
+        return False
+
+
+class PictureContainerWriter(object):
+    """
+    Write a series of pictures into a single picture container file (see
+    :ref:`file-format-container`).
+
+    Pictures are appended to the file as they are written and so pictures
+    need not all be held in memory at once. The container index and metadata
+    are written when :py:meth:`close` is called: a container which is not
+    closed will not be readable.
+
+    May be used as a context manager, in which case the container is closed
+    on exit.
+
+    Parameters
+    ==========
+    filename : str
+        The filename of the container file to create.
+    """
+
+    def __init__(self, filename):
+        self._file = open(filename, "wb")
+        self._file.write(PICTURE_CONTAINER_MAGIC)
+
+        # The distinct formats of the pictures written so far
+        # [(video_parameters, picture_coding_mode), ...]
+        self._formats = []
+
+        # The packed index entries for every picture written so far
+        self._index = []
+
+    def write(self, picture, video_parameters, picture_coding_mode):
+        """
+        Append a picture to the container.
+
+        Parameters
+        ==========
+        picture : {"Y": [[s, ...], ...], "C1": ..., "C2": ..., "pic_num": int}
+        video_parameters : :py:class:`~vc2_conformance.pseudocode.video_parameters.VideoParameters`
+        picture_coding_mode : :py:class:`~vc2_data_tables.PictureCodingModes`
+        """
+        picture_format = (video_parameters, picture_coding_mode)
+        if picture_format not in self._formats:
+            self._formats.append(
+                (VideoParameters(video_parameters), picture_coding_mode)
+            )
+        format_index = self._formats.index(picture_format)
+
+        entry = np.zeros(1, dtype=PICTURE_CONTAINER_INDEX_DTYPE)
+        entry["offset"] = self._file.tell()
+        entry["picture_number"] = picture["pic_num"]
+        entry["format"] = format_index
+        self._index.append(entry.tobytes())
+
+        write_picture(picture, video_parameters, picture_coding_mode, self._file)
+
+    def close(self):
+        """
+        Write the container metadata and index and close the file. Has no
+        effect if the container has already been closed.
+        """
+        if self._file.closed:
+            return
+
+        metadata_offset = self._file.tell()
+        self._file.write(
+            json.dumps(
+                {
+                    "formats": [
+                        format_to_json(video_parameters, picture_coding_mode)
+                        for video_parameters, picture_coding_mode in self._formats
+                    ],
+                }
+            ).encode("utf-8")
+        )
+
+        index_offset = self._file.tell()
+        self._file.write(b"".join(self._index))
+
+        self._file.write(
+            PICTURE_CONTAINER_TRAILER.pack(
+                metadata_offset,
+                index_offset,
+                len(self._index),
+                PICTURE_CONTAINER_MAGIC,
+            )
+        )
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class PictureContainerReader(object):
+    """
+    Provides random access to the pictures in a picture container file (see
+    :ref:`file-format-container`).
+
+    Pictures are identified by their (zero-based) index within the container.
+    Use :py:meth:`find` to look up a picture by its picture number.
+
+    May be used as a context manager, in which case the container is closed
+    on exit.
+
+    Parameters
+    ==========
+    filename : str
+        The filename of the container file to open.
+
+    Raises
+    ======
+    ValueError
+        If the file is not a (complete) picture container.
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        self._file = open(filename, "rb")
+        try:
+            self._read_index()
+        except Exception:
+            self._file.close()
+            raise
+
+        # Lazily populated {picture_number: index, ...}
+        self._picture_number_to_index = None
+
+    def _read_index(self):
+        """
+        For internal use. Read the container metadata and index.
+        """
+        self._file.seek(0, os.SEEK_END)
+        file_size = self._file.tell()
+
+        self._file.seek(0)
+        magic = self._file.read(len(PICTURE_CONTAINER_MAGIC))
+        if magic != PICTURE_CONTAINER_MAGIC:
+            raise ValueError("{} is not a picture container.".format(self.filename))
+
+        trailer_offset = file_size - PICTURE_CONTAINER_TRAILER.size
+        if trailer_offset < len(PICTURE_CONTAINER_MAGIC):
+            raise ValueError("Picture container {} is truncated.".format(self.filename))
+        self._file.seek(trailer_offset)
+        (
+            metadata_offset,
+            index_offset,
+            num_pictures,
+            magic,
+        ) = PICTURE_CONTAINER_TRAILER.unpack(
+            self._file.read(PICTURE_CONTAINER_TRAILER.size)
+        )
+        index_size = num_pictures * PICTURE_CONTAINER_INDEX_DTYPE.itemsize
+        if (
+            magic != PICTURE_CONTAINER_MAGIC
+            or not (len(magic) <= metadata_offset <= index_offset)
+            or index_offset + index_size != trailer_offset
+        ):
+            raise ValueError(
+                "Picture container {} is truncated or corrupt "
+                "(was it closed properly?).".format(self.filename)
+            )
+
+        self._file.seek(metadata_offset)
+        metadata = json.loads(
+            self._file.read(index_offset - metadata_offset).decode("utf-8")
+        )
+        self._formats = [
+            format_from_json(picture_format) for picture_format in metadata["formats"]
+        ]
+        self._format_sizes = [
+            get_picture_data_size(video_parameters, picture_coding_mode)
+            for video_parameters, picture_coding_mode in self._formats
+        ]
+
+        self._index = np.frombuffer(
+            self._file.read(index_size), dtype=PICTURE_CONTAINER_INDEX_DTYPE
+        )
+        format_indices = self._index["format"]
+        if np.any(format_indices >= len(self._formats)) or np.any(
+            self._index["offset"]
+            + np.array(self._format_sizes, dtype=np.uint64)[format_indices]
+            > metadata_offset
+        ):
+            raise ValueError(
+                "Picture container {} has a corrupt index.".format(self.filename)
+            )
+
+    def __len__(self):
+        """
+        The number of pictures in the container.
+        """
+        return len(self._index)
+
+    def get_picture_number(self, index):
+        """
+        Return the picture number of the picture at the specified index.
+        """
+        return int(self._index[index]["picture_number"])
+
+    def get_format(self, index):
+        """
+        Return the (video_parameters, picture_coding_mode) of the picture at
+        the specified index.
+        """
+        return self._formats[self._index[index]["format"]]
+
+    def find(self, picture_number):
+        """
+        Return the index of the (first) picture in the container with the
+        specified picture number. Raises :py:exc:`KeyError` if no such picture
+        exists.
+        """
+        if self._picture_number_to_index is None:
+            self._picture_number_to_index = {}
+            for index, picture_number_at_index in enumerate(
+                self._index["picture_number"].tolist()
+            ):
+                self._picture_number_to_index.setdefault(picture_number_at_index, index)
+        return self._picture_number_to_index[picture_number]
+
+    def read(self, index):
+        """
+        Read a picture from the container. Equivalent to :py:func:`read`.
+
+        Returns
+        =======
+        picture : {"Y": [[s, ...], ...], "C1": ..., "C2": ..., "pic_num": int}
+        video_parameters : :py:class:`~vc2_conformance.pseudocode.video_parameters.VideoParameters`
+        picture_coding_mode : :py:class:`~vc2_data_tables.PictureCodingModes`
+        """
+        video_parameters, picture_coding_mode = self.get_format(index)
+        self._file.seek(int(self._index[index]["offset"]))
+        picture = read_picture(
+            video_parameters,
+            picture_coding_mode,
+            self.get_picture_number(index),
+            self._file,
+        )
+        return (picture, video_parameters, picture_coding_mode)
+
+    def open(self, index):
+        """
+        Open a picture from the container as a set of memory-mapped NumPy
+        arrays. Equivalent to :py:func:`open_picture`.
+
+        Returns
+        =======
+        picture : {"Y": array, "C1": array, "C2": array, "pic_num": int}
+        video_parameters : :py:class:`~vc2_conformance.pseudocode.video_parameters.VideoParameters`
+        picture_coding_mode : :py:class:`~vc2_data_tables.PictureCodingModes`
+        """
+        video_parameters, picture_coding_mode = self.get_format(index)
+        picture = map_picture_data(
+            video_parameters,
+            picture_coding_mode,
+            self.get_picture_number(index),
+            self.filename,
+            int(self._index[index]["offset"]),
+        )
+        return (picture, video_parameters, picture_coding_mode)
+
+    def read_picture_bytes(self, index):
+        """
+        Return the raw picture data (i.e. the contents of the equivalent
+        '.raw' file) for the picture at the specified index as a
+        :py:class:`bytes`.
+        """
+        self._file.seek(int(self._index[index]["offset"]))
+        return self._file.read(self._format_sizes[self._index[index]["format"]])
+
+    def close(self):
+        """
+        Close the container file.
+        """
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -110,11 +110,26 @@ docstring::
     previous_parse_offset : int
 
 
+Unchecked variants
+------------------
+
+Checking key names on every assignment has a measurable performance cost in
+tight loops (for example, in the bit-reading functions used by the decoder).
+The :py:func:`unchecked_fixeddict` function returns a variant of a fixeddict
+type which behaves identically except that key names are not checked::
+
+    >>> from vc2_conformance.fixeddict import unchecked_fixeddict
+    >>> FastFrameSize = unchecked_fixeddict(FrameSize)
+    >>> f = FastFrameSize()
+    >>> f["not_in_fixeddict"] = 123  # No error raised
+
 API
 ---
 
 .. autofunction:: fixeddict
 
+.. autofunction:: unchecked_fixeddict
+
 .. autoclass:: Entry
 
 .. autoexception:: FixedDictKeyError
@@ -132,6 +147,7 @@ from vc2_conformance.string_utils import indent
 
 __all__ = [
     "fixeddict",
+    "unchecked_fixeddict",
     "Entry",
     "FixedDictKeyError",
 ]
@@ -452,3 +468,61 @@ def fixeddict(name, *entries, **kwargs):
         setattr(cls, "__module__", module)
 
     return cls
+
+
+_unchecked_fixeddict_types = {}
+"""
+For internal use. The types returned by :py:func:`unchecked_fixeddict`,
+indexed by the (checked) :py:func:`fixeddict` type they were derived from.
+"""
+
+
+def _new_unchecked_fixeddict(fixeddict_type):
+    """
+    For internal use. Create an empty instance of
+    ``unchecked_fixeddict(fixeddict_type)``. Used when unpickling (and
+    copying) unchecked fixeddict instances.
+    """
+    return unchecked_fixeddict(fixeddict_type)()
+
+
+def unchecked_fixeddict(fixeddict_type):
+    """
+    Return a subclass of a :py:func:`fixeddict` type which does not check key
+    names when entries are set. Setting entries in the returned type has the
+    same cost as an ordinary :py:class:`dict`.
+
+    Instances are otherwise identical to (and are instances of) the original
+    type, including their string representation. Pickled (or copied)
+    unchecked instances remain unchecked.
+
+    The same type is returned for repeated calls with the same fixeddict type.
+    """
+    if getattr(fixeddict_type, "_unchecked", False):
+        return fixeddict_type
+
+    if fixeddict_type not in _unchecked_fixeddict_types:
+
+        def __reduce__(self):
+            return (
+                _new_unchecked_fixeddict,
+                (fixeddict_type,),
+                self.__getstate__(),
+            )
+
+        _unchecked_fixeddict_types[fixeddict_type] = type(
+            fixeddict_type.__name__,
+            (fixeddict_type,),
+            {
+                "__init__": dict.__init__,
+                "__setitem__": dict.__setitem__,
+                "setdefault": dict.setdefault,
+                "update": dict.update,
+                "__reduce__": __reduce__,
+                "__module__": fixeddict_type.__module__,
+                "__doc__": fixeddict_type.__doc__,
+                "_unchecked": True,
+            },
+        )
+
+    return _unchecked_fixeddict_types[fixeddict_type]
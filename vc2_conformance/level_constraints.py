@@ -41,6 +41,8 @@ from vc2_conformance.constraint_table import (
     ValueSet,
 )
 
+from vc2_conformance.table_cache import read_cached
+
 from vc2_data_tables.csv_readers import read_lookup_from_csv
 
 from vc2_data_tables import (
@@ -85,8 +87,9 @@ sequence_restriction_regex : str
     is a :py:class:`~vc2_data_tables.ParseCodes` name string.
 """
 
-LEVEL_SEQUENCE_RESTRICTIONS = read_lookup_from_csv(
+LEVEL_SEQUENCE_RESTRICTIONS = read_cached(
     os.path.join(os.path.dirname(__file__), "level_sequence_restrictions.csv"),
+    read_lookup_from_csv,
     Levels,
     LevelSequenceRestrictions,
 )
@@ -97,15 +100,18 @@ restrictions on sequences imposed by each VC-2 level.
 """
 
 
-LEVEL_CONSTRAINTS = read_constraints_from_csv(
+LEVEL_CONSTRAINTS = read_cached(
     os.path.join(
         os.path.dirname(__file__),
         "level_constraints.csv",
-    )
+    ),
+    read_constraints_from_csv,
 )
 """
 A constraint table (see :py:mod:`vc2_conformance.constraint_table`) loaded
-from ``vc2_conformance/level_constraints.csv``.
+from ``vc2_conformance/level_constraints.csv``. (The parsed table may
+optionally be cached between imports, see
+:py:mod:`vc2_conformance.table_cache`.)
 
 Constraints which apply due to levels. Keys correspond to particular bitstream
 values or properties and are enumerated below:
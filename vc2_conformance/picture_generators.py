@@ -53,7 +53,7 @@ import numpy as np
 
 from PIL import Image
 
-from vc2_conformance.file_format import read
+from vc2_conformance.file_format import open_picture
 
 from vc2_conformance.dimensions_and_depths import compute_dimensions_and_depths
 
@@ -99,14 +99,18 @@ def read_as_xyz(filename):
     video_parameters : :py:class:`~vc2_conformance.pseudocode.video_parameters.VideoParameters`
     picture_coding_mode : :py:class:`~vc2_data_tables.PictureCodingModes`
     """
-    picture, video_parameters, picture_coding_mode = read(filename)
+    picture, video_parameters, picture_coding_mode = open_picture(filename)
 
-    xyz = to_xyz(
-        np.array(picture["Y"]),
-        np.array(picture["C1"]),
-        np.array(picture["C2"]),
-        video_parameters,
+    # NB: The (memory mapped) picture's padding bits must be masked off
+    dimensions_and_depths = compute_dimensions_and_depths(
+        video_parameters, picture_coding_mode
     )
+    y, c1, c2 = (
+        picture[c] & ((1 << dimensions_and_depths[c].depth_bits) - 1)
+        for c in ["Y", "C1", "C2"]
+    )
+
+    xyz = to_xyz(y, c1, c2, video_parameters)
 
     return xyz, video_parameters, picture_coding_mode
 
@@ -1,5 +1,10 @@
 """
 VC-2 style 2D array functions (5.5).
+
+Arrays are represented as nested Python lists. Some vectorised (not in spec)
+stages of the decoder instead produce 2D arrays backed by a NumPy array (see
+:py:class:`NumPyArray2D`). The functions in this module work identically with
+either representation.
 """
 
 from vc2_conformance.pseudocode.metadata import ref_pseudocode
@@ -13,9 +18,103 @@ __all__ = [
     "column",
     "delete_rows_after",
     "delete_columns_after",
+    "NumPyArray2D",
+    "integer_dtype_for_range",
 ]
 
 
+NATIVE_INTEGER_DTYPES = (
+    "int8",
+    "uint8",
+    "int16",
+    "uint16",
+    "int32",
+    "uint32",
+    "int64",
+    "uint64",
+)
+"""
+For internal use. The names of the native NumPy integer dtypes considered by
+:py:func:`integer_dtype_for_range`, narrowest first.
+"""
+
+
+def integer_dtype_for_range(lower, upper):
+    """
+    Return the narrowest NumPy integer dtype able to represent every value in
+    the range ``lower`` to ``upper`` (inclusive).
+
+    Signed dtypes are preferred over unsigned dtypes of the same width. If no
+    native dtype is wide enough, ``np.dtype(object)`` is returned (i.e. Python
+    integers with arbitrary precision).
+
+    Parameters
+    ==========
+    lower, upper : int
+
+    Returns
+    =======
+    dtype : :py:class:`numpy.dtype`
+    """
+    # NB: Imported here since NumPy is comparatively slow to import and is not
+    # needed by the (list based) pseudocode itself.
+    import numpy as np
+
+    for dtype in NATIVE_INTEGER_DTYPES:
+        info = np.iinfo(dtype)
+        if info.min <= lower and upper <= info.max:
+            return np.dtype(dtype)
+    return np.dtype(object)
+
+
+class NumPyArray2D(list):
+    """
+    A 2D array backed by a 2D NumPy array, as produced by
+    :py:func:`~vc2_conformance.pseudocode.picture_decoding.pad_removal_clip_and_offset_component`.
+
+    This object behaves like a list of rows (as created by
+    :py:func:`new_array`) where each row is a (zero-copy) 1D NumPy view into the
+    underlying array. The underlying array is accessible via the
+    :py:attr:`ndarray` attribute.
+
+    Comparisons with (nested) lists compare values, as if this were a nested
+    list.
+    """
+
+    def __init__(self, ndarray):
+        self.ndarray = ndarray
+        super(NumPyArray2D, self).__init__(ndarray)
+
+    def tolist(self):
+        """Return a copy of this array as a nested list of Python values."""
+        return self.ndarray.tolist()
+
+    def __eq__(self, other):
+        if isinstance(other, NumPyArray2D):
+            other = other.tolist()
+        if isinstance(other, list):
+            return self.tolist() == other
+        else:
+            return NotImplemented
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        if equal is NotImplemented:
+            return NotImplemented
+        else:
+            return not equal
+
+    __hash__ = None
+
+    def __repr__(self):
+        return "{}({!r})".format(type(self).__name__, self.ndarray)
+
+    def __reduce__(self):
+        # NB: The default (list) behaviour would copy each row independently,
+        # breaking their association with the underlying array.
+        return (type(self), (self.ndarray,))
+
+
 @ref_pseudocode(deviation="inferred_implementation")
 def new_array(*dimensions):
     """
@@ -50,7 +149,8 @@ def height(a):
 def row(a, k):
     """
     (15.4.1) A 1D-array-like view into a row of a (2D) nested list as returned
-    by :py:func:`new_array()`.
+    by :py:func:`new_array()`. For :py:class:`NumPyArray2D` arrays, this is a
+    1D NumPy view.
     """
     return a[k]
 
@@ -59,9 +159,16 @@ def row(a, k):
 class column(object):
     """
     (15.4.1) A 1D-array-like view into a column of a (2D) nested list as
-    returned by :py:func:`new_array()`.
+    returned by :py:func:`new_array()`. For :py:class:`NumPyArray2D` arrays,
+    a 1D NumPy view is returned instead.
     """
 
+    def __new__(cls, a, k):
+        if isinstance(a, NumPyArray2D):
+            return a.ndarray[:, k]
+        else:
+            return super(column, cls).__new__(cls)
+
     def __init__(self, a, k):
         self._a = a
         self._k = k
@@ -82,6 +189,8 @@ def delete_rows_after(a, k):
     """
     (15.4.5) Delete rows 'k' and after in 'a'.
     """
+    if isinstance(a, NumPyArray2D):
+        a.ndarray = a.ndarray[:k]
     del a[k:]
 
 
@@ -89,5 +198,9 @@ def delete_columns_after(a, k):
     """
     (15.4.5) Delete columns 'k' and after in 'a'.
     """
-    for row in a:
-        del row[k:]
+    if isinstance(a, NumPyArray2D):
+        a.ndarray = a.ndarray[:, :k]
+        a[:] = a.ndarray
+    else:
+        for row in a:
+            del row[k:]
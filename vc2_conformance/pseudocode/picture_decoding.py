@@ -19,6 +19,8 @@ from vc2_conformance.pseudocode.arrays import (
     column,
     delete_rows_after,
     delete_columns_after,
+    NumPyArray2D,
+    integer_dtype_for_range,
 )
 
 __all__ = [
@@ -38,6 +40,7 @@ __all__ = [
     "offset_component",
     "clip_picture",
     "clip_component",
+    "pad_removal_clip_and_offset_component",
 ]
 
 
@@ -46,6 +49,23 @@ def picture_decode(state):
     """(15.2)"""
     state["current_picture"] = {}
     state["current_picture"]["pic_num"] = state["picture_number"]
+
+    # Optionally use a faster (but bit-exact) implementation of the
+    # inverse_wavelet_transform, clip_picture and offset_picture steps.
+    ## Begin not in spec
+    if state.get("_use_fused_output_stage", False):
+        for c, transform in [
+            ("Y", "y_transform"),
+            ("C1", "c1_transform"),
+            ("C2", "c2_transform"),
+        ]:
+            state["current_picture"][c] = pad_removal_clip_and_offset_component(
+                state, idwt(state, state[transform]), c
+            )
+        output_current_picture(state)
+        return
+    ## End not in spec
+
     inverse_wavelet_transform(state)
     clip_picture(state, state["current_picture"])
     offset_picture(state, state["current_picture"])
@@ -59,14 +79,21 @@ def picture_decode(state):
     ###     state["picture_coding_mode"],
     ### )
 
-    ## Begin not in spec
+    output_current_picture(state)  ## Not in spec
+
+
+def output_current_picture(state):
+    """
+    Not in spec. Call the ``_output_picture_callback`` in the state (if
+    defined) with the current picture. Used in place of ``output_picture``
+    (15.2).
+    """
     if "_output_picture_callback" in state:
         state["_output_picture_callback"](
             state["current_picture"],
             state["video_parameters"],
             state["picture_coding_mode"],
         )
-    ## End not in spec
 
 
 @ref_pseudocode
@@ -347,3 +374,74 @@ def clip_component(state, comp_data, c):
                     -(2 ** (state["color_diff_depth"] - 1)),
                     2 ** (state["color_diff_depth"] - 1) - 1,
                 )
+
+
+@ref_pseudocode(deviation="alternative_implementation")
+def pad_removal_clip_and_offset_component(state, comp_data, c):
+    """
+    (15.4.5) and (15.5) A vectorised alternative to
+    :py:func:`idwt_pad_removal`, :py:func:`clip_component` and
+    :py:func:`offset_component` which performs all three steps in a single
+    pass, producing bit-exact results.
+
+    Parameters
+    ==========
+    state : :py:class:`vc2_conformance.pseudocode.state.State`
+        Where ``luma_width``, ``luma_height``, ``color_diff_width``,
+        ``color_diff_height``, ``luma_depth`` and ``color_diff_depth`` are
+        defined.
+    comp_data : [[int, ...], ...] or :py:class:`~vc2_conformance.pseudocode.arrays.NumPyArray2D`
+        The (padded) picture component produced by :py:func:`idwt`. Not
+        modified.
+    c : str
+        The component name ("Y", "C1" or "C2").
+
+    Returns
+    =======
+    comp_data : :py:class:`~vc2_conformance.pseudocode.arrays.NumPyArray2D`
+        A new array containing the cropped, clipped and offset component. The
+        narrowest integer dtype able to hold the component's sample values is
+        used (see
+        :py:func:`~vc2_conformance.pseudocode.arrays.integer_dtype_for_range`).
+    """
+    if c == "Y":
+        width = state["luma_width"]
+        height = state["luma_height"]
+        depth = state["luma_depth"]
+    elif (c == "C1") or (c == "C2"):
+        width = state["color_diff_width"]
+        height = state["color_diff_height"]
+        depth = state["color_diff_depth"]
+
+    # NB: Imported here since NumPy is comparatively slow to import and is only
+    # needed when the fused output stage is used.
+    import numpy as np
+
+    if isinstance(comp_data, NumPyArray2D):
+        values = comp_data.ndarray
+    else:
+        try:
+            values = np.array(comp_data, dtype=np.int64)
+        except OverflowError:
+            # Values too large for int64 (only possible with very
+            # non-conformant streams) are clipped as Python integers.
+            values = np.array(comp_data, dtype=object)
+
+    # NB: Clipping happens before the offset is added since doing the
+    # reverse might overflow. The cropped view is clipped directly into the
+    # output array which uses the narrowest integer type able to hold both
+    # the clipped and offset values.
+    out = np.empty(
+        (height, width),
+        dtype=integer_dtype_for_range(-(2 ** (depth - 1)), (2 ** depth) - 1),
+    )
+    np.clip(
+        values[:height, :width],
+        -(2 ** (depth - 1)),
+        2 ** (depth - 1) - 1,
+        out=out,
+        casting="unsafe",
+    )
+    out += 2 ** (depth - 1)
+
+    return NumPyArray2D(out)
@@ -33,6 +33,12 @@ The 'c' or 'comp' arguments should be set to one of the following strings:
 The :py:func:`slices_have_same_dimensions` utility is added beyond the VC-2
 pseudocode functions which determines if all slices will contain the same
 number of samples or not.
+
+Since the slice dimension functions are called very frequently (for every
+slice, component and subband), the :py:class:`SliceGeometry` class is also
+provided which precomputes all slice boundaries for a given set of picture,
+transform and slice dimensions. A cached instance may be obtained for a given
+state using :py:func:`get_slice_geometry`.
 """
 
 from vc2_conformance.pseudocode.metadata import ref_pseudocode
@@ -46,6 +52,8 @@ __all__ = [
     "slice_top",
     "slice_bottom",
     "slices_have_same_dimensions",
+    "SliceGeometry",
+    "get_slice_geometry",
 ]
 
 
@@ -143,3 +151,137 @@ def slices_have_same_dimensions(state):
         and dc_color_diff_width % state["slices_x"] == 0
         and dc_color_diff_height % state["slices_y"] == 0
     )
+
+
+def slice_geometry_key(state):
+    """
+    For internal use. Return a tuple of the state values which determine the
+    slice geometry.
+    """
+    return (
+        state["luma_width"],
+        state["luma_height"],
+        state["color_diff_width"],
+        state["color_diff_height"],
+        state["dwt_depth"],
+        state["dwt_depth_ho"],
+        state["slices_x"],
+        state["slices_y"],
+    )
+
+
+class SliceGeometry(object):
+    """
+    Utility, not part of the standard. Precomputed slice boundaries for every
+    component and transform level.
+
+    The :py:meth:`slice_left`, :py:meth:`slice_right`, :py:meth:`slice_top`
+    and :py:meth:`slice_bottom` methods produce identical results to the
+    pseudocode functions of the same names but are table lookups.
+
+    Parameters
+    ==========
+    state : dict-like
+        A state dictionary containing the picture, transform and slice
+        dimensions described at the top of this module.
+
+    Attributes
+    ==========
+    key : tuple
+        The state values from which this geometry was computed.
+    x_bounds : {(comp, level): [x, ...], ...}
+        For each component and transform level, a list of ``slices_x + 1``
+        slice boundary coordinates. Slice ``sx`` spans from ``x_bounds[sx]``
+        (inclusive) to ``x_bounds[sx + 1]`` (exclusive).
+    y_bounds : {(comp, level): [y, ...], ...}
+        As ``x_bounds`` but giving the ``slices_y + 1`` vertical slice
+        boundaries.
+    """
+
+    def __init__(self, state):
+        self.key = slice_geometry_key(state)
+
+        self.x_bounds = {}
+        self.y_bounds = {}
+        for comp in ["Y", "C1"]:
+            for level in range(state["dwt_depth_ho"] + state["dwt_depth"] + 1):
+                w = subband_width(state, level, comp)
+                h = subband_height(state, level, comp)
+                self.x_bounds[(comp, level)] = [
+                    (w * sx) // state["slices_x"] for sx in range(state["slices_x"] + 1)
+                ]
+                self.y_bounds[(comp, level)] = [
+                    (h * sy) // state["slices_y"] for sy in range(state["slices_y"] + 1)
+                ]
+
+                # Both color difference components have the same dimensions
+                if comp == "C1":
+                    self.x_bounds[("C2", level)] = self.x_bounds[(comp, level)]
+                    self.y_bounds[("C2", level)] = self.y_bounds[(comp, level)]
+
+    def slice_left(self, sx, c, level):
+        """Equivalent to :py:func:`slice_left`."""
+        return self.x_bounds[(c, level)][sx]
+
+    def slice_right(self, sx, c, level):
+        """Equivalent to :py:func:`slice_right`."""
+        return self.x_bounds[(c, level)][sx + 1]
+
+    def slice_top(self, sy, c, level):
+        """Equivalent to :py:func:`slice_top`."""
+        return self.y_bounds[(c, level)][sy]
+
+    def slice_bottom(self, sy, c, level):
+        """Equivalent to :py:func:`slice_bottom`."""
+        return self.y_bounds[(c, level)][sy + 1]
+
+    def slice_rectangles(self, c, level):
+        """
+        Return the rectangles of every slice for a given component and level
+        as a (slices_y, slices_x, 4) :py:class:`numpy.ndarray` of (top,
+        bottom, left, right) coordinates.
+        """
+        # NB: Imported here since NumPy is comparatively slow to import and is
+        # only needed by vectorised callers of this method.
+        import numpy as np
+
+        xs = np.array(self.x_bounds[(c, level)])
+        ys = np.array(self.y_bounds[(c, level)])
+
+        out = np.empty((len(ys) - 1, len(xs) - 1, 4), dtype=int)
+        out[:, :, 0] = ys[:-1, np.newaxis]
+        out[:, :, 1] = ys[1:, np.newaxis]
+        out[:, :, 2] = xs[np.newaxis, :-1]
+        out[:, :, 3] = xs[np.newaxis, 1:]
+        return out
+
+
+_slice_geometry_cache = {}
+"""
+For internal use. Cache of :py:class:`SliceGeometry` objects used by
+:py:func:`get_slice_geometry`, indexed by :py:func:`slice_geometry_key`.
+"""
+
+SLICE_GEOMETRY_CACHE_SIZE = 16
+"""
+The maximum number of :py:class:`SliceGeometry` objects cached by
+:py:func:`get_slice_geometry`.
+"""
+
+
+def get_slice_geometry(state):
+    """
+    Utility, not part of the standard. Return a :py:class:`SliceGeometry` for
+    the dimensions given in the supplied state.
+
+    Geometries are cached, indexed by the picture, transform and slice
+    dimensions they were computed from, and so are only recomputed when these
+    change.
+    """
+    key = slice_geometry_key(state)
+    geometry = _slice_geometry_cache.get(key)
+    if geometry is None:
+        if len(_slice_geometry_cache) >= SLICE_GEOMETRY_CACHE_SIZE:
+            _slice_geometry_cache.clear()
+        geometry = _slice_geometry_cache[key] = SliceGeometry(state)
+    return geometry
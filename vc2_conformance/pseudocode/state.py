@@ -12,10 +12,11 @@ from vc2_data_tables import (
     Levels,
 )
 
-from vc2_conformance.fixeddict import fixeddict, Entry
+from vc2_conformance.fixeddict import fixeddict, unchecked_fixeddict, Entry
 
 __all__ = [
     "State",
+    "FastState",
     "reset_state",
 ]
 
@@ -231,6 +232,46 @@ State = fixeddict(
             video parameters and picture coding mode.
         """,
     ),
+    Entry(
+        "_use_fused_output_stage",
+        help_type="bool",
+        help="""
+            Not in spec, used by :py:mod:`vc2_conformance.decoder`.
+            If True, picture_decode (15.2) uses the vectorised
+            :py:func:`~vc2_conformance.pseudocode.picture_decoding.pad_removal_clip_and_offset_component`
+            in place of the (bit-exact equivalent) idwt_pad_removal (15.4.5),
+            clip_picture (15.5) and offset_picture (15.5) pseudocode
+            functions. Decoded picture components are then
+            :py:class:`~vc2_conformance.pseudocode.arrays.NumPyArray2D`
+            arrays.
+        """,
+    ),
+    Entry(
+        "_use_wavefront_dc_prediction",
+        help_type="bool",
+        help="""
+            Not in spec, used by :py:mod:`vc2_conformance.decoder`.
+            If True, transform_data (13.5.2) and fragment_data (14.4) use the
+            vectorised
+            :py:func:`~vc2_conformance.decoder.transform_data_syntax.wavefront_dc_prediction`
+            in place of the (bit-exact equivalent) dc_prediction (13.4)
+            pseudocode function.
+        """,
+    ),
+    Entry(
+        "_use_sequence_header_cache",
+        help_type="bool",
+        help="""
+            Not in spec, used by :py:mod:`vc2_conformance.decoder`.
+            If True, sequence_header (11.1) skips over repeated sequence
+            headers which are byte-for-byte identical to the previous sequence
+            header in the sequence (see
+            :py:func:`~vc2_conformance.decoder.io.skip_recording_if_identical`)
+            rather than parsing them again. The video parameters and state
+            values set by the previous sequence header (which are necessarily
+            identical) are reused.
+        """,
+    ),
     # (10.4.3) and (12.2)
     Entry(
         "_num_pictures_in_sequence",
@@ -293,6 +334,26 @@ State = fixeddict(
             previous sequence_header has appeared.
         """,
     ),
+    Entry(
+        "_last_sequence_header_next_bit",
+        help_type="int",
+        help="""
+            Not in spec, used by :py:mod:`vc2_conformance.decoder`.
+            (11.1) the value of next_bit immediately after the previous
+            sequence_header in the sequence was read. Not present if no
+            previous sequence_header has appeared.
+        """,
+    ),
+    Entry(
+        "_last_sequence_header_video_parameters",
+        help_type=":py:class:`~vc2_conformance.pseudocode.video_parameters.VideoParameters`",
+        help="""
+            Not in spec, used by :py:mod:`vc2_conformance.decoder`.
+            (11.1) the video parameters returned by the previous
+            sequence_header in the sequence. Not present if no previous
+            sequence_header has appeared.
+        """,
+    ),
     # (11.2.2) Version number constraint checking
     Entry(
         "_expected_major_version",
@@ -348,6 +409,20 @@ State = fixeddict(
             is received by fragment_data (14.4).
         """,
     ),
+    # (13.2.2) initialize_wavelet_data
+    Entry(
+        "_transform_buffers",
+        help_type="{comp: (key, {level: {orient: [[int, ...], ...], ...}, ...}), ...}",
+        help="""
+            Not in spec, used by :py:mod:`vc2_conformance.decoder`.
+            (13.2.2) The transform data arrays most recently allocated by
+            :py:func:`~vc2_conformance.decoder.transform_data_syntax.initialize_wavelet_data`
+            for each component, along with a key describing their dimensions.
+            These arrays are reused for subsequent pictures with the same
+            dimensions. Released by :py:func:`reset_state` at the start of
+            each sequence.
+        """,
+    ),
     # (A.2.1) read_byte
     Entry(
         "_file",
@@ -381,6 +456,17 @@ State = fixeddict(
             :py:func:`vc2_conformance.decoder.assertions.assert_level_constraint`).
         """,
     ),
+    Entry(
+        "_level_constraint_tracker",
+        help_type=":py:class:`vc2_conformance.constraint_table.ConstraintTracker`",
+        help="""
+            Not in spec, used by :py:mod:`vc2_conformance.decoder`.
+            A :py:class:`~vc2_conformance.constraint_table.ConstraintTracker`
+            used by
+            :py:func:`vc2_conformance.decoder.assertions.assert_level_constraint`
+            to incrementally check the values in ``_level_constrained_values``.
+        """,
+    ),
     help="""
         The global state variable type.
 
@@ -390,10 +476,23 @@ State = fixeddict(
 )
 
 
+FastState = unchecked_fixeddict(State)
+"""
+A variant of :py:class:`State` which does not check entry names when values
+are set (see :py:func:`~vc2_conformance.fixeddict.unchecked_fixeddict`). This
+substantially reduces the overhead of the frequent state updates made while
+decoding a bitstream (e.g. by the bit-reading functions) at the expense of not
+detecting misspelt entry names.
+"""
+
+
 retained_state_fields = [
     # The output_picture callback should remain so that subsequent sequences
     # trigger the same callback.
     "_output_picture_callback",
+    "_use_fused_output_stage",
+    "_use_wavefront_dc_prediction",
+    "_use_sequence_header_cache",
     # I/O state must be preserved to allow continuing to read the current file
     "next_bit",
     "current_byte",
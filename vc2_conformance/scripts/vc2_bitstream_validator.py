@@ -20,6 +20,16 @@ Here the ``--output`` argument specifies the printf-style template for the
 decoded picture filenames. The decoded pictures are written as raw files (see
 :ref:`file-format`).
 
+Alternatively, if the ``--output`` filename ends with ``.vc2pics``, all
+decoded pictures are written into a single picture container file (see
+:ref:`file-format-container`)::
+
+    $ vc2-bitstream-validator path/to/bitstream.vc2 --output decoded_pictures.vc2pics
+    No errors found in bitstream. Verify decoded pictures to confirm conformance.
+
+This avoids creating a pair of files for every picture, which can be slow for
+long sequences.
+
 If a conformance error is detected, a detailed explanation of the problem is
 displayed::
 
@@ -93,9 +103,13 @@ from vc2_conformance.py2x_compat import quote
 
 from vc2_conformance.string_utils import wrap_paragraphs
 
-from vc2_conformance.file_format import write
+from vc2_conformance.file_format import (
+    write,
+    PictureContainerWriter,
+    PICTURE_CONTAINER_EXTENSION,
+)
 
-from vc2_conformance.pseudocode.state import State
+from vc2_conformance.pseudocode.state import State, FastState
 
 from vc2_conformance.decoder import (
     init_io,
@@ -104,8 +118,6 @@ from vc2_conformance.decoder import (
     tell,
 )
 
-from vc2_conformance.bitstream import to_bit_offset
-
 from vc2_conformance.py2x_compat import get_terminal_size
 
 
@@ -123,7 +135,15 @@ def format_pseudocode_traceback(tb):
 
 
 class BitstreamValidator(object):
-    def __init__(self, filename, show_status, verbose, output_filename):
+    def __init__(
+        self,
+        filename,
+        show_status,
+        verbose,
+        output_filename,
+        debug=False,
+        skip_repeated_sequence_headers=False,
+    ):
         """
         Parameters
         ==========
@@ -135,16 +155,39 @@ class BitstreamValidator(object):
             If >=1, show Python stack traces on failure.
         output_filename : str
             A filename pattern for output bitstream files. Should contain a
-            printf-style format string (e.g. "picture_%d.raw").
+            printf-style format string (e.g. "picture_%d.raw"). Alternatively,
+            if this filename ends with
+            :py:data:`~vc2_conformance.file_format.PICTURE_CONTAINER_EXTENSION`
+            all pictures are written into a single picture container file
+            (see :py:class:`~vc2_conformance.file_format.PictureContainerWriter`).
+        debug : bool
+            If True, check all names used to access the decoder state (see
+            :py:class:`~vc2_conformance.pseudocode.state.State`) and decode
+            pictures using only the VC-2 pseudocode. Otherwise the faster (but
+            unchecked) :py:data:`~vc2_conformance.pseudocode.state.FastState`
+            is used along with the (bit-exact) fused picture output stage (see
+            :py:func:`~vc2_conformance.pseudocode.picture_decoding.pad_removal_clip_and_offset_component`)
+            and wavefront DC prediction (see
+            :py:func:`~vc2_conformance.decoder.transform_data_syntax.wavefront_dc_prediction`).
+        skip_repeated_sequence_headers : bool
+            If True, repeated sequence headers which are byte-for-byte
+            identical to the previous one are not re-parsed (see
+            :py:func:`~vc2_conformance.decoder.io.skip_recording_if_identical`).
         """
         self._filename = filename
         self._show_status = show_status
         self._verbose = verbose
         self._output_filename = output_filename
+        self._debug = debug
+        self._skip_repeated_sequence_headers = skip_repeated_sequence_headers
 
         # The index to use in the filename of the next decoded picture
         self._next_picture_index = 0
 
+        # The PictureContainerWriter to write pictures to (or None if
+        # pictures are written to individual files)
+        self._container = None
+
         # Is the status line currently visible
         self._status_line_visible = False
 
@@ -152,6 +195,8 @@ class BitstreamValidator(object):
         try:
             self._file = open(self._filename, "rb")
             self._filesize_bytes = os.path.getsize(self._filename)
+            if self._output_filename.endswith(PICTURE_CONTAINER_EXTENSION):
+                self._container = PictureContainerWriter(self._output_filename)
         except Exception as e:
             # Catch-all exception handler excuse: Catching only file-related
             # exceptions is challenging, particularly in a backward-compatible
@@ -160,12 +205,32 @@ class BitstreamValidator(object):
             self._print_error(str(e))
             return 1
 
-        self._state = State(_output_picture_callback=self._output_picture)
+        if self._debug:
+            self._state = State(
+                _output_picture_callback=self._output_picture,
+                _use_sequence_header_cache=self._skip_repeated_sequence_headers,
+            )
+        else:
+            self._state = FastState(
+                _output_picture_callback=self._output_picture,
+                _use_fused_output_stage=True,
+                _use_wavefront_dc_prediction=True,
+                _use_sequence_header_cache=self._skip_repeated_sequence_headers,
+            )
         init_io(self._state, self._file)
 
         if self._show_status:
             self._update_status_line("Starting bitstream validation...")
 
+        try:
+            return self._validate()
+        finally:
+            # NB: The container is closed even when validation fails so that
+            # the pictures decoded so far may still be inspected.
+            if self._container is not None:
+                self._container.close()
+
+    def _validate(self):
         try:
             parse_stream(self._state)
             self._hide_status_line()
@@ -196,16 +261,21 @@ class BitstreamValidator(object):
             return 3
 
     def _output_picture(self, picture, video_parameters, picture_coding_mode):
-        filename = self._output_filename % (self._next_picture_index,)
+        if self._container is not None:
+            filename = "{} (index {})".format(
+                self._output_filename, self._next_picture_index
+            )
+            self._container.write(picture, video_parameters, picture_coding_mode)
+        else:
+            filename = self._output_filename % (self._next_picture_index,)
+            write(
+                picture,
+                video_parameters,
+                picture_coding_mode,
+                filename,
+            )
         self._next_picture_index += 1
 
-        write(
-            picture,
-            video_parameters,
-            picture_coding_mode,
-            filename,
-        )
-
         if self._show_status:
             self._update_status_line("Decoded picture written to {}".format(filename))
 
@@ -256,6 +326,10 @@ class BitstreamValidator(object):
 
         summary, _, details = wrap_paragraphs(exception.explain()).partition("\n")
 
+        # NB: Imported here since vc2_conformance.bitstream is comparatively
+        # slow to import and is only needed when reporting errors.
+        from vc2_conformance.bitstream import to_bit_offset
+
         offending_offset = exception.offending_offset()
         if offending_offset is None:
             offending_offset = to_bit_offset(*tell(self._state))
@@ -328,6 +402,9 @@ def parse_args(*args, **kwargs):
     * no_status (bool): True if the status line is to be hidden.
     * verbose (int): The verbosity level.
     * output (str): The output picture filename pattern.
+    * debug (bool): True if decoder state accesses are to be checked.
+    * skip_repeated_sequence_headers (bool): True if identical repeated
+      sequence headers are not to be re-parsed.
     """
     parser = ArgumentParser(
         description="""
@@ -382,14 +459,45 @@ def parse_args(*args, **kwargs):
             indices are unrelated to the picture number. The file extension
             supplied will be stripped and two files will be written for each
             decoded picture: a '.raw' planar image file and a '.json' JSON
-            metadata file. (Default: %(default)s).
+            metadata file. Alternatively, if the filename ends with
+            '{}', all decoded pictures will be written to a single picture
+            container file with this name. (Default: %(default)s).
+        """.format(
+            PICTURE_CONTAINER_EXTENSION
+        ),
+    )
+
+    parser.add_argument(
+        "--debug",
+        action="store_true",
+        default=False,
+        help="""
+            Check the names of all decoder state entries accessed during
+            validation and decode pictures using only the VC-2 pseudocode
+            (rather than equivalent optimised routines). This makes
+            validation slower and is only useful for debugging this
+            software.
+        """,
+    )
+
+    parser.add_argument(
+        "--skip-repeated-sequence-headers",
+        action="store_true",
+        default=False,
+        help="""
+            Do not re-parse repeated sequence headers which are byte-for-byte
+            identical to the previous sequence header (and so would produce
+            the same result). This makes validation of bitstreams with many
+            sequence headers faster. Has no effect when the bitstream is not
+            seekable (e.g. a pipe).
         """,
     )
 
     args = parser.parse_args(*args, **kwargs)
 
     try:
-        args.output % (0,)
+        if not args.output.endswith(PICTURE_CONTAINER_EXTENSION):
+            args.output % (0,)
     except TypeError as e:
         parser.error("--output is not a valid printf template: {}".format(e))
 
@@ -404,6 +512,8 @@ def main(*args, **kwargs):
         show_status=not args.no_status,
         verbose=args.verbose,
         output_filename=args.output,
+        debug=args.debug,
+        skip_repeated_sequence_headers=args.skip_repeated_sequence_headers,
     )
     return validator.run()
 
@@ -5,8 +5,9 @@ r"""
 =======================
 
 A command-line utility which compares pairs of raw pictures (see
-:ref:`file-format`), or pairs of directories containing a series of raw
-pictures.
+:ref:`file-format`), pairs of directories containing a series of raw
+pictures or pairs of picture container files (see
+:ref:`file-format-container`).
 
 Usage
 -----
@@ -35,6 +36,22 @@ with a number (and the extensions ``.raw`` and ``.json``). For example::
       Pictures are identical
     Summary: 2 identical, 1 different
 
+Similarly, a pair of picture container files (e.g. as written by
+:ref:`vc2-bitstream-validator`) may be compared. Pictures are compared in the
+order they appear in each container and are identified by their index in the
+container::
+
+    $ vc2-picture-compare ./pictures_a.vc2pics ./pictures_b.vc2pics
+    Comparing ./pictures_a.vc2pics[0] and ./pictures_b.vc2pics[0]:
+      Pictures are identical
+    Comparing ./pictures_a.vc2pics[1] and ./pictures_b.vc2pics[1]:
+      Pictures are identical
+    Summary: 2 identical, 0 different
+
+When comparing directories or picture containers, the ``--jobs``/``-j``
+argument may be used to compare several pairs of pictures in parallel. Results
+are still reported in order.
+
 Differences in the encoded values are reported separately for each picture
 component.
 
@@ -105,6 +122,26 @@ When picture metadata differs, the pixel values will not be compared since the
 difference in metadata typically means a difference in format making the
 pictures incomparable.
 
+Pictures whose raw picture data is byte-for-byte identical are reported as
+identical without examining the individual sample values.
+
+
+Finding the first difference
+----------------------------
+
+When only a pass/fail answer is required, the ``--first-difference`` argument
+may be used to stop comparing as soon as a difference is found. Picture
+components are compared row-by-row, in the order they appear in the raw file,
+and the location of the first differing sample is reported (instead of PSNR
+figures). For example::
+
+    $ vc2-picture-compare image_a.raw image_b.raw --first-difference
+    Pictures are different:
+      First difference in Y at row 12, column 100: 512 vs 513
+
+When comparing directories or picture containers, comparison stops after the
+first pair of pictures found to differ.
+
 
 Generating difference masks
 ---------------------------
@@ -114,7 +151,7 @@ image using ``--difference-mask``/``-D``. The generated image contains white
 pixels wherever the inputs differed and black pixels wherever they were
 identical. The generated difference mask is output as a raw file of the same
 format as the two input files. This mode is only supported when two individual
-files are provided, not two directories.
+files are provided, not two directories or picture containers.
 
 For example::
 
@@ -143,9 +180,11 @@ import sys
 
 import re
 
+import multiprocessing
+
 from argparse import ArgumentParser
 
-from collections import OrderedDict
+from collections import OrderedDict, deque
 
 import numpy as np
 
@@ -153,23 +192,25 @@ from vc2_data_tables import ColorDifferenceSamplingFormats
 
 from vc2_conformance import __version__
 
-from vc2_conformance.string_utils import indent
+from vc2_conformance.py2x_compat import zip
 
-from vc2_conformance.color_conversion import (
-    from_xyz,
-    matmul_colors,
-    LINEAR_RGB_TO_XYZ,
-)
+from vc2_conformance.string_utils import indent
 
 from vc2_conformance.file_format import (
     get_metadata_and_picture_filenames,
     read_metadata,
-    read_picture,
+    open_picture_data,
     write,
+    is_picture_container,
+    PictureContainerReader,
 )
 
 from vc2_conformance.dimensions_and_depths import compute_dimensions_and_depths
 
+from vc2_conformance.array_dtypes import compute_stage_dtypes
+
+from vc2_conformance.pseudocode.arrays import integer_dtype_for_range
+
 from vc2_conformance.pseudocode.video_parameters import VideoParameters
 
 
@@ -179,6 +220,11 @@ def read_pictures_with_only_one_metadata_file_required(filename_a, filename_b):
     corresponding JSON metadata file, the metadata for the other file will be
     used.
 
+    The pictures are opened using
+    :py:func:`~vc2_conformance.file_format.open_picture_data` and so picture
+    components are memory-mapped NumPy arrays (whose unused high-order bits
+    have not been masked off).
+
     Returns a tuple with the following values:
     * ``(picture_a, video_parameters_a, picture_coding_mode_a)``
     * ``(picture_b, video_parameters_b, picture_coding_mode_b)``
@@ -232,15 +278,12 @@ def read_pictures_with_only_one_metadata_file_required(filename_a, filename_b):
     ) = metadata_b
 
     try:
-        with open(pic_fn_a, "rb") as f:
-            picture_a = read_picture(
-                video_parameters_a,
-                picture_coding_mode_a,
-                picture_number_a,
-                f,
-            )
-            if len(f.read(1)) != 0:
-                raise ValueError()
+        picture_a = open_picture_data(
+            video_parameters_a,
+            picture_coding_mode_a,
+            picture_number_a,
+            pic_fn_a,
+        )
     except (OSError, IOError):
         sys.stderr.write("Error: Could not open first picture.\n")
         sys.exit(101)
@@ -249,15 +292,12 @@ def read_pictures_with_only_one_metadata_file_required(filename_a, filename_b):
         sys.exit(102)
 
     try:
-        with open(pic_fn_b, "rb") as f:
-            picture_b = read_picture(
-                video_parameters_b,
-                picture_coding_mode_b,
-                picture_number_b,
-                f,
-            )
-            if len(f.read(1)) != 0:
-                raise ValueError()
+        picture_b = open_picture_data(
+            video_parameters_b,
+            picture_coding_mode_b,
+            picture_number_b,
+            pic_fn_b,
+        )
     except (OSError, IOError):
         sys.stderr.write("Error: Could not open second picture.\n")
         sys.exit(101)
@@ -265,9 +305,7 @@ def read_pictures_with_only_one_metadata_file_required(filename_a, filename_b):
         sys.stderr.write("Error: Second picture file has incorrect size.\n")
         sys.exit(102)
 
-    with open(pic_fn_a, "rb") as fa:
-        with open(pic_fn_b, "rb") as fb:
-            byte_for_byte_identical = fa.read() == fb.read()
+    byte_for_byte_identical = files_identical(pic_fn_a, pic_fn_b)
 
     return (
         (picture_a, video_parameters_a, picture_coding_mode_a),
@@ -276,6 +314,25 @@ def read_pictures_with_only_one_metadata_file_required(filename_a, filename_b):
     )
 
 
+def files_identical(filename_a, filename_b, chunk_size=1024 * 1024):
+    """
+    Return True iff two files have identical contents. The files are read in
+    chunks of ``chunk_size`` bytes, stopping at the first difference.
+    """
+    if os.path.getsize(filename_a) != os.path.getsize(filename_b):
+        return False
+
+    with open(filename_a, "rb") as fa:
+        with open(filename_b, "rb") as fb:
+            while True:
+                chunk_a = fa.read(chunk_size)
+                chunk_b = fb.read(chunk_size)
+                if chunk_a != chunk_b:
+                    return False
+                elif not chunk_a:
+                    return True
+
+
 def parse_args(*args, **kwargs):
     parser = ArgumentParser(
         description="""
@@ -293,18 +350,43 @@ def parse_args(*args, **kwargs):
     parser.add_argument(
         "filename_a",
         help="""
-            The filename of a .raw or .json raw picture, or a directory
+            The filename of a .raw or .json raw picture, a directory
             containing a series of .raw and .json files whose names end in a
-            number.
+            number, or a picture container file.
         """,
     )
 
     parser.add_argument(
         "filename_b",
         help="""
-            The filename of a .raw or .json raw picture, or a directory
+            The filename of a .raw or .json raw picture, a directory
             containing a series of .raw and .json files whose names end in a
-            number.
+            number, or a picture container file.
+        """,
+    )
+
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=1,
+        metavar="N",
+        help="""
+            When comparing directories or picture containers, compare up to N
+            pairs of pictures in parallel using N processes. (Default:
+            %(default)s).
+        """,
+    )
+
+    parser.add_argument(
+        "--first-difference",
+        action="store_true",
+        default=False,
+        help="""
+            Stop comparing at the first differing row of samples and report
+            the location of the first difference instead of summarising all
+            differences. When comparing directories or picture containers,
+            stop after the first pair of pictures which differ.
         """,
     )
 
@@ -321,11 +403,19 @@ def parse_args(*args, **kwargs):
             Output a difference mask image to the specified file. This mask
             will contain white pixels wherever the input images differ and
             black pixels where they match. Only available when comparing files
-            (not directories).
+            (not directories or picture containers).
         """,
     )
 
-    return parser.parse_args(*args, **kwargs)
+    args = parser.parse_args(*args, **kwargs)
+
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+
+    if args.first_difference and args.difference_mask is not None:
+        parser.error("--first-difference cannot be used with --difference-mask")
+
+    return args
 
 
 def video_parameter_diff(a, b):
@@ -374,7 +464,13 @@ def psnr(deltas, max_value):
 
     Returns None if the deltas are zero.
     """
-    mean_square_error = np.mean(deltas * deltas)
+    # NB: The squared errors are summed using an integer type wide enough to
+    # never overflow (see integer_dtype_for_range) so that the result is exact
+    # regardless of the dtype of the deltas.
+    sum_dtype = integer_dtype_for_range(0, (max_value ** 2) * deltas.size)
+    squares = np.abs(deltas).astype(sum_dtype)
+    squares *= squares
+    mean_square_error = np.sum(squares) / float(deltas.size)
     if mean_square_error == 0:
         return None
     else:
@@ -383,6 +479,42 @@ def psnr(deltas, max_value):
         )
 
 
+def find_first_difference(picture_a, picture_b, video_parameters, picture_coding_mode):
+    """
+    Find the first sample which differs between a pair of pictures (ignoring
+    any padding bits). Components are scanned in the order they appear in a
+    raw picture file (Y, C1 then C2) and rows from top to bottom, stopping at
+    the first row containing a difference.
+
+    Returns None if the pictures are identical or a (component, row, column,
+    value_a, value_b) tuple giving the location of the first difference
+    otherwise.
+    """
+    dimensions_and_depths = compute_dimensions_and_depths(
+        video_parameters,
+        picture_coding_mode,
+    )
+
+    for component in ["Y", "C1", "C2"]:
+        mask = (1 << dimensions_and_depths[component].depth_bits) - 1
+        for row, (row_a, row_b) in enumerate(
+            zip(picture_a[component], picture_b[component])
+        ):
+            row_a = row_a & mask
+            row_b = row_b & mask
+            if not np.array_equal(row_a, row_b):
+                column = int(np.flatnonzero(row_a != row_b)[0])
+                return (
+                    component,
+                    row,
+                    column,
+                    int(row_a[column]),
+                    int(row_b[column]),
+                )
+
+    return None
+
+
 def measure_differences(all_deltas, video_parameters, picture_coding_mode):
     """
     Given a 2D array of pixel value differences for each picture component,
@@ -444,6 +576,14 @@ def generate_difference_mask_picture(deltas, video_parameters, picture_number=0)
         black, not super white or super black (for color formats which support
         this).
     """
+    # NB: Imported here since the color conversion module is comparatively
+    # slow to import and only needed when a difference mask is requested.
+    from vc2_conformance.color_conversion import (
+        from_xyz,
+        matmul_colors,
+        LINEAR_RGB_TO_XYZ,
+    )
+
     masks = {c: deltas[c] != 0 for c, d in deltas.items()}
 
     # Upsample color difference components
@@ -542,7 +682,41 @@ def enumerate_directories(dirname_a, dirname_b):
     ]
 
 
-def compare_pictures(filename_a, filename_b, difference_mask_filename=None):
+def open_picture_containers(filename_a, filename_b):
+    """
+    Given two picture container filenames, return a pair of
+    :py:class:`~vc2_conformance.file_format.PictureContainerReader` objects
+    for them.
+
+    Produces an error on stderr and call sys.exit if either container cannot
+    be read or the containers hold different numbers of pictures.
+    """
+    containers = []
+    for filename in [filename_a, filename_b]:
+        try:
+            containers.append(PictureContainerReader(filename))
+        except (OSError, IOError, ValueError) as e:
+            sys.stderr.write(
+                "Error: Could not read picture container {}: {}\n".format(
+                    filename, e
+                )
+            )
+            sys.exit(109)
+
+    container_a, container_b = containers
+    if len(container_a) != len(container_b):
+        sys.stderr.write(
+            "Error: Picture containers hold different numbers of pictures "
+            "({} and {})\n".format(len(container_a), len(container_b))
+        )
+        sys.exit(110)
+
+    return (container_a, container_b)
+
+
+def compare_pictures(
+    filename_a, filename_b, difference_mask_filename=None, first_difference=False
+):
     """
     Compare a pair of pictures.
 
@@ -552,15 +726,172 @@ def compare_pictures(filename_a, filename_b, difference_mask_filename=None):
 
     If a difference_mask filename is given, writes a difference mask to that
     file.
-    """
-    out = ""
 
+    If first_difference is True, only the location of the first difference
+    is reported (see :py:func:`find_first_difference`).
+    """
     (
         (picture_a, video_parameters_a, picture_coding_mode_a),
         (picture_b, video_parameters_b, picture_coding_mode_b),
         byte_for_byte_identical,
     ) = read_pictures_with_only_one_metadata_file_required(filename_a, filename_b)
 
+    return compare_picture_data(
+        (picture_a, video_parameters_a, picture_coding_mode_a),
+        (picture_b, video_parameters_b, picture_coding_mode_b),
+        byte_for_byte_identical,
+        difference_mask_filename,
+        first_difference,
+    )
+
+
+def compare_container_pictures(container_a, container_b, index, first_difference=False):
+    """
+    Compare the pictures at the specified index in a pair of
+    :py:class:`~vc2_conformance.file_format.PictureContainerReader` objects.
+
+    Returns a string describing the differences between the pictures (if
+    any) and integer return code which is non-zero iff the pictures differ (as
+    :py:func:`compare_pictures`).
+    """
+    byte_for_byte_identical = container_a.read_picture_bytes(
+        index
+    ) == container_b.read_picture_bytes(index)
+
+    return compare_picture_data(
+        container_a.open(index),
+        container_b.open(index),
+        byte_for_byte_identical,
+        first_difference=first_difference,
+    )
+
+
+_open_containers = {}
+"""
+For internal use. The :py:class:`~vc2_conformance.file_format.PictureContainerReader`
+objects opened by :py:func:`compare_container_pictures_by_filename` in the
+current process, {filename: reader, ...}.
+"""
+
+
+def compare_container_pictures_by_filename(
+    filename_a, filename_b, index, first_difference=False
+):
+    """
+    For internal use. Equivalent to :py:func:`compare_container_pictures` but
+    takes the filenames of the containers. The containers are opened only once
+    per process and reused between calls. Used when comparing picture
+    containers in parallel.
+    """
+    for filename in [filename_a, filename_b]:
+        if filename not in _open_containers:
+            _open_containers[filename] = PictureContainerReader(filename)
+
+    return compare_container_pictures(
+        _open_containers[filename_a],
+        _open_containers[filename_b],
+        index,
+        first_difference,
+    )
+
+
+def call_catching_exit(function, *args):
+    """
+    For internal use. Call ``function(*args)`` returning a (exit_code, result)
+    tuple. If the function calls :py:func:`sys.exit`, the exit code is
+    returned (and the result is None), otherwise exit_code is None.
+
+    Used to pass the errors reported by (e.g.)
+    :py:func:`read_pictures_with_only_one_metadata_file_required` back from a
+    worker process.
+    """
+    try:
+        return (None, function(*args))
+    except SystemExit as e:
+        return (e.code, None)
+
+
+def imap_in_order(function, iterable, jobs):
+    """
+    For internal use. A generator equivalent to ``(function(*args) for args
+    in iterable)`` which, when ``jobs`` is greater than one, evaluates
+    ``function`` in a :py:class:`multiprocessing.pool.Pool` of ``jobs``
+    processes.
+
+    Results are always produced in order. At most ``2 * jobs`` calls are in
+    flight (or completed but not yet consumed) at any one time, bounding the
+    number of pictures being processed (and results held in memory)
+    regardless of the length of ``iterable``.
+
+    If ``function`` calls :py:func:`sys.exit` in a worker process,
+    :py:exc:`SystemExit` is raised here when its result is reached.
+    """
+    if jobs == 1:
+        for args in iterable:
+            yield function(*args)
+        return
+
+    def get_result(async_result):
+        exit_code, result = async_result.get()
+        if exit_code is not None:
+            sys.exit(exit_code)
+        return result
+
+    pool = multiprocessing.Pool(jobs)
+    try:
+        pending = deque()
+        for args in iterable:
+            pending.append(
+                pool.apply_async(call_catching_exit, (function,) + tuple(args))
+            )
+            if len(pending) >= 2 * jobs:
+                yield get_result(pending.popleft())
+        while pending:
+            yield get_result(pending.popleft())
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+def compare_picture_data(
+    picture_a_and_metadata,
+    picture_b_and_metadata,
+    byte_for_byte_identical,
+    difference_mask_filename=None,
+    first_difference=False,
+):
+    """
+    Compare a pair of opened pictures. Used by :py:func:`compare_pictures`.
+
+    Parameters
+    ==========
+    picture_a_and_metadata : (picture, video_parameters, picture_coding_mode)
+        The first picture to compare, as returned by
+        :py:func:`~vc2_conformance.file_format.open_picture`.
+    picture_b_and_metadata : (picture, video_parameters, picture_coding_mode)
+        The second picture to compare, in the same form.
+    byte_for_byte_identical : bool
+        True iff the raw picture data for both pictures is byte-for-byte
+        identical.
+    difference_mask_filename : str or None
+        If not None, writes a difference mask to that file.
+    first_difference : bool
+        If True, stop at the first differing row and report only the location
+        of the first difference (see :py:func:`find_first_difference`).
+        Ignored when a difference mask is requested.
+
+    Returns
+    =======
+    out : str
+        A string describing the differences between the pictures (if any).
+    exitcode : int
+        Non-zero iff the pictures differ.
+    """
+    out = ""
+
+    picture_a, video_parameters_a, picture_coding_mode_a = picture_a_and_metadata
+    picture_b, video_parameters_b, picture_coding_mode_b = picture_b_and_metadata
+
     if video_parameters_a != video_parameters_b:
         out += "Video parameters are different:\n"
         out += indent(video_parameter_diff(video_parameters_a, video_parameters_b))
@@ -581,19 +912,40 @@ def compare_pictures(filename_a, filename_b, difference_mask_filename=None):
         out += "\n"
         return (out.rstrip(), 3)
 
-    deltas = OrderedDict(
-        (
-            c,
-            # NB: Convert pictures into Numpy arrays (for easier comparison)
-            # using object mode (to ensure unlimited integer precision)
-            np.array(picture_b[c], dtype=object) - np.array(picture_a[c], dtype=object),
+    # Fast path: Pictures with identical raw data (and metadata) are
+    # identical: there is no need to examine the samples.
+    if byte_for_byte_identical and difference_mask_filename is None:
+        return ("Pictures are identical", 0)
+
+    if first_difference and difference_mask_filename is None:
+        difference = find_first_difference(
+            picture_a, picture_b, video_parameters_a, picture_coding_mode_a
+        )
+        identical = difference is None
+        if not identical:
+            differences = (
+                "First difference in {} at row {}, column {}: {} vs {}"
+            ).format(*difference)
+    else:
+        # NB: Mask off any padding bits and convert the (memory-mapped)
+        # pictures into the narrowest integer type able to hold the
+        # differences between two samples (falling back on object mode, and
+        # unlimited integer precision, for very large bit depths).
+        dimensions_and_depths = compute_dimensions_and_depths(
+            video_parameters_a, picture_coding_mode_a
+        )
+        stage_dtypes = compute_stage_dtypes(video_parameters_a, picture_coding_mode_a)
+        deltas = OrderedDict()
+        for c in ["Y", "C1", "C2"]:
+            mask = (1 << dimensions_and_depths[c].depth_bits) - 1
+            dtype = stage_dtypes[c].sample_differences
+            deltas[c] = (picture_b[c] & mask).astype(dtype)
+            deltas[c] -= (picture_a[c] & mask).astype(dtype)
+
+        identical, differences = measure_differences(
+            deltas, video_parameters_a, picture_coding_mode_a
         )
-        for c in ["Y", "C1", "C2"]
-    )
 
-    identical, differences = measure_differences(
-        deltas, video_parameters_a, picture_coding_mode_a
-    )
     if identical:
         if not byte_for_byte_identical:
             out += (
@@ -618,6 +970,47 @@ def compare_pictures(filename_a, filename_b, difference_mask_filename=None):
     return (out.rstrip(), 0 if identical else 4)
 
 
+def print_comparisons(comparisons, stop_at_first_difference=False):
+    """
+    Print the results of a series of picture comparisons followed by a
+    summary.
+
+    Parameters
+    ==========
+    comparisons : iterable of (description, (message, exitcode))
+        The description of each pair of pictures compared and the result
+        returned by (e.g.) :py:func:`compare_pictures`.
+    stop_at_first_difference : bool
+        If True, stop after the first comparison with a non-zero exit code.
+
+    Returns
+    =======
+    exitcode : int
+        The last non-zero exit code of any comparison or zero if all pictures
+        were identical.
+    """
+    final_exitcode = 0
+    num_different = 0
+    num_same = 0
+    for description, (message, exitcode) in comparisons:
+        print("Comparing {}:".format(description))
+        print(indent(message))
+        if exitcode != 0:
+            final_exitcode = exitcode
+            num_different += 1
+            if stop_at_first_difference:
+                print(
+                    "Summary: {} identical, {} different "
+                    "(stopped at first difference)".format(num_same, num_different)
+                )
+                return final_exitcode
+        else:
+            num_same += 1
+
+    print("Summary: {} identical, {} different".format(num_same, num_different))
+    return final_exitcode
+
+
 def main(*args, **kwargs):
     args = parse_args(*args, **kwargs)
 
@@ -630,36 +1023,82 @@ def main(*args, **kwargs):
         )
         return 103
 
-    if a_is_dir and b_is_dir:
-        if args.difference_mask is not None:
-            sys.stderr.write(
-                "Error: --difference-mask/-D can only be used "
-                "when files (not directories) are compared.\n"
-            )
-            return 104
+    a_is_container = is_picture_container(args.filename_a)
+    b_is_container = is_picture_container(args.filename_b)
 
-        final_exitcode = 0
-        num_different = 0
-        num_same = 0
-        for filename_a, filename_b in enumerate_directories(
+    if a_is_container != b_is_container:
+        sys.stderr.write(
+            "Error: Arguments must both be picture containers or both be "
+            "individual pictures.\n"
+        )
+        return 103
+
+    if (a_is_dir or a_is_container) and args.difference_mask is not None:
+        sys.stderr.write(
+            "Error: --difference-mask/-D can only be used "
+            "when files (not directories or picture containers) are compared.\n"
+        )
+        return 104
+
+    if a_is_dir:
+        filename_pairs = enumerate_directories(args.filename_a, args.filename_b)
+        return print_comparisons(
+            zip(
+                (
+                    "{} and {}".format(filename_a, filename_b)
+                    for filename_a, filename_b in filename_pairs
+                ),
+                imap_in_order(
+                    compare_pictures,
+                    (
+                        (filename_a, filename_b, None, args.first_difference)
+                        for filename_a, filename_b in filename_pairs
+                    ),
+                    args.jobs,
+                ),
+            ),
+            args.first_difference,
+        )
+    elif a_is_container:
+        container_a, container_b = open_picture_containers(
             args.filename_a, args.filename_b
-        ):
-            print("Comparing {} and {}:".format(filename_a, filename_b))
-            message, exitcode = compare_pictures(filename_a, filename_b)
-            print(indent(message))
-            if exitcode != 0:
-                final_exitcode = exitcode
-                num_different += 1
+        )
+        with container_a, container_b:
+            indices = range(len(container_a))
+            if args.jobs == 1:
+                results = (
+                    compare_container_pictures(
+                        container_a, container_b, index, args.first_difference
+                    )
+                    for index in indices
+                )
             else:
-                num_same += 1
-
-        print("Summary: {} identical, {} different".format(num_same, num_different))
-        return final_exitcode
+                results = imap_in_order(
+                    compare_container_pictures_by_filename,
+                    (
+                        (args.filename_a, args.filename_b, index, args.first_difference)
+                        for index in indices
+                    ),
+                    args.jobs,
+                )
+            return print_comparisons(
+                zip(
+                    (
+                        "{}[{}] and {}[{}]".format(
+                            args.filename_a, index, args.filename_b, index
+                        )
+                        for index in indices
+                    ),
+                    results,
+                ),
+                args.first_difference,
+            )
     else:
         message, exitcode = compare_pictures(
             args.filename_a,
             args.filename_b,
             args.difference_mask,
+            args.first_difference,
         )
         print(message)
         return exitcode
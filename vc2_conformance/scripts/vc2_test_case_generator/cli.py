@@ -56,6 +56,17 @@ case generation. These can then be executed, for example using `GNU Parallel
     $ parallel -a commands.txt
 
 
+Picture encoding cache
+----------------------
+
+Many test cases contain the same pictures, encoded in the same way. The
+``--picture-cache <directory>`` argument may be used to cache encoded pictures
+on disk (see :py:mod:`vc2_conformance.encoder.picture_cache`) allowing this
+work to be shared between test cases, parallel jobs and subsequent runs of the
+test case generator. The cache directory may be safely deleted at any time
+when the test case generator is not running.
+
+
 Static wavelet filter analyses
 ------------------------------
 
@@ -108,7 +119,11 @@ from vc2_conformance.codec_features import (
     InvalidCodecFeaturesError,
 )
 
-from vc2_conformance.encoder import UnsatisfiableCodecFeaturesError
+from vc2_conformance.encoder import (
+    UnsatisfiableCodecFeaturesError,
+    PictureCache,
+    set_default_picture_cache,
+)
 
 from vc2_conformance.py2x_compat import (
     get_terminal_size,
@@ -256,6 +271,16 @@ def parse_args(*args, **kwargs):
         """,
     )
 
+    parser.add_argument(
+        "--picture-cache",
+        metavar="DIRECTORY",
+        help="""
+            If given, a directory in which to cache encoded pictures, avoiding
+            repeatedly encoding identical pictures. May be shared between
+            parallel jobs and re-used between runs.
+        """,
+    )
+
     return parser.parse_args(*args, **kwargs)
 
 
@@ -506,6 +531,17 @@ def set_log_level_and_call(log_level, fn, *args, **kwargs):
     return fn(*args, **kwargs)
 
 
+def set_picture_cache_and_call(picture_cache_directory, fn, *args, **kwargs):
+    if picture_cache_directory is None:
+        return fn(*args, **kwargs)
+
+    set_default_picture_cache(PictureCache(directory=picture_cache_directory))
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        set_default_picture_cache(None)
+
+
 def main(*args, **kwargs):
     args = parse_args(*args, **kwargs)
 
@@ -549,6 +585,8 @@ def main(*args, **kwargs):
                     partial(
                         set_log_level_and_call,
                         log_level,
+                        set_picture_cache_and_call,
+                        args.picture_cache,
                         output_encoder_test_cases,
                         output_dir,
                         codec_features,
@@ -571,6 +609,8 @@ def main(*args, **kwargs):
                     partial(
                         set_log_level_and_call,
                         log_level,
+                        set_picture_cache_and_call,
+                        args.picture_cache,
                         output_decoder_test_cases,
                         output_dir,
                         codec_features,
@@ -176,6 +176,10 @@ built on top of two main parts:
 * A Non-deterministic Finite-state Automaton (NFA) representation which is
   constructed from the AST using `Thompson's constructions
   <https://en.wikipedia.org/wiki/Thompson%27s_construction>`_.
+* A Deterministic Finite-state Automaton (DFA) which is lazily constructed
+  from the NFA using the `subset construction
+  <https://en.wikipedia.org/wiki/Powerset_construction>`_ and which is
+  actually executed by :py:class:`Matcher`.
 
 The parser is broken into two stages: a simple tokenizer/lexer
 (:py:func:`tokenize_regex`) and a recursive descent parser
@@ -207,13 +211,23 @@ method.
 
 .. autoclass:: NFANode
     :members:
+
+A DFA for a regular expression is obtained using :py:func:`compile_pattern`.
+DFAs are constructed lazily: each DFA state (and transition) is only computed
+the first time it is needed, after which it is memoised. Since compiled DFAs
+are cached (by pattern string), all :py:class:`Matcher` instances for the same
+pattern share the same DFA and, in the common case, each symbol matched costs
+only a dictionary lookup.
+
+.. autofunction:: compile_pattern
+
+.. autoclass:: DFA
+    :members:
 """
 
 
 import re
 
-from copy import deepcopy
-
 from collections import defaultdict, namedtuple, deque
 
 
@@ -536,6 +550,147 @@ class NFA(object):
             return nfa
 
 
+class DFA(object):
+    """
+    A lazily constructed Deterministic Finite-state Automaton (DFA) equivalent
+    to a given :py:class:`NFA`.
+
+    DFA states are identified by integers (with the start state being
+    :py:attr:`start`) and correspond with sets of NFA nodes (closed under
+    empty transitions). States and transitions are computed on demand and
+    memoised.
+
+    Parameters
+    ==========
+    nfa : :py:class:`NFA`
+
+    Attributes
+    ==========
+    nfa : :py:class:`NFA`
+    start : int
+        The DFA start state.
+    """
+
+    def __init__(self, nfa):
+        self.nfa = nfa
+
+        # [frozenset([NFANode, ...]), ...] The NFA nodes corresponding to each
+        # DFA state
+        self._state_nodes = []
+
+        # {frozenset([NFANode, ...]): state, ...} The inverse of _state_nodes
+        self._state_ids = {}
+
+        # [{symbol: state or None, ...}, ...] Memoised transitions for each
+        # state. None indicates a symbol which is not matched.
+        self._transitions = []
+
+        # [bool or None, ...] and [frozenset([symbol, ...]) or None, ...]
+        # Memoised results of is_complete and valid_next_symbols for each
+        # state.
+        self._complete = []
+        self._valid_next_symbols = []
+
+        self.start = self._get_state(nfa.start.equivalent_nodes())
+
+    def _get_state(self, nfa_nodes):
+        """
+        Return the DFA state corresponding to the provided (empty-transition
+        closed) set of NFA nodes, creating it if necessary.
+        """
+        nfa_nodes = frozenset(nfa_nodes)
+        state = self._state_ids.get(nfa_nodes)
+        if state is None:
+            state = len(self._state_nodes)
+            self._state_nodes.append(nfa_nodes)
+            self._state_ids[nfa_nodes] = state
+            self._transitions.append({})
+            self._complete.append(None)
+            self._valid_next_symbols.append(None)
+        return state
+
+    def follow(self, state, symbol):
+        """
+        Return the DFA state reached by following the given symbol from
+        ``state`` or None if the symbol is not matched.
+        """
+        transitions = self._transitions[state]
+        try:
+            return transitions[symbol]
+        except KeyError:
+            nfa_nodes = set()
+            for node in self._state_nodes[state]:
+                for next_node in node.transitions.get(symbol, ()):
+                    nfa_nodes.update(next_node.equivalent_nodes())
+                for next_node in node.transitions.get(WILDCARD, ()):
+                    nfa_nodes.update(next_node.equivalent_nodes())
+
+            if nfa_nodes:
+                next_state = self._get_state(nfa_nodes)
+            else:
+                next_state = None
+
+            transitions[symbol] = next_state
+            return next_state
+
+    def is_complete(self, state):
+        """
+        Is it valid for the sequence to terminate in the given state?
+        """
+        complete = self._complete[state]
+        if complete is None:
+            nfa_nodes = self._state_nodes[state]
+            complete = self.nfa.final in nfa_nodes or any(
+                END_OF_SEQUENCE in node.transitions for node in nfa_nodes
+            )
+            self._complete[state] = complete
+        return complete
+
+    def valid_next_symbols(self, state):
+        """
+        Return the :py:class:`frozenset` of valid next symbols in the given
+        state (see :py:meth:`Matcher.valid_next_symbols`).
+        """
+        valid_symbols = self._valid_next_symbols[state]
+        if valid_symbols is None:
+            valid_symbols = set()
+            for node in self._state_nodes[state]:
+                for symbol in node.transitions:
+                    if symbol is not None:
+                        valid_symbols.add(symbol)
+
+            if self.is_complete(state):
+                valid_symbols.add(END_OF_SEQUENCE)
+
+            valid_symbols = frozenset(valid_symbols)
+            self._valid_next_symbols[state] = valid_symbols
+        return valid_symbols
+
+
+_compiled_patterns = {}
+"""
+For internal use. A cache of the :py:class:`DFA` objects produced by
+:py:func:`compile_pattern`, indexed by pattern string.
+"""
+
+
+def compile_pattern(pattern):
+    """
+    Return a (lazily constructed) :py:class:`DFA` which matches the given
+    regular expression (see :py:class:`Matcher` for the syntax). The result
+    is cached and the same :py:class:`DFA` instance returned for all
+    subsequent calls with the same pattern.
+
+    Throws a :py:exc:`SymbolRegexSyntaxError` if the pattern could not be
+    parsed.
+    """
+    dfa = _compiled_patterns.get(pattern)
+    if dfa is None:
+        dfa = DFA(NFA.from_ast(parse_regex(pattern)))
+        _compiled_patterns[pattern] = dfa
+    return dfa
+
+
 class Matcher(object):
     """
     Test whether a sequence of symbols (alpha-numeric strings with underscores,
@@ -595,11 +750,19 @@ class Matcher(object):
     """
 
     def __init__(self, pattern):
-        # This object directly executes the NFA of the provided regular
-        # expression. The 'cur_states' set holds the set of states we've
-        # reached in the NFA.
-        self.nfa = NFA.from_ast(parse_regex(pattern))
-        self.cur_states = set([self.nfa.start])
+        # This object executes the (shared, lazily constructed) DFA of the
+        # provided regular expression. The 'state' attribute holds the DFA
+        # state reached so far.
+        self.dfa = compile_pattern(pattern)
+        self.state = self.dfa.start
+
+    def __deepcopy__(self, memo):
+        # NB: The DFA is shared between all copies (and Matchers for the same
+        # pattern) and so is never copied.
+        matcher = Matcher.__new__(Matcher)
+        matcher.dfa = self.dfa
+        matcher.state = self.state
+        return matcher
 
     def match_symbol(self, symbol):
         """
@@ -610,30 +773,19 @@ class Matcher(object):
         If no symbol was matched, the state machine will not be advanced (i.e.
         you can try again with a different symbol as if nothing happened).
         """
-        new_states = set()
-        for nfa in self.cur_states:
-            new_states.update(nfa.follow(symbol))
-            new_states.update(nfa.follow(WILDCARD))
+        new_state = self.dfa.follow(self.state, symbol)
 
-        if not new_states:
+        if new_state is None:
             return False
 
-        self.cur_states = new_states
+        self.state = new_state
         return True
 
     def is_complete(self):
         """
         Is it valid for the sequence to terminate at this point?
         """
-        for nfa in self.cur_states:
-            # Is final state in NFA
-            if self.nfa.final in list(nfa.equivalent_nodes()):
-                return True
-            # ...or is explicit end-of-sequence marker
-            if list(nfa.follow(END_OF_SEQUENCE)):
-                return True
-
-        return False
+        return self.dfa.is_complete(self.state)
 
     def valid_next_symbols(self):
         """
@@ -645,19 +797,8 @@ class Matcher(object):
         If it is valid for the sequence to end at this point,
         :py:data:`END_OF_SEQUENCE` will be in the returned set.
         """
-        valid_symbols = set()
-        for nfa in self.cur_states:
-            for equivalent_nfa in nfa.equivalent_nodes():
-                for symbol in equivalent_nfa.transitions:
-                    if symbol is not None:
-                        valid_symbols.add(symbol)
-
-        # If we're allowed to end the string here, also include
-        # END_OF_SEQUENCE.
-        if self.is_complete():
-            valid_symbols.add(END_OF_SEQUENCE)
-
-        return valid_symbols
+        # NB: A copy is returned since the DFA's (memoised) set is shared
+        return set(self.dfa.valid_next_symbols(self.state))
 
 
 class ImpossibleSequenceError(Exception):
@@ -684,10 +825,10 @@ def make_matching_sequence(initial_sequence, *patterns, **kwargs):
         A series of one or more regular expression specifications (as accepted
         by :py:class:`Matcher`) which the generated sequence must
         simultaneously satisfy.
-    depth_limit : int
+    depth_limit : int or None
         Keyword-only argument specifying the maximum number of consecutive
         symbols to try inserting before giving up on finding a matching
-        sequence. Defaults to 4.
+        sequence. If None, no limit is imposed. Defaults to 3.
     symbol_priority : [symbol, ...]
         Keyword-only argument. If supplied, orders possible symbols from most
         to least preferable. Though this function will always return a sequence
@@ -724,110 +865,154 @@ def make_matching_sequence(initial_sequence, *patterns, **kwargs):
             )
         )
 
-    # This function performs a breadth-first search of the pattern space.
-
-    # Queue of candidates to try
-    #     (symbols_so_far, symbols_remaining, matchers, this_depth_limit)
-    # Where:
-    # * symbols_so_far is the symbols of the generated sequence so far
-    # * symbols_remaining is the list of symbols from initial_sequence still to
+    # This function performs a breadth-first search for the shortest path
+    # through the product of the DFAs of the supplied patterns which consumes
+    # all of the symbols in initial_sequence (in order), inserting other
+    # symbols where required.
+    #
+    # Each search node is a (position, states, num_inserted) tuple where:
+    # * position is the index of the next symbol in initial_sequence to be
     #   included
-    # * matchers is a list of Matcher objects which have matched the
-    #   symbols_so_far
-    # * this_depth_limit is an integer giving the number of search levels
-    #   remaining before giving up.
-    initial_matchers = [Matcher(pattern) for pattern in patterns]
-    queue = deque([([], initial_sequence, initial_matchers, depth_limit)])
+    # * states is a tuple giving the DFA state reached for each pattern
+    # * num_inserted is the number of consecutive symbols inserted since a
+    #   symbol from initial_sequence was last included
+    #
+    # Since the next search steps depend only on the search node, each node
+    # need only be visited once: the first (and therefore shortest and most
+    # preferable) path to each node is recorded in 'parents'. The children of
+    # each node are enqueued in order of preference and so, because the search
+    # is breadth-first, the first complete sequence found is the shortest and,
+    # among these, the most preferable. The search is therefore linear in the
+    # length of initial_sequence.
+    dfas = [compile_pattern(pattern) for pattern in patterns]
+    initial_sequence = list(initial_sequence)
+
+    # {states: [(symbol, next_states), ...], ...} The (memoised) symbols
+    # which may be inserted in each product DFA state, in order of preference,
+    # along with the states they lead to.
+    insertions = {}
+
+    # {node: (parent_node, symbol) or None, ...}
+    start_node = (0, tuple(dfa.start for dfa in dfas), 0)
+    parents = {start_node: None}
+    queue = deque([start_node])
 
     while queue:
-        (
-            symbols_so_far,
-            symbols_remaining,
-            matchers,
-            this_depth_limit,
-        ) = queue.popleft()
-
-        # Try and match the next required symbool
-        if len(symbols_remaining) == 0:
-            if all(m.is_complete() for m in matchers):
+        node = queue.popleft()
+        position, states, num_inserted = node
+
+        # Try and match the next required symbol
+        if position == len(initial_sequence):
+            if all(dfa.is_complete(state) for dfa, state in zip(dfas, states)):
                 # No more symbols to match and found a suitable matching
                 # sequence! We're done.
-                return symbols_so_far
+                sequence = []
+                while parents[node] is not None:
+                    node, symbol = parents[node]
+                    sequence.append(symbol)
+                return sequence[::-1]
         else:
-            if all(
-                symbols_remaining[0] in m.valid_next_symbols()
-                or WILDCARD in m.valid_next_symbols()
-                for m in matchers
-            ):
-                # The next symbol is matched by all matchers, move on!
-                new_matchers = deepcopy(matchers)
-                for m in new_matchers:
-                    m.match_symbol(symbols_remaining[0])
-                queue.append(
-                    (
-                        symbols_so_far + [symbols_remaining[0]],
-                        symbols_remaining[1:],
-                        new_matchers,
-                        depth_limit,  # NB: Reset depth limit when a match is found
-                    )
-                )
+            symbol = initial_sequence[position]
+            next_states = follow_all(dfas, states, symbol)
+            if next_states is not None:
+                # The next symbol is matched by all DFAs, move on! (NB: Insertion
+                # count is reset when a match is found.)
+                child = (position + 1, next_states, 0)
+                if child not in parents:
+                    parents[child] = (node, symbol)
+                    queue.append(child)
                 continue
 
         # If we reach this point the current symbol in the provided sequence
-        # was not matched by all of the matchers. We must now try inserting
-        # some other symbol into the sequence and see if it lets us get any
+        # was not matched by all of the DFAs. We must now try inserting some
+        # other symbol into the sequence and see if it lets us get any
         # further.
 
-        if this_depth_limit <= 0:
+        if depth_limit is not None and num_inserted >= depth_limit:
             # Depth limit reached, give up on this branch of the search
             continue
 
-        # Find the set of candidate symbols which would be accepted by all of
-        # the matchers
-        candidate_next_symbols = set([WILDCARD])
-        for matcher in matchers:
-            symbols = matcher.valid_next_symbols()
-            symbols.discard(END_OF_SEQUENCE)
-            if WILDCARD in symbols and WILDCARD in candidate_next_symbols:
-                candidate_next_symbols.update(symbols)
-            elif WILDCARD in candidate_next_symbols:
-                candidate_next_symbols = symbols
-            elif WILDCARD in symbols:
-                pass
-            else:
-                candidate_next_symbols.intersection_update(symbols)
-
-        if len(candidate_next_symbols) == 0:
-            # Reached a dead-end (no symbol fits all patterns), give up on this
-            # branch of the search
-            continue
-
-        # Descend the search into each of the potential next steps. We try
-        # candidates in the order indicated by the symbol_priority argument.
-        if WILDCARD in candidate_next_symbols and len(symbol_priority) > 0:
-            # Substitute wildcard for concrete symbols if possible
-            candidate_next_symbols.remove(WILDCARD)
-            candidate_next_symbols.update(symbol_priority)
-        candidate_symbols = sorted(
-            candidate_next_symbols,
-            key=lambda sym: (
-                (symbol_priority.index(sym), None)
-                if sym in symbol_priority
-                else (len(symbol_priority), sym)
-            ),
-        )
-        for candidate_symbol in candidate_symbols:
-            new_matchers = deepcopy(matchers)
-            for m in new_matchers:
-                m.match_symbol(candidate_symbol)
-            queue.append(
-                (
-                    symbols_so_far + [candidate_symbol],
-                    symbols_remaining,
-                    new_matchers,
-                    this_depth_limit - 1,
+        if states not in insertions:
+            insertions[states] = [
+                (candidate_symbol, follow_all(dfas, states, candidate_symbol))
+                for candidate_symbol in candidate_insertions(
+                    dfas, states, symbol_priority
                 )
-            )
-            continue
+            ]
+
+        # Descend the search into each of the potential next steps. (NB: When
+        # there is no depth limit, the number of insertions is irrelevant and
+        # not counted, ensuring the search space is finite.)
+        if depth_limit is not None:
+            num_inserted += 1
+        for candidate_symbol, next_states in insertions[states]:
+            child = (position, next_states, num_inserted)
+            if child not in parents:
+                parents[child] = (node, candidate_symbol)
+                queue.append(child)
 
     raise ImpossibleSequenceError()
+
+
+def follow_all(dfas, states, symbol):
+    """
+    For internal use by :py:func:`make_matching_sequence`. Follow a symbol in
+    each of a set of :py:class:`DFAs <DFA>` (i.e. in their product DFA).
+
+    Parameters
+    ==========
+    dfas : [:py:class:`DFA`, ...]
+    states : (state, ...)
+        The current state of each DFA.
+    symbol : symbol
+
+    Returns
+    =======
+    next_states : (state, ...) or None
+        The new state of each DFA or None if the symbol is not matched by all
+        of the DFAs.
+    """
+    next_states = []
+    for dfa, state in zip(dfas, states):
+        next_state = dfa.follow(state, symbol)
+        if next_state is None:
+            return None
+        next_states.append(next_state)
+    return tuple(next_states)
+
+
+def candidate_insertions(dfas, states, symbol_priority):
+    """
+    For internal use by :py:func:`make_matching_sequence`. Return the list of
+    symbols which would be accepted by all of the supplied
+    :py:class:`DFAs <DFA>` in the given states, in order of preference (see
+    the ``symbol_priority`` argument of :py:func:`make_matching_sequence`).
+    """
+    # Find the set of candidate symbols which would be accepted by all of
+    # the DFAs
+    candidate_next_symbols = set([WILDCARD])
+    for dfa, state in zip(dfas, states):
+        symbols = set(dfa.valid_next_symbols(state))
+        symbols.discard(END_OF_SEQUENCE)
+        if WILDCARD in symbols and WILDCARD in candidate_next_symbols:
+            candidate_next_symbols.update(symbols)
+        elif WILDCARD in candidate_next_symbols:
+            candidate_next_symbols = symbols
+        elif WILDCARD in symbols:
+            pass
+        else:
+            candidate_next_symbols.intersection_update(symbols)
+
+    # We try candidates in the order indicated by the symbol_priority argument.
+    if WILDCARD in candidate_next_symbols and len(symbol_priority) > 0:
+        # Substitute wildcard for concrete symbols if possible
+        candidate_next_symbols.remove(WILDCARD)
+        candidate_next_symbols.update(symbol_priority)
+    return sorted(
+        candidate_next_symbols,
+        key=lambda sym: (
+            (symbol_priority.index(sym), None)
+            if sym in symbol_priority
+            else (len(symbol_priority), sym)
+        ),
+    )
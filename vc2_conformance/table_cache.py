@@ -0,0 +1,174 @@
+"""
+The :py:mod:`vc2_conformance.table_cache` module provides an on-disk cache
+for tables which are parsed from data files (such as CSVs) when modules are
+imported.
+
+Several modules (e.g. :py:mod:`vc2_conformance.level_constraints`) parse data
+files shipped with this software every time they are imported. Since these
+files only change when the software is modified or upgraded, the parsed
+tables may optionally be pickled into a cache directory the first time they
+are read and loaded from there on subsequent imports.
+
+Caching is disabled by default and is enabled by setting the
+``VC2_CONFORMANCE_CACHE_DIR`` environment variable to the directory in which
+cached tables should be stored. (Since the time saved is only a few
+milliseconds per import, caching is only worthwhile when this software is
+started very many times, e.g. from shell pipelines, and so files are not
+written to the user's home directory unless requested.)
+
+.. autofunction:: read_cached
+
+Cache entries are keyed by a hash of the data file's contents, the function
+used to parse it (and its arguments), the versions of this software and of the
+package defining the parsing function and the Python version. As a result,
+modified data files (or upgraded software) automatically cause the data file
+to be re-parsed and stale entries are simply never read again. Any failure to
+read or write the cache is silently ignored and the data file parsed as
+usual.
+
+.. autofunction:: get_cache_directory
+
+"""
+
+import os
+
+import sys
+
+import pickle
+
+import hashlib
+
+from vc2_conformance.version import __version__
+
+__all__ = [
+    "read_cached",
+    "get_cache_directory",
+]
+
+
+CACHE_FORMAT_VERSION = 1
+"""
+For internal use. Included in all cache keys. Should be incremented whenever
+the pickled representation of cached values changes (e.g. when the internal
+structure of :py:class:`~vc2_conformance.constraint_table.ValueSet`
+changes).
+"""
+
+
+def get_cache_directory():
+    """
+    Return the directory in which cached tables are stored, or None if
+    caching is disabled.
+
+    The directory is given by the ``VC2_CONFORMANCE_CACHE_DIR`` environment
+    variable. Caching is disabled when this variable is not set, is empty or
+    is set to ``none``.
+    """
+    directory = os.environ.get("VC2_CONFORMANCE_CACHE_DIR", "")
+    if not directory or directory.lower() == "none":
+        return None
+    else:
+        return directory
+
+
+def get_cache_key(data, read_function, args):
+    """
+    For internal use. Compute the cache key (a hexadecimal string) for the
+    result of parsing a data file with the contents ``data`` (a
+    :py:class:`bytes`) using ``read_function(filename, *args)``.
+    """
+    # NB: The version of the package defining read_function is included since
+    # it may be defined outside this software (e.g. in vc2_data_tables)
+    reader_package = sys.modules.get(read_function.__module__.split(".")[0])
+    reader_package_version = getattr(reader_package, "__version__", None)
+
+    h = hashlib.sha256()
+    h.update(data)
+    h.update(
+        repr(
+            (
+                CACHE_FORMAT_VERSION,
+                __version__,
+                tuple(sys.version_info[:2]),
+                read_function.__module__,
+                reader_package_version,
+                read_function.__name__,
+                args,
+            )
+        ).encode("utf-8")
+    )
+    return h.hexdigest()
+
+
+def read_cached(filename, read_function, *args):
+    """
+    Equivalent to ``read_function(filename, *args)`` but returns a cached
+    copy of the result when the same file has been read before.
+
+    The value returned by ``read_function`` must be picklable.
+    """
+    directory = get_cache_directory()
+    if directory is None:
+        return read_function(filename, *args)
+
+    try:
+        with open(filename, "rb") as f:
+            data = f.read()
+    except (IOError, OSError):
+        # Let read_function produce the usual error
+        return read_function(filename, *args)
+
+    cache_filename = os.path.join(
+        directory,
+        "{}-{}.pickle".format(
+            os.path.basename(filename),
+            get_cache_key(data, read_function, args),
+        ),
+    )
+
+    try:
+        with open(cache_filename, "rb") as f:
+            return pickle.load(f)
+    except Exception:
+        # Cache miss, or an unreadable/corrupt cache file: parse the file
+        # normally and (re)populate the cache.
+        pass
+
+    value = read_function(filename, *args)
+
+    try:
+        write_cache_file(cache_filename, value)
+    except Exception:
+        # The cache is an optimisation only: failing to write it (e.g. due to
+        # a read-only filesystem) is not an error.
+        pass
+
+    return value
+
+
+def write_cache_file(cache_filename, value):
+    """
+    For internal use. Atomically write a pickled value to the named cache
+    file, creating the cache directory if necessary.
+    """
+    # NB: Imported here since these are only needed on a cache miss and are
+    # comparatively slow to import.
+    import tempfile
+    from vc2_conformance.py2x_compat import makedirs
+
+    directory = os.path.dirname(cache_filename)
+    makedirs(directory, exist_ok=True)
+
+    # NB: Written to a temporary file and then renamed so that other
+    # processes never observe a partial file.
+    fd, temp_filename = tempfile.mkstemp(dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(value, f, pickle.HIGHEST_PROTOCOL)
+        if os.path.exists(cache_filename):
+            # Replace corrupt files (rename won't overwrite on Windows)
+            os.remove(cache_filename)
+        os.rename(temp_filename, cache_filename)
+    except Exception:
+        os.remove(temp_filename)
+        raise